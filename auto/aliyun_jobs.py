@@ -2,6 +2,14 @@ from playwright.sync_api import sync_playwright
 import json
 import time
 import pandas as pd
+from crawl_support import CrawlerBrowser
+
+# 请求拦截配置：None / "no-trackers" / "no-media" / "no-third-party" / "minimal"
+BLOCK_PROFILE = "minimal"
+# 关闭过渡/动画，翻页后列表更快稳定
+FREEZE_ANIMATIONS = True
+# 抓取前自动关闭 cookie / 登录引导 / 下载 App 弹层
+DISMISS_POPUPS = True
 
 LIST_URL = "https://careers.aliyun.com/campus/position-list?campusType=freshman&lang=zh"
 
@@ -106,7 +114,15 @@ def scrape_list_page(page, browser):
 def scrape_all_pages():
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        crawler = CrawlerBrowser(
+            "aliyun",
+            block_profile=BLOCK_PROFILE,
+            freeze_animations=FREEZE_ANIMATIONS,
+            dismiss_popups=DISMISS_POPUPS,
+        )
+        context = browser.new_context(**crawler.context_options())
+        crawler.setup(context)
+        page = context.new_page()
 
         page.goto(LIST_URL, timeout=60000)
         page.wait_for_timeout(5000)
@@ -126,6 +142,7 @@ def scrape_all_pages():
         for page_num in range(1, total_pages + 1):
             print(f"\n===== 抓取第 {page_num} 页 =====")
 
+            crawler.dismiss_popups(page)
             page_results = scrape_list_page(page, browser)
             all_results.extend(page_results)
 
@@ -139,6 +156,7 @@ def scrape_all_pages():
 
             page.wait_for_selector("span.next-pagination-display", timeout=30000)
 
+        crawler.teardown(context)
         browser.close()
         return all_results
 
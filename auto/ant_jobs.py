@@ -11,6 +11,7 @@ import csv
 from datetime import datetime
 import time
 from typing import List, Dict
+from crawl_support import CrawlerBrowser
 
 
 # ===============================================================
@@ -25,6 +26,13 @@ SELECTORS = {
     'job_tag': '[class*="item-tag"]',
 }
 
+# 请求拦截配置：None / "no-trackers" / "no-media" / "no-third-party" / "minimal"
+BLOCK_PROFILE = "minimal"
+# 关闭过渡/动画，翻页后列表更快稳定
+FREEZE_ANIMATIONS = True
+# 抓取前自动关闭 cookie / 登录引导 / 下载 App 弹层
+DISMISS_POPUPS = True
+
 
 # ===============================================================
 # 抓取职位详情页（职位描述 + 职位要求）
@@ -184,7 +192,15 @@ async def scrape_all_pages(url: str, max_pages: int = None, headless: bool = Fal
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=headless)
-        page = await browser.new_page()
+        crawler = CrawlerBrowser(
+            "ant",
+            block_profile=BLOCK_PROFILE,
+            freeze_animations=FREEZE_ANIMATIONS,
+            dismiss_popups=DISMISS_POPUPS,
+        )
+        context = await browser.new_context(**crawler.context_options())
+        await crawler.setup_async(context)
+        page = await context.new_page()
         await page.goto(url, wait_until="networkidle", timeout=60000)
         await asyncio.sleep(2)
 
@@ -194,6 +210,7 @@ async def scrape_all_pages(url: str, max_pages: int = None, headless: bool = Fal
 
         for page_num in range(1, pages_to_scrape + 1):
             print(f"\n================ 第 {page_num} 页 ================")
+            await crawler.dismiss_popups_async(page)
             jobs = await parse_current_page(page, page_num)
             all_jobs.extend(jobs)
 
@@ -202,6 +219,7 @@ async def scrape_all_pages(url: str, max_pages: int = None, headless: bool = Fal
                 if not success:
                     break
 
+        await crawler.teardown_async(context)
         await browser.close()
 
     return all_jobs
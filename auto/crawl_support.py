@@ -0,0 +1,149 @@
+"""
+爬虫公共工具：复用 gemini/computers/playwright 下的浏览器优化模块
+"""
+import os
+import sys
+
+# 让 auto/ 下的脚本可以直接 import gemini 里的 computers 包
+# （computers/__init__ 按需导入各个 computer，这里只加载下面用到的子模块，
+#   不会带上 browserbase、CDP、numpy）
+_GEMINI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "gemini")
+if _GEMINI_DIR not in sys.path:
+    sys.path.insert(0, _GEMINI_DIR)
+
+from computers.playwright.har_store import HarStore  # noqa: E402
+from computers.playwright.login_state import LoginStore  # noqa: E402
+from computers.playwright.motion import (  # noqa: E402
+    FREEZE_CONTEXT_OPTIONS,
+    FREEZE_MOTION_SCRIPT,
+)
+from computers.playwright.popups import PopupDismisser  # noqa: E402
+from computers.playwright.request_blocking import (  # noqa: E402
+    BLOCK_PROFILES,
+    RequestBlocker,
+)
+
+# 录制 / 回放模式默认从环境变量读取："record" / "replay"，不设置则直连网络
+HAR_MODE = os.environ.get("HAR_MODE") or None
+# 回放时没录到的请求：True 直接拦截，False 放行到真实网络
+HAR_STRICT = os.environ.get("HAR_STRICT", "1").lower() in ["true", "1"]
+
+
+class CrawlerBrowser:
+    """
+    每个爬虫一个实例，负责给 BrowserContext 挂上请求拦截、HAR 录制/回放，
+    并在结束时关闭 context、输出统计信息。
+
+    同步 API：
+        crawler = CrawlerBrowser("aliyun", block_profile="minimal")
+        context = browser.new_context(**crawler.context_options())
+        crawler.setup(context)
+        ...
+        crawler.teardown(context)
+
+    异步 API 使用 setup_async / teardown_async。
+
+    需要登录的站点传 login_site，用 new_context(_async) 从保存的登录态创建 context，
+    同一个 browser 可以开多个 context 并行跑，不再锁住同一个 persistent profile：
+        crawler = CrawlerBrowser("zhipin", login_site="zhipin.com")
+        context = await crawler.new_context_async(browser, viewport=...)
+        await crawler.setup_async(context)
+    首次使用或登录过期时先运行（在 gemini 目录下）：
+        python -m computers.playwright.login_state zhipin.com https://www.zhipin.com/web/user/
+    """
+
+    def __init__(self, name, block_profile=None, har_mode=HAR_MODE, har_strict=HAR_STRICT,
+                 freeze_animations=False, dismiss_popups=False, login_site=None):
+        self.name = name
+        # 关闭 CSS 过渡/动画，下拉框、翻页切换立刻到终态，可以少等几秒
+        self.freeze_animations = freeze_animations
+        self.blocker = RequestBlocker(block_profile) if block_profile else None
+        self.har_mode = har_mode
+        self.har_strict = har_strict
+        self.har_store = HarStore()
+        # 抓取前自动关闭 cookie 提示、登录引导、下载 App 弹层
+        self.dismisser = PopupDismisser() if dismiss_popups else None
+        self.login_site = login_site
+        self.login_store = LoginStore()
+
+    def context_options(self):
+        """
+        创建 context 时需要带上的参数（prefers-reduced-motion 只能在创建时设置）
+        """
+        return dict(FREEZE_CONTEXT_OPTIONS) if self.freeze_animations else {}
+
+    def new_context(self, browser, **options):
+        """
+        同步 API：创建 context，带上 context_options()，有 login_site 时注入登录态
+        """
+        options = {**self.context_options(), **options}
+        if self.login_site:
+            return self.login_store.new_context(browser, self.login_site, **options)
+        return browser.new_context(**options)
+
+    async def new_context_async(self, browser, **options):
+        options = {**self.context_options(), **options}
+        if self.login_site:
+            return await self.login_store.new_context_async(browser, self.login_site, **options)
+        return await browser.new_context(**options)
+
+    def setup(self, context):
+        # 后注册的路由先执行：先挂 HAR，再挂拦截器，被拦截的请求不会进 HAR
+        if self.har_mode:
+            self.har_store.install(context, self.name, self.har_mode, self.har_strict)
+        if self.blocker:
+            self.blocker.install(context)
+        if self.freeze_animations:
+            context.add_init_script(FREEZE_MOTION_SCRIPT)
+
+    async def setup_async(self, context):
+        if self.har_mode:
+            await self.har_store.install_async(context, self.name, self.har_mode, self.har_strict)
+        if self.blocker:
+            await self.blocker.install_async(context)
+        if self.freeze_animations:
+            await context.add_init_script(FREEZE_MOTION_SCRIPT)
+
+    def dismiss_popups(self, page):
+        """
+        同步 API：抓取前调用，关闭页面上已知/疑似的干扰弹层
+        """
+        if self.dismisser:
+            hits = self.dismisser.dismiss(page)
+            if hits:
+                print(f"🧹 已关闭弹层: {hits}")
+
+    async def dismiss_popups_async(self, page):
+        if self.dismisser:
+            hits = await self.dismisser.dismiss_async(page)
+            if hits:
+                print(f"🧹 已关闭弹层: {hits}")
+
+    def teardown(self, context):
+        # 站点运行中可能刷新了 cookie，关闭前写回登录态
+        if self.login_site:
+            self.login_store.save(context, self.login_site)
+        # HAR 只在 context.close() 时写盘，必须先于 browser.close()
+        context.close()
+        self._report()
+
+    async def teardown_async(self, context):
+        if self.login_site:
+            await self.login_store.save_async(context, self.login_site)
+        await context.close()
+        self._report()
+
+    def _report(self):
+        if self.blocker:
+            print(f"🚫 {self.blocker.summary()}")
+        if self.dismisser:
+            print(f"🧹 {self.dismisser.summary()}")
+        if self.har_mode == "record":
+            stored = self.har_store.finalize(self.name)
+            print(f"💾 已录制 {self.har_store.har_path(self.name)}，新增 {stored} 个响应体")
+
+
+__all__ = [
+    "BLOCK_PROFILES",
+    "CrawlerBrowser",
+]
@@ -2,6 +2,14 @@ import asyncio
 import pandas as pd
 from playwright.async_api import async_playwright, TimeoutError
 import random
+from crawl_support import CrawlerBrowser
+
+# 请求拦截配置：None / "no-trackers" / "no-media" / "no-third-party" / "minimal"
+BLOCK_PROFILE = "minimal"
+# 关闭过渡/动画，翻页后列表更快稳定
+FREEZE_ANIMATIONS = True
+# 抓取前自动关闭 cookie / 登录引导 / 下载 App 弹层
+DISMISS_POPUPS = True
 
 BASE_URL = "https://join.qq.com/post.html?query=p_1,w_1,w_2,w_5,w_3,w_8,w_6,w_37,w_14,w_31,w_17,w_7,w_30,w_11,w_9&c_t=1"
 
@@ -77,7 +85,14 @@ async def extract_jobs(page, context):
 async def crawl_all(output="tencent_jobs.csv"):
     async with async_playwright() as pw:
         browser = await pw.chromium.launch(headless=False)
-        context = await browser.new_context()
+        crawler = CrawlerBrowser(
+            "qq",
+            block_profile=BLOCK_PROFILE,
+            freeze_animations=FREEZE_ANIMATIONS,
+            dismiss_popups=DISMISS_POPUPS,
+        )
+        context = await browser.new_context(**crawler.context_options())
+        await crawler.setup_async(context)
         page = await context.new_page()
         await page.goto(BASE_URL, wait_until="domcontentloaded")
 
@@ -86,6 +101,7 @@ async def crawl_all(output="tencent_jobs.csv"):
 
         while True:
             print(f"\n🟢 抓取第 {page_index} 页")
+            await crawler.dismiss_popups_async(page)
             jobs = await extract_jobs(page, context)
             print(f"  ⮕ 第 {page_index} 页共 {len(jobs)} 条职位")
             all_jobs.extend(jobs)
@@ -112,6 +128,7 @@ async def crawl_all(output="tencent_jobs.csv"):
         df.to_csv(output, index=False, encoding="utf-8-sig")
         print(f"\n✅ 共抓取 {len(all_jobs)} 条职位，保存到 {output}")
 
+        await crawler.teardown_async(context)
         await browser.close()
 
 def convert_csv_text():
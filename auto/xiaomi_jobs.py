@@ -3,6 +3,15 @@ import json
 import traceback
 import pandas as pd
 from playwright.async_api import async_playwright
+from crawl_support import CrawlerBrowser
+
+# 岗位数据来自 XHR 接口，拦截图片/字体等不影响抓取
+# 请求拦截配置：None / "no-trackers" / "no-media" / "no-third-party" / "minimal"
+BLOCK_PROFILE = "minimal"
+# 关闭过渡/动画，翻页后列表更快稳定
+FREEZE_ANIMATIONS = True
+# 抓取前自动关闭 cookie / 登录引导 / 下载 App 弹层
+DISMISS_POPUPS = True
 
 TARGET_API = "https://xiaomi.jobs.f.mioffice.cn/api/v1/search/job/posts"
 
@@ -10,7 +19,14 @@ TARGET_API = "https://xiaomi.jobs.f.mioffice.cn/api/v1/search/job/posts"
 async def main():
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
+        crawler = CrawlerBrowser(
+            "xiaomi",
+            block_profile=BLOCK_PROFILE,
+            freeze_animations=FREEZE_ANIMATIONS,
+            dismiss_popups=DISMISS_POPUPS,
+        )
+        context = await browser.new_context(**crawler.context_options())
+        await crawler.setup_async(context)
         page = await context.new_page()
 
         results = []
@@ -43,6 +59,7 @@ async def main():
 
             # 翻页逻辑
             if current_page < total_pages:
+                await crawler.dismiss_popups_async(page)
                 success = await go_to_next_page(page, current_page + 1)
                 if not success:
                     print("⚠️ 翻页失败，提前结束")
@@ -69,6 +86,7 @@ async def main():
         else:
             print("⚠️ 未抓取到任何岗位数据")
 
+        await crawler.teardown_async(context)
         await browser.close()
 
 
@@ -9,10 +9,18 @@ from dashscope import MultiModalConversation
 import base64
 import os
 from dotenv import load_dotenv
+from crawl_support import CrawlerBrowser
 
 load_dotenv()
 dashscope.api_key = os.getenv("QWEN_API_KEY")
-PROFILE_PATH = "/Users/gongwenwei/gitrepo/ai_agent_dev/playwright_profiles/my_chrome_profile"
+# 结果靠截图交给 Qwen-VL 识别，只拦截统计/广告，保留图片
+BLOCK_PROFILE = "no-trackers"
+# 关闭过渡/动画，截图更稳定
+FREEZE_ANIMATIONS = True
+# 自动关闭登录引导 / 下载 App 弹层，只有真正的验证码才需要人工处理
+DISMISS_POPUPS = True
+# 登录态从 login_state/zhipin.com.json 注入，不再独占 persistent profile，可以多开并行
+LOGIN_SITE = "zhipin.com"
 
 def image_to_data_url(image_path: str) -> str:
     with open(image_path, "rb") as f:
@@ -61,8 +69,14 @@ async def main():
         # browser = await p.chromium.launch(headless=False)  # 调试时设为 False
         # context = await browser.new_context()
         screen_size = (1440, 900)
-        context = await p.chromium.launch_persistent_context(
-            user_data_dir=PROFILE_PATH,
+        crawler = CrawlerBrowser(
+            "zhipin",
+            block_profile=BLOCK_PROFILE,
+            freeze_animations=FREEZE_ANIMATIONS,
+            dismiss_popups=DISMISS_POPUPS,
+            login_site=LOGIN_SITE,
+        )
+        browser = await p.chromium.launch(
             args=[
                 "--disable-extensions",
                 "--disable-file-system",
@@ -74,15 +88,20 @@ async def main():
                 # No '--no-sandbox' arg means the sandbox is on.
             ],
             headless=bool(os.environ.get("PLAYWRIGHT_HEADLESS", False)),
-            viewport={"width": screen_size[0], "height": screen_size[1]}, 
+        )
+        context = await crawler.new_context_async(
+            browser, viewport={"width": screen_size[0], "height": screen_size[1]}
         )
 
+        await crawler.setup_async(context)
         page = await context.new_page()
 
         print("正在打开 BOSS 直聘...")
         await page.goto("https://www.zhipin.com", timeout=60000)
         await page.wait_for_timeout(3000)
 
+        await crawler.dismiss_popups_async(page)
+
         # 检查是否跳转到验证码页
         if "captcha" in page.url or await page.query_selector(".slider"):
             print("⚠️ 检测到验证码，请手动处理后按回车继续...")
@@ -99,7 +118,9 @@ async def main():
         except Exception as e:
             print("搜索框定位失败:", e)
             await page.screenshot(path="error.png")
-            await context.close()
+            # 和正常结束一样收尾：写完 HAR、保存登录态
+            await crawler.teardown_async(context)
+            await browser.close()
             return
 
         # 等待结果加载
@@ -112,9 +133,11 @@ async def main():
             await page.wait_for_timeout(2000)
 
         # 截图结果区域
+        await crawler.dismiss_popups_async(page)
         await page.screenshot(path="jobs_screenshot.png")
         print("已保存截图: jobs_screenshot.png")
 
+        await crawler.teardown_async(context)
         await browser.close()
 
     # 调用 Qwen-VL 提取数据
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
 import os
 from typing import Literal, Optional, Union, Any
 from google import genai
@@ -28,7 +29,23 @@ import time
 from rich.console import Console
 from rich.table import Table
 
-from computers import EnvState, Computer
+from computers import ComputerRecoveredError, EnvState, Computer
+from computers.computer import (
+    Action,
+    ClickAt,
+    DragAndDrop,
+    GoBack,
+    GoForward,
+    HoverAt,
+    KeyCombination,
+    Navigate,
+    OpenWebBrowser,
+    ScrollAt,
+    ScrollDocument,
+    Search,
+    TypeTextAt,
+    Wait5Seconds,
+)
 
 MAX_RECENT_TURN_WITH_SCREENSHOTS = 3
 PREDEFINED_COMPUTER_USE_FUNCTIONS = [
@@ -46,6 +63,13 @@ PREDEFINED_COMPUTER_USE_FUNCTIONS = [
     "key_combination",
     "drag_and_drop",
 ]
+# Tab actions are only offered to the model when the computer runs in
+# multi-tab mode. Like the predefined functions they return a screenshot.
+TAB_FUNCTIONS = [
+    "switch_tab",
+    "close_tab",
+]
+SCREENSHOT_FUNCTIONS = PREDEFINED_COMPUTER_USE_FUNCTIONS + TAB_FUNCTIONS
 
 
 console = Console()
@@ -60,6 +84,30 @@ def multiply_numbers(x: float, y: float) -> dict:
     return {"result": x * y}
 
 
+def _tab_function(name: str, description: str) -> types.FunctionDeclaration:
+    return types.FunctionDeclaration(
+        name=name,
+        description=description
+        + " The open tabs are listed in the `tabs` field of every computer response.",
+        parameters=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                "index": types.Schema(
+                    type=types.Type.INTEGER, description="0-based index of the tab."
+                )
+            },
+            required=["index"],
+        ),
+    )
+
+
+# Handled by BrowserAgent.handle_action.
+TAB_FUNCTION_DECLARATIONS = [
+    _tab_function("switch_tab", "Switches to the browser tab at the given index."),
+    _tab_function("close_tab", "Closes the browser tab at the given index."),
+]
+
+
 class BrowserAgent:
     def __init__(
         self,
@@ -67,13 +115,20 @@ class BrowserAgent:
         query: str,
         model_name: str,
         verbose: bool = True,
+        client: Optional[genai.Client] = None,
     ):
         self._browser_computer = browser_computer
         self._query = query
         self._model_name = model_name
         self._verbose = verbose
         self.final_reasoning = None
-        self._client = genai.Client(
+        self._multi_tab = getattr(browser_computer, "multi_tab", False)
+        # Function responses that carried a cropped region since the last full
+        # screenshot. Once the full frame would be pruned, a full one is sent.
+        self._regions_since_full_frame = 0
+        # A client can be injected, e.g. `synthetic.mock_client.MockGeminiClient`
+        # to benchmark the loop without calling the API.
+        self._client = client or genai.Client(
             api_key=os.environ.get("GEMINI_API_KEY"),
             vertexai=os.environ.get("USE_VERTEXAI", "0").lower() in ["true", "1"],
             project=os.environ.get("VERTEXAI_PROJECT"),
@@ -98,6 +153,8 @@ class BrowserAgent:
                 client=self._client, callable=multiply_numbers
             )
         ]
+        if self._multi_tab:
+            custom_functions += TAB_FUNCTION_DECLARATIONS
 
         self._generate_content_config = GenerateContentConfig(
             temperature=1,
@@ -115,43 +172,36 @@ class BrowserAgent:
             ],
         )
 
-    def handle_action(self, action: types.FunctionCall) -> FunctionResponseT:
-        """Handles the action and returns the environment state."""
+    def to_action(self, action: types.FunctionCall) -> Optional[Action]:
+        """Converts a predefined computer use call into a typed `Action`.
+
+        Coordinates are denormalized to the screen. Returns None for the
+        other functions.
+        """
+        args = action.args or {}
         if action.name == "open_web_browser":
-            return self._browser_computer.open_web_browser()
+            return OpenWebBrowser()
         elif action.name == "click_at":
-            x = self.denormalize_x(action.args["x"])
-            y = self.denormalize_y(action.args["y"])
-            return self._browser_computer.click_at(
-                x=x,
-                y=y,
+            return ClickAt(
+                x=self.denormalize_x(args["x"]), y=self.denormalize_y(args["y"])
             )
         elif action.name == "hover_at":
-            x = self.denormalize_x(action.args["x"])
-            y = self.denormalize_y(action.args["y"])
-            return self._browser_computer.hover_at(
-                x=x,
-                y=y,
+            return HoverAt(
+                x=self.denormalize_x(args["x"]), y=self.denormalize_y(args["y"])
             )
         elif action.name == "type_text_at":
-            x = self.denormalize_x(action.args["x"])
-            y = self.denormalize_y(action.args["y"])
-            press_enter = action.args.get("press_enter", False)
-            clear_before_typing = action.args.get("clear_before_typing", True)
-            return self._browser_computer.type_text_at(
-                x=x,
-                y=y,
-                text=action.args["text"],
-                press_enter=press_enter,
-                clear_before_typing=clear_before_typing,
+            return TypeTextAt(
+                x=self.denormalize_x(args["x"]),
+                y=self.denormalize_y(args["y"]),
+                text=args["text"],
+                press_enter=args.get("press_enter", False),
+                clear_before_typing=args.get("clear_before_typing", True),
             )
         elif action.name == "scroll_document":
-            return self._browser_computer.scroll_document(action.args["direction"])
+            return ScrollDocument(direction=args["direction"])
         elif action.name == "scroll_at":
-            x = self.denormalize_x(action.args["x"])
-            y = self.denormalize_y(action.args["y"])
-            magnitude = action.args.get("magnitude", 800)
-            direction = action.args["direction"]
+            magnitude = args.get("magnitude", 800)
+            direction = args["direction"]
 
             if direction in ("up", "down"):
                 magnitude = self.denormalize_y(magnitude)
@@ -159,40 +209,58 @@ class BrowserAgent:
                 magnitude = self.denormalize_x(magnitude)
             else:
                 raise ValueError("Unknown direction: ", direction)
-            return self._browser_computer.scroll_at(
-                x=x, y=y, direction=direction, magnitude=magnitude
+            return ScrollAt(
+                x=self.denormalize_x(args["x"]),
+                y=self.denormalize_y(args["y"]),
+                direction=direction,
+                magnitude=magnitude,
             )
         elif action.name == "wait_5_seconds":
-            return self._browser_computer.wait_5_seconds()
+            return Wait5Seconds()
         elif action.name == "go_back":
-            return self._browser_computer.go_back()
+            return GoBack()
         elif action.name == "go_forward":
-            return self._browser_computer.go_forward()
+            return GoForward()
         elif action.name == "search":
-            return self._browser_computer.search()
+            return Search()
         elif action.name == "navigate":
-            return self._browser_computer.navigate(action.args["url"])
+            return Navigate(url=args["url"])
         elif action.name == "key_combination":
-            return self._browser_computer.key_combination(
-                action.args["keys"].split("+")
-            )
+            return KeyCombination(keys=args["keys"].split("+"))
         elif action.name == "drag_and_drop":
-            x = self.denormalize_x(action.args["x"])
-            y = self.denormalize_y(action.args["y"])
-            destination_x = self.denormalize_x(action.args["destination_x"])
-            destination_y = self.denormalize_y(action.args["destination_y"])
-            return self._browser_computer.drag_and_drop(
-                x=x,
-                y=y,
-                destination_x=destination_x,
-                destination_y=destination_y,
+            return DragAndDrop(
+                x=self.denormalize_x(args["x"]),
+                y=self.denormalize_y(args["y"]),
+                destination_x=self.denormalize_x(args["destination_x"]),
+                destination_y=self.denormalize_y(args["destination_y"]),
             )
+        return None
+
+    def handle_action(self, action: types.FunctionCall) -> FunctionResponseT:
+        """Handles the action and returns the environment state."""
+        computer_action = self.to_action(action)
+        if computer_action is not None:
+            return self._browser_computer.execute([computer_action])
+        elif action.name in TAB_FUNCTIONS:
+            tab_function = getattr(self._browser_computer, action.name)
+            try:
+                return tab_function(int(action.args["index"]))
+            except ValueError as e:
+                # A bad index is the model's mistake, let it pick another tab.
+                return {"error": str(e), "tabs": self._browser_computer.list_tabs()}
         # Handle the custom function declarations here.
         elif action.name == multiply_numbers.__name__:
             return multiply_numbers(x=action.args["x"], y=action.args["y"])
         else:
             raise ValueError(f"Unsupported function: {action}")
 
+    def handle_actions(self, actions: list[types.FunctionCall]) -> EnvState:
+        """Runs consecutive computer use calls as one batch.
+
+        The environment state is only captured after the last action.
+        """
+        return self._browser_computer.execute([self.to_action(a) for a in actions])
+
     def get_model_response(
         self, max_retries=5, base_delay_s=1
     ) -> types.GenerateContentResponse:
@@ -307,7 +375,9 @@ class BrowserAgent:
             console.print(table)
             print()
 
-        function_responses = []
+        # Confirm all safety decisions up front, so that consecutive computer
+        # actions can run as one batch with a single capture.
+        extra_fr_fields_per_call = []
         for function_call in function_calls:
             extra_fr_fields = {}
             if function_call.args and (
@@ -319,33 +389,60 @@ class BrowserAgent:
                     return "COMPLETE"
                 # Explicitly mark the safety check as acknowledged.
                 extra_fr_fields["safety_acknowledgement"] = "true"
-            if self._verbose:
-                with console.status(
-                    "Sending command to Computer...", spinner_style=None
-                ):
-                    fc_result = self.handle_action(function_call)
+            extra_fr_fields_per_call.append(extra_fr_fields)
+
+        # Split the calls into runs of computer actions and single other calls.
+        groups = []
+        for function_call in function_calls:
+            batchable = function_call.name in PREDEFINED_COMPUTER_USE_FUNCTIONS
+            if batchable and groups and groups[-1][0]:
+                groups[-1][1].append(function_call)
             else:
-                fc_result = self.handle_action(function_call)
-            if isinstance(fc_result, EnvState):
+                groups.append((batchable, [function_call]))
+
+        function_responses = []
+        for batchable, calls in groups:
+            group_extra_fields = extra_fr_fields_per_call[: len(calls)]
+            extra_fr_fields_per_call = extra_fr_fields_per_call[len(calls) :]
+            run = (
+                functools.partial(self.handle_actions, calls)
+                if batchable
+                else functools.partial(self.handle_action, calls[0])
+            )
+            try:
+                if self._verbose:
+                    with console.status(
+                        "Sending command to Computer...", spinner_style=None
+                    ):
+                        fc_result = run()
+                else:
+                    fc_result = run()
+            except ComputerRecoveredError as e:
+                # The browser hung or crashed and was rebuilt. Show the model
+                # where it is now, so it can retry the action.
+                termcolor.cprint(str(e), color="yellow")
+                group_extra_fields[-1]["error"] = str(e)
+                fc_result = e.state
+            # Only the last call of a batch gets the captured state, the ones
+            # before it report the URL the batch ended on.
+            for function_call, extra_fr_fields in zip(
+                calls[:-1], group_extra_fields[:-1]
+            ):
                 function_responses.append(
                     FunctionResponse(
                         name=function_call.name,
-                        response={
-                            "url": fc_result.url,
-                            **extra_fr_fields,
-                        },
-                        parts=[
-                            types.FunctionResponsePart(
-                                inline_data=types.FunctionResponseBlob(
-                                    mime_type="image/png", data=fc_result.screenshot
-                                )
-                            )
-                        ],
+                        response={"url": fc_result.url, **extra_fr_fields},
+                    )
+                )
+            if isinstance(fc_result, EnvState):
+                function_responses.append(
+                    self._env_state_response(
+                        calls[-1].name, fc_result, group_extra_fields[-1]
                     )
                 )
             elif isinstance(fc_result, dict):
                 function_responses.append(
-                    FunctionResponse(name=function_call.name, response=fc_result)
+                    FunctionResponse(name=calls[-1].name, response=fc_result)
                 )
 
         self._contents.append(
@@ -360,32 +457,74 @@ class BrowserAgent:
         for content in reversed(self._contents):
             if content.role == "user" and content.parts:
                 # check if content has screenshot of the predefined computer use functions.
-                has_screenshot = False
-                for part in content.parts:
-                    if (
-                        part.function_response
-                        and part.function_response.parts
-                        and part.function_response.name
-                        in PREDEFINED_COMPUTER_USE_FUNCTIONS
-                    ):
-                        has_screenshot = True
-                        break
+                has_screenshot = any(
+                    self._has_observation(part) for part in content.parts
+                )
 
                 if has_screenshot:
                     turn_with_screenshots_found += 1
                     # remove the screenshot image if the number of screenshots exceed the limit.
                     if turn_with_screenshots_found > MAX_RECENT_TURN_WITH_SCREENSHOTS:
                         for part in content.parts:
-                            if (
-                                part.function_response
-                                and part.function_response.parts
-                                and part.function_response.name
-                                in PREDEFINED_COMPUTER_USE_FUNCTIONS
-                            ):
+                            if self._has_observation(part):
                                 part.function_response.parts = None
+                                part.function_response.response.pop(
+                                    "page_text", None
+                                )
 
         return "CONTINUE"
 
+    def _env_state_response(
+        self, name: str, state: EnvState, extra_fields: dict[str, Any]
+    ) -> FunctionResponse:
+        """Builds the function response carrying the observed page state."""
+        response = {"url": state.url}
+        if state.page_text is not None:
+            response["page_text"] = state.page_text
+        if state.waited_seconds is not None:
+            response["waited_seconds"] = state.waited_seconds
+        if self._multi_tab:
+            response["tabs"] = self._browser_computer.list_tabs()
+        response.update(extra_fields)
+        image = state.screenshot
+        can_skip_full_frame = (
+            self._regions_since_full_frame < MAX_RECENT_TURN_WITH_SCREENSHOTS - 1
+        )
+        if state.frame_change == "unchanged" and can_skip_full_frame:
+            response["visual_change"] = "none"
+            image = None
+        elif state.frame_change == "region" and can_skip_full_frame:
+            left, top, right, bottom = state.changed_region
+            response["visual_change"] = "region"
+            # Same 0-999 grid the model uses for coordinates.
+            response["changed_region"] = [
+                self.normalize_x(left),
+                self.normalize_y(top),
+                self.normalize_x(right),
+                self.normalize_y(bottom),
+            ]
+            image = state.region_screenshot
+            self._regions_since_full_frame += 1
+        elif image is not None:
+            self._regions_since_full_frame = 0
+        parts = None
+        if image is not None:
+            parts = [
+                types.FunctionResponsePart(
+                    inline_data=types.FunctionResponseBlob(
+                        mime_type="image/png", data=image.png()
+                    )
+                )
+            ]
+        return FunctionResponse(name=name, response=response, parts=parts)
+
+    def _has_observation(self, part: Part) -> bool:
+        """Whether `part` still carries a screenshot or page text."""
+        fr = part.function_response
+        if not fr or fr.name not in SCREENSHOT_FUNCTIONS:
+            return False
+        return bool(fr.parts) or bool(fr.response and "page_text" in fr.response)
+
     def _get_safety_confirmation(
         self, safety: dict[str, Any]
     ) -> Literal["CONTINUE", "TERMINATE"]:
@@ -409,6 +548,12 @@ class BrowserAgent:
         while status == "CONTINUE":
             status = self.run_one_iteration()
 
+    def normalize_x(self, x: int) -> int:
+        return int(x / self._browser_computer.screen_size()[0] * 1000)
+
+    def normalize_y(self, y: int) -> int:
+        return int(y / self._browser_computer.screen_size()[1] * 1000)
+
     def denormalize_x(self, x: int) -> int:
         return int(x / 1000 * self._browser_computer.screen_size()[0])
 
@@ -0,0 +1,82 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the CPU cost of the agent loop itself, without browser or API.
+
+Runs `BrowserAgent` against `SyntheticComputer` and a scripted model client
+for sessions of 10, 100 and 1000 steps and reports CPU time per step. The
+rich tables and prints are rendered to /dev/null, so their cost is included
+but not their terminal I/O.
+
+    python benchmark_agent_loop.py [--steps 10 100 1000] [--verbose-off]
+"""
+import argparse
+import contextlib
+import os
+import time
+
+from agent import BrowserAgent
+from computers.synthetic.mock_client import MockGeminiClient
+from computers.synthetic.synthetic import SyntheticComputer, generate_frames
+
+SCREEN_SIZE = (1440, 900)
+
+
+def run_session(steps: int, frames: list[bytes], verbose: bool) -> dict:
+    client = MockGeminiClient(steps)
+    with SyntheticComputer(SCREEN_SIZE, frames=frames) as computer:
+        agent = BrowserAgent(
+            browser_computer=computer,
+            query="Find the cheapest train ticket from Beijing to Shanghai.",
+            model_name="mock",
+            verbose=verbose,
+            client=client,
+        )
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            agent.agent_loop()
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+    return {
+        "steps": steps,
+        "cpu_ms_per_step": cpu / steps * 1000,
+        "wall_ms_per_step": wall / steps * 1000,
+        "history_items": len(agent._contents),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--verbose-off",
+        action="store_true",
+        help="Run the agent with verbose=False, i.e. without rich rendering.",
+    )
+    args = parser.parse_args()
+
+    # Frame generation is not part of the loop.
+    frames = generate_frames(SCREEN_SIZE)
+    print(f"{'steps':>6} {'cpu ms/step':>12} {'wall ms/step':>13} {'history':>8}")
+    for steps in args.steps:
+        result = run_session(steps, frames, verbose=not args.verbose_off)
+        print(
+            f"{result['steps']:>6} {result['cpu_ms_per_step']:>12.2f} "
+            f"{result['wall_ms_per_step']:>13.2f} {result['history_items']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    main()
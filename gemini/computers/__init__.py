@@ -11,13 +11,30 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from .computer import Computer, EnvState
-from .browserbase.browserbase import BrowserbaseComputer
-from .playwright.playwright import PlaywrightComputer
+"""Computers for the agents.
 
-__all__ = [
-    "Computer",
-    "EnvState",
-    "BrowserbaseComputer",
-    "PlaywrightComputer",
-]
+Backends are imported on first use: `from computers import PlaywrightComputer`
+loads Playwright only, and importing a submodule such as
+`computers.playwright.popups` loads no backend at all.
+"""
+import importlib
+
+_EXPORTS = {
+    "Computer": ".computer",
+    "ComputerRecoveredError": ".computer",
+    "EnvState": ".computer",
+    "BrowserbaseComputer": ".browserbase.browserbase",
+    "CDPComputer": ".cdp.cdp",
+    "PlaywrightComputer": ".playwright.playwright",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Serves the OpenAI computer-use tool vocabulary from any `Computer`.
+
+The OpenAI agent (`openai/cua.py`) expects an async, duck-typed computer with
+`click`, `scroll`, `keypress`, ... in screenshot pixels. This adapter maps
+those calls to typed actions of a `Computer`, so the same Playwright or
+desktop backend, with its pooling, waits and frame handling, serves the
+Gemini, OpenAI and Qwen agents alike.
+
+Sync Playwright objects may only be used on the thread that created them, so
+all backend calls run on one dedicated thread. Enter Playwright backends
+through the adapter:
+
+    async with CUAComputer(PlaywrightComputer(screen_size=(1024, 768))) as computer:
+        agent = cua.Agent(client, model, computer)
+"""
+import asyncio
+import concurrent.futures
+import functools
+from typing import Optional
+
+from ..computer import (
+    Action,
+    Computer,
+    DragPath,
+    GoBack,
+    GoForward,
+    HoverAt,
+    KeyCombination,
+    MouseClickAt,
+    ScrollAt,
+    TypeText,
+    Wait5Seconds,
+)
+from ..frame import Frame
+
+
+class CUAComputer:
+    def __init__(self, computer: Computer):
+        self.computer = computer
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="computer"
+        )
+        self._dimensions: Optional[tuple[int, int]] = None
+
+    async def __aenter__(self):
+        await self._call(self.computer.__enter__)
+        self._dimensions = await self._call(self.computer.screen_size)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self._call(self.computer.__exit__, exc_type, exc_val, exc_tb)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def _call(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    async def _run(self, *actions: Action):
+        # The agent takes its own screenshot after every action.
+        return await self._call(self.computer.execute, list(actions), capture=False)
+
+    @property
+    def environment(self) -> str:
+        return self.computer.environment
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        if not self._dimensions:
+            # Only safe for backends without thread affinity, Playwright
+            # backends get their size when entered.
+            self._dimensions = self.computer.screen_size()
+        return self._dimensions
+
+    async def screenshot(self) -> Frame:
+        state = await self._call(self.computer.current_state)
+        self._dimensions = state.screenshot.size
+        return state.screenshot
+
+    def _on_screen(self, x: int, y: int) -> bool:
+        width, height = self.dimensions
+        return 0 <= x < width and 0 <= y < height
+
+    async def click(self, x: int, y: int, button: str = "left") -> None:
+        if button == "back":
+            await self._run(GoBack())
+        elif button == "forward":
+            await self._run(GoForward())
+        elif self._on_screen(x, y):
+            button = "middle" if button == "wheel" else button
+            await self._run(MouseClickAt(x=x, y=y, button=button))
+
+    async def double_click(self, x: int, y: int) -> None:
+        if self._on_screen(x, y):
+            await self._run(MouseClickAt(x=x, y=y, clicks=2))
+
+    async def scroll(self, x: int, y: int, scroll_x: int, scroll_y: int) -> None:
+        actions = []
+        if scroll_y:
+            direction = "down" if scroll_y > 0 else "up"
+            actions.append(ScrollAt(x=x, y=y, direction=direction, magnitude=abs(scroll_y)))
+        if scroll_x:
+            direction = "right" if scroll_x > 0 else "left"
+            actions.append(ScrollAt(x=x, y=y, direction=direction, magnitude=abs(scroll_x)))
+        await self._run(*(actions or [HoverAt(x=x, y=y)]))
+
+    async def type(self, text: str) -> None:
+        await self._run(TypeText(text=text))
+
+    async def wait(self, ms: int = 1000) -> float:
+        """Waits until the screen changes or the network is idle, at most `ms`
+        milliseconds (and 5s).
+
+        Returns the number of seconds actually waited.
+        """
+        state = await self._run(Wait5Seconds(max_seconds=ms / 1000))
+        return state.waited_seconds
+
+    async def move(self, x: int, y: int) -> None:
+        await self._run(HoverAt(x=x, y=y))
+
+    async def keypress(self, keys: list[str]) -> None:
+        await self._run(KeyCombination(keys=keys))
+
+    async def drag(self, path: list[tuple[int, int]]) -> None:
+        await self._run(DragPath(path=path))
+
+    async def reset(self, url: Optional[str] = None) -> None:
+        """Starts over in a fresh browser context on `url`, e.g. between
+        independent tasks. Not part of the model's vocabulary."""
+        reset = getattr(self.computer, "reset", None)
+        if reset is None:
+            raise ValueError(f"{type(self.computer).__name__} cannot be reset.")
+        await self._call(reset, url)
@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Serves the Qwen `computer_use` tool vocabulary from any `Computer`.
+
+Qwen points on a `display_size` grid that need not match the screen, e.g.
+1000x1000 relative coordinates for Qwen3-VL, and several of its actions
+(`type`, `scroll`, `left_click_drag`) act at the current cursor instead of
+taking a coordinate. The adapter scales coordinates to screen pixels and
+tracks the cursor itself.
+"""
+from typing import Literal, Optional, Sequence
+
+from ..computer import (
+    Action,
+    Computer,
+    DragPath,
+    EnvState,
+    HoverAt,
+    KeyCombination,
+    MouseClickAt,
+    ScrollAt,
+    TypeText,
+    Wait5Seconds,
+)
+
+# Qwen click actions -> (button, clicks).
+CLICKS = {
+    "left_click": ("left", 1),
+    "right_click": ("right", 1),
+    "middle_click": ("middle", 1),
+    "double_click": ("left", 2),
+    "triple_click": ("left", 3),
+}
+
+
+class QwenComputer:
+    def __init__(self, computer: Computer, display_size: tuple[int, int] = (1000, 1000)):
+        self.computer = computer
+        self._display_size = display_size
+        # Last pointer position, in screen pixels.
+        self._cursor: Optional[tuple[int, int]] = None
+
+    def to_screen(self, coordinate: Sequence[float]) -> tuple[int, int]:
+        """Converts a display coordinate to screen pixels."""
+        display_width, display_height = self._display_size
+        width, height = self.computer.screen_size()
+        x = min(max(round(coordinate[0] * width / display_width), 0), width - 1)
+        y = min(max(round(coordinate[1] * height / display_height), 0), height - 1)
+        return x, y
+
+    def _at(self, coordinate: Optional[Sequence[float]]) -> tuple[int, int]:
+        if coordinate is not None:
+            self._cursor = self.to_screen(coordinate)
+        if self._cursor is None:
+            width, height = self.computer.screen_size()
+            self._cursor = (width // 2, height // 2)
+        return self._cursor
+
+    def _run(self, *actions: Action, capture: bool = True) -> EnvState:
+        return self.computer.execute(list(actions), capture=capture)
+
+    def mouse_click(
+        self,
+        action: Literal["left_click", "right_click", "middle_click", "double_click", "triple_click"],
+        coordinate: Optional[Sequence[float]] = None,
+    ) -> EnvState:
+        button, clicks = CLICKS[action]
+        x, y = self._at(coordinate)
+        return self._run(MouseClickAt(x=x, y=y, button=button, clicks=clicks))
+
+    def key(self, keys: list[str]) -> EnvState:
+        return self._run(KeyCombination(keys=keys))
+
+    def type(self, text: str) -> EnvState:
+        return self._run(TypeText(text=text))
+
+    def mouse_move(self, coordinate: Sequence[float]) -> EnvState:
+        x, y = self._at(coordinate)
+        return self._run(HoverAt(x=x, y=y))
+
+    def left_click_drag(self, coordinate: Sequence[float]) -> EnvState:
+        start = self._at(None)
+        end = self._at(coordinate)
+        return self._run(DragPath(path=[start, end]))
+
+    def scroll(self, pixels: int) -> EnvState:
+        """Scrolls at the cursor, positive `pixels` scroll up."""
+        x, y = self._at(None)
+        direction = "up" if pixels > 0 else "down"
+        return self._run(ScrollAt(x=x, y=y, direction=direction, magnitude=abs(pixels)))
+
+    def hscroll(self, pixels: int) -> EnvState:
+        """Scrolls at the cursor, positive `pixels` scroll right."""
+        x, y = self._at(None)
+        direction = "right" if pixels > 0 else "left"
+        return self._run(ScrollAt(x=x, y=y, direction=direction, magnitude=abs(pixels)))
+
+    def wait(self, seconds: float) -> EnvState:
+        """Waits until the screen changes or the page settled, never longer
+        than `seconds` (nor 5 s)."""
+        return self._run(Wait5Seconds(max_seconds=seconds))
+
+    def screenshot(self) -> EnvState:
+        return self.computer.current_state()
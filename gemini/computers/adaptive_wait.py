@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A wait that returns as soon as there is something new to look at.
+
+Models ask to wait whenever something is loading, but content often shows up
+long before a fixed sleep ends. `AdaptiveWait` polls the screen and returns
+early once the frame differs meaningfully from the pre-wait frame, or once the
+environment reports that the network has been idle. It never waits longer
+than `max_seconds`.
+
+The primitive only needs a `capture` callable returning an RGB array, so it
+backs the Playwright computer as well as desktop (pyautogui) computers.
+"""
+import asyncio
+import dataclasses
+import inspect
+import time
+from typing import Awaitable, Callable, Literal, Optional, Union
+
+import numpy as np
+
+from .playwright.frame_diff import changed_blocks
+
+Capture = Callable[[], np.ndarray]
+AsyncCapture = Callable[[], Union[np.ndarray, Awaitable[np.ndarray]]]
+
+
+@dataclasses.dataclass
+class WaitResult:
+    seconds: float
+    reason: Literal["changed", "idle", "timeout"]
+
+
+class AdaptiveWait:
+    def __init__(
+        self,
+        max_seconds: float = 5.0,
+        poll_interval: float = 0.25,
+        min_seconds: float = 0.25,
+        min_change_fraction: float = 0.002,
+    ):
+        self._max_seconds = max_seconds
+        self._poll_interval = poll_interval
+        # Always wait at least this long, so that a wait issued right after an
+        # action does not return before the action had any effect.
+        self._min_seconds = min_seconds
+        # Fraction of 16x16 blocks that must change to count as "meaningful".
+        # Keeps a blinking caret from ending the wait.
+        self._min_change_fraction = min_change_fraction
+
+    def _changed(self, before: np.ndarray, after: np.ndarray) -> bool:
+        if before.shape != after.shape:
+            return True
+        return changed_blocks(before, after).mean() >= self._min_change_fraction
+
+    def _deadline(self, max_seconds: Optional[float]) -> float:
+        limit = self._max_seconds if max_seconds is None else min(
+            max_seconds, self._max_seconds
+        )
+        return max(limit, 0.0)
+
+    def wait(
+        self,
+        capture: Capture,
+        is_idle: Optional[Callable[[], bool]] = None,
+        max_seconds: Optional[float] = None,
+    ) -> WaitResult:
+        """Blocks until the screen changes, the network is idle or time is up."""
+        limit = self._deadline(max_seconds)
+        start = time.monotonic()
+        before = capture()
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= limit:
+                return WaitResult(seconds=elapsed, reason="timeout")
+            time.sleep(min(self._poll_interval, limit - elapsed))
+            elapsed = time.monotonic() - start
+            if elapsed < self._min_seconds:
+                continue
+            # Change first: the network often goes quiet while the page is
+            # still rendering what it loaded.
+            if self._changed(before, capture()):
+                return WaitResult(seconds=time.monotonic() - start, reason="changed")
+            if is_idle is not None and is_idle():
+                return WaitResult(seconds=time.monotonic() - start, reason="idle")
+
+    async def wait_async(
+        self,
+        capture: AsyncCapture,
+        is_idle: Optional[Callable[[], bool]] = None,
+        max_seconds: Optional[float] = None,
+    ) -> WaitResult:
+        """Same as `wait`, without blocking the event loop between polls."""
+
+        async def grab() -> np.ndarray:
+            frame = capture()
+            return await frame if inspect.isawaitable(frame) else frame
+
+        limit = self._deadline(max_seconds)
+        start = time.monotonic()
+        before = await grab()
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= limit:
+                return WaitResult(seconds=elapsed, reason="timeout")
+            await asyncio.sleep(min(self._poll_interval, limit - elapsed))
+            elapsed = time.monotonic() - start
+            if elapsed < self._min_seconds:
+                continue
+            if self._changed(before, await grab()):
+                return WaitResult(seconds=time.monotonic() - start, reason="changed")
+            if is_idle is not None and is_idle():
+                return WaitResult(seconds=time.monotonic() - start, reason="idle")
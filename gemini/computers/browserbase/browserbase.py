@@ -11,70 +11,34 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import os
-import termcolor
-from ..playwright.playwright import PlaywrightComputer
-import browserbase
-from playwright.sync_api import sync_playwright
+from ..cdp.cdp import CDPComputer
+from ..cdp.session_pool import SessionPool, single_session
+from .provider import BrowserbaseProvider
+from typing import Optional
 
 
-class BrowserbaseComputer(PlaywrightComputer):
+class BrowserbaseComputer(CDPComputer):
+    """Runs on Browserbase sessions.
+
+    Sessions come from `session_pool`, which pre-warms and reuses them across
+    tasks. Without a pool every run creates its own Browserbase session.
+    """
+
     def __init__(
         self,
         screen_size: tuple[int, int],
         initial_url: str = "https://www.google.com",
+        block_profile: Optional[str] = None,
+        single_tab: bool = True,
+        session_pool: Optional[SessionPool] = None,
+        action_timeout_seconds: Optional[float] = 60,
     ):
-        super().__init__(screen_size, initial_url)
-
-    def __enter__(self):
-        print("Creating session...")
-
-        self._playwright = sync_playwright().start()
-        self._browserbase = browserbase.Browserbase(
-            api_key=os.environ["BROWSERBASE_API_KEY"]
-        )
-
-        self._session = self._browserbase.sessions.create(
-            project_id=os.environ["BROWSERBASE_PROJECT_ID"],
-            browser_settings={
-                "fingerprint": {
-                    "screen": {
-                        "maxWidth": 1920,
-                        "maxHeight": 1080,
-                        "minWidth": 1024,
-                        "minHeight": 768,
-                    },
-                },
-                "viewport": {
-                    "width": self._screen_size[0],
-                    "height": self._screen_size[1],
-                },
-            },
-        )
-
-        self._browser = self._playwright.chromium.connect_over_cdp(
-            self._session.connect_url
+        super().__init__(
+            screen_size,
+            session_pool=session_pool
+            or single_session(BrowserbaseProvider(screen_size)),
+            initial_url=initial_url,
+            block_profile=block_profile,
+            single_tab=single_tab,
+            action_timeout_seconds=action_timeout_seconds,
         )
-        self._context = self._browser.contexts[0]
-        self._page = self._context.pages[0]
-        self._page.goto(self._initial_url)
-
-        self._context.on("page", self._handle_new_page)
-
-        termcolor.cprint(
-            f"Session started at https://browserbase.com/sessions/{self._session.id}",
-            color="green",
-            attrs=["bold"],
-        )
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self._page.close()
-
-        if self._context:
-            self._context.close()
-
-        if self._browser:
-            self._browser.close()
-
-        self._playwright.stop()
@@ -0,0 +1,57 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+import browserbase
+
+from ..cdp.session_pool import PooledSession
+
+
+class BrowserbaseProvider:
+    """Creates Browserbase sessions that survive disconnects."""
+
+    def __init__(self, screen_size: tuple[int, int]):
+        self._screen_size = screen_size
+        self._browserbase = browserbase.Browserbase(
+            api_key=os.environ["BROWSERBASE_API_KEY"]
+        )
+        self._project_id = os.environ["BROWSERBASE_PROJECT_ID"]
+
+    def create(self) -> PooledSession:
+        session = self._browserbase.sessions.create(
+            project_id=self._project_id,
+            # Without keep-alive the session ends with the first connection,
+            # so it could be neither reused nor reconnected to.
+            keep_alive=True,
+            browser_settings={
+                "fingerprint": {
+                    "screen": {
+                        "maxWidth": 1920,
+                        "maxHeight": 1080,
+                        "minWidth": 1024,
+                        "minHeight": 768,
+                    },
+                },
+                "viewport": {
+                    "width": self._screen_size[0],
+                    "height": self._screen_size[1],
+                },
+            },
+        )
+        return PooledSession(id=session.id, connect_url=session.connect_url)
+
+    def release(self, session: PooledSession):
+        self._browserbase.sessions.update(
+            session.id, project_id=self._project_id, status="REQUEST_RELEASE"
+        )
@@ -0,0 +1,173 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import termcolor
+from ..playwright.motion import FREEZE_CONTEXT_OPTIONS
+from ..playwright.playwright import PlaywrightComputer
+from ..playwright.recycling import driver_pid
+from ..playwright.watchdog import Watchdog
+from .session_pool import LocalCDPProvider, SessionPool, single_session
+from playwright.sync_api import sync_playwright
+from typing import Optional
+
+
+class CDPComputer(PlaywrightComputer):
+    """Attaches to an already running Chromium over CDP.
+
+    The browser is given either as a single `endpoint` (`ws://` or
+    `http://host:port`), or as a `session_pool` that pre-warms and reuses
+    browser sessions across tasks, e.g. leases from a `fleet.BrowserFleet`.
+
+    By default the computer drives the browser's default context, which suits
+    browsers dedicated to one agent. With `new_context`, it opens a context of
+    its own and closes it on exit, so several agents can share one browser.
+
+    A dropped CDP connection is reconnected before the next action, on the
+    same session if it is still alive and on a fresh one otherwise.
+    """
+
+    def __init__(
+        self,
+        screen_size: tuple[int, int],
+        endpoint: Optional[str] = None,
+        session_pool: Optional[SessionPool] = None,
+        initial_url: str = "https://www.google.com",
+        block_profile: Optional[str] = None,
+        single_tab: bool = True,
+        new_context: bool = False,
+        freeze_animations: bool = False,
+        action_timeout_seconds: Optional[float] = 60,
+    ):
+        if (endpoint is None) == (session_pool is None):
+            raise ValueError("Pass exactly one of endpoint and session_pool.")
+        super().__init__(
+            screen_size,
+            initial_url,
+            block_profile=block_profile,
+            single_tab=single_tab,
+            freeze_animations=freeze_animations,
+        )
+        self._session_pool = session_pool or single_session(LocalCDPProvider(endpoint))
+        self._session = None
+        self._new_context = new_context
+        self._disconnected = False
+        # The browser is not our process, a hung call is unblocked by killing
+        # the driver instead.
+        self._watchdog = (
+            Watchdog(action_timeout_seconds, kill="driver")
+            if action_timeout_seconds
+            else None
+        )
+
+    def __enter__(self):
+        print("Creating session...")
+
+        self._playwright = sync_playwright().start()
+        self._session = self._session_pool.acquire()
+        self._connect()
+        self._resume(self._initial_url)
+
+        termcolor.cprint(
+            f"Session {self._session.id} started (task #{self._session.uses} on it).",
+            color="green",
+            attrs=["bold"],
+        )
+        return self
+
+    def _connect(self, storage_state: Optional[dict] = None):
+        """Attaches to the current session and picks or opens the context."""
+        self._driver_pid = driver_pid(self._playwright)
+        self._browser = self._playwright.chromium.connect_over_cdp(
+            self._session.connect_url
+        )
+        self._disconnected = False
+        self._browser.on("disconnected", self._on_disconnected)
+        if self._new_context:
+            self._context = self._browser.new_context(
+                viewport={"width": self._screen_size[0], "height": self._screen_size[1]},
+                storage_state=storage_state,
+                **(FREEZE_CONTEXT_OPTIONS if self._freeze_animations else {}),
+            )
+        else:
+            self._context = self._browser.contexts[0]
+        self._setup_context()
+        pages = self._context.pages
+        # Tabs left over from earlier tasks on a reused session.
+        for page in pages[1:]:
+            page.close()
+        self._tabs.adopt(pages[0] if pages else self._context.new_page())
+
+        self._context.on("page", self._handle_new_page)
+
+    def _resume(self, url: str):
+        # Reused and reconnected sessions often are on the right page already.
+        if self._page.url != url:
+            self._page.goto(url)
+
+    def reset(self, url: Optional[str] = None):
+        raise ValueError(
+            "CDP computers start each task on a session from their pool, "
+            "they cannot be reset in place."
+        )
+
+    def _on_disconnected(self, browser):
+        self._disconnected = True
+
+    def _run_guarded(self, action: str, run):
+        if self._disconnected and not (self._watchdog and self._watchdog.armed):
+            termcolor.cprint("CDP connection lost, reconnecting.", color="yellow")
+            self._rebuild()
+        return super()._run_guarded(action, run)
+
+    def _rebuild(self):
+        """Reconnects, on a fresh session if the old one is gone, and resumes
+        on the last URL a state was captured on."""
+        # Contexts opened over CDP go away with the connection.
+        storage_state = None
+        if self._new_context and not self._disconnected:
+            try:
+                storage_state = self._context.storage_state()
+            except Exception:
+                pass
+        try:
+            self._playwright.stop()
+        except Exception:
+            # The driver connection is already gone.
+            pass
+        self._forget_pages()
+        self._playwright = sync_playwright().start()
+        try:
+            self._connect(storage_state)
+        except Exception as e:
+            termcolor.cprint(
+                f"Session {self._session.id} is gone ({e}), switching to a new one.",
+                color="yellow",
+            )
+            self._session_pool.release(self._session, reusable=False)
+            self._session = self._session_pool.acquire()
+            self._connect(storage_state)
+        self._resume(self._last_url)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Stopping the driver only drops the connection; the session itself
+        # stays up for the next task, or is ended by the pool.
+        reusable = not self._disconnected and exc_type is None
+        try:
+            if self._new_context and not self._disconnected:
+                self._context.close()
+        finally:
+            self._disconnected = True
+            try:
+                self._playwright.stop()
+            finally:
+                self._session_pool.release(self._session, reusable=reusable)
@@ -0,0 +1,244 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runs a fleet of headless Chromium processes and hands out their endpoints.
+
+Launching a browser costs a second or two per task. On a node running many
+agent processes, one fleet keeps browsers running and leases their CDP
+endpoints to the agents through a small HTTP broker:
+
+    python -m computers.cdp.fleet --size 4 --port 9400
+
+Agents lease from the broker with `FleetProvider`:
+
+    pool = SessionPool(FleetProvider("http://localhost:9400"), size=1)
+    with pool, CDPComputer(screen_size, session_pool=pool, new_context=True) as c:
+        ...
+
+Each browser serves up to `leases_per_browser` agents at a time, each in its
+own context. Browsers that died are relaunched on the next lease.
+"""
+import argparse
+import http.server
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from typing import Optional
+
+from playwright.sync_api import sync_playwright
+
+from ..playwright.playwright import BROWSER_ARGS
+from .session_pool import PooledSession
+
+
+class FleetBrowser:
+    def __init__(self, index: int, port: int, user_data_dir: str):
+        self.index = index
+        self.port = port
+        self.user_data_dir = user_data_dir
+        self.process: Optional[subprocess.Popen] = None
+        self.endpoint: Optional[str] = None
+        # Lease ids currently using this browser.
+        self.leases: set[str] = set()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class BrowserFleet:
+    def __init__(
+        self,
+        size: int = 4,
+        base_port: int = 9300,
+        leases_per_browser: int = 2,
+        headless: bool = True,
+        executable_path: Optional[str] = None,
+    ):
+        self._headless = headless
+        self._executable_path = executable_path
+        self._leases_per_browser = leases_per_browser
+        self._root = tempfile.mkdtemp(prefix="browser-fleet-")
+        self._browsers = [
+            FleetBrowser(i, base_port + i, os.path.join(self._root, str(i)))
+            for i in range(size)
+        ]
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._executable_path is None:
+            # The Chromium build Playwright installed.
+            with sync_playwright() as p:
+                self._executable_path = p.chromium.executable_path
+        for browser in self._browsers:
+            self._launch(browser)
+
+    def _launch(self, browser: FleetBrowser, timeout_seconds: float = 30):
+        args = [
+            self._executable_path,
+            f"--remote-debugging-port={browser.port}",
+            f"--user-data-dir={browser.user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            *BROWSER_ARGS,
+        ]
+        if self._headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+        browser.process = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        browser.leases.clear()
+        deadline = time.monotonic() + timeout_seconds
+        version_url = f"http://127.0.0.1:{browser.port}/json/version"
+        while True:
+            try:
+                with urllib.request.urlopen(version_url, timeout=1) as response:
+                    browser.endpoint = json.load(response)["webSocketDebuggerUrl"]
+                return
+            except OSError:
+                if not browser.alive or time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"Browser {browser.index} did not come up on port {browser.port}."
+                    )
+                time.sleep(0.1)
+
+    def acquire(self) -> Optional[dict]:
+        """Leases the least busy browser, or returns None if all are full."""
+        with self._lock:
+            for browser in self._browsers:
+                if not browser.alive:
+                    self._launch(browser)
+            browser = min(self._browsers, key=lambda b: len(b.leases))
+            if len(browser.leases) >= self._leases_per_browser:
+                return None
+            lease_id = f"{browser.index}-{uuid.uuid4().hex[:8]}"
+            browser.leases.add(lease_id)
+            return {"id": lease_id, "endpoint": browser.endpoint}
+
+    def release(self, lease_id: str):
+        with self._lock:
+            for browser in self._browsers:
+                browser.leases.discard(lease_id)
+
+    def status(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "index": b.index,
+                    "endpoint": b.endpoint,
+                    "alive": b.alive,
+                    "leases": len(b.leases),
+                }
+                for b in self._browsers
+            ]
+
+    def stop(self):
+        for browser in self._browsers:
+            if browser.alive:
+                browser.process.terminate()
+        for browser in self._browsers:
+            if browser.process is not None:
+                try:
+                    browser.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    browser.process.kill()
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def serve(self, port: int = 9400):
+        """Serves GET /acquire, POST /release/<id> and GET /status."""
+        fleet = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def _reply(self, code: int, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/acquire":
+                    lease = fleet.acquire()
+                    if lease is None:
+                        self._reply(503, {"error": "all browsers are busy"})
+                    else:
+                        self._reply(200, lease)
+                elif self.path == "/status":
+                    self._reply(200, fleet.status())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path.startswith("/release/"):
+                    fleet.release(self.path[len("/release/") :])
+                    self._reply(200, {})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        print(f"Browser fleet of {len(self._browsers)} serving on http://127.0.0.1:{port}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class FleetProvider:
+    """Leases browsers from a `BrowserFleet` broker, for `SessionPool`."""
+
+    def __init__(self, broker_url: str = "http://localhost:9400"):
+        self._broker_url = broker_url.rstrip("/")
+
+    def create(self) -> PooledSession:
+        with urllib.request.urlopen(f"{self._broker_url}/acquire") as response:
+            lease = json.load(response)
+        return PooledSession(id=lease["id"], connect_url=lease["endpoint"])
+
+    def release(self, session: PooledSession):
+        request = urllib.request.Request(
+            f"{self._broker_url}/release/{session.id}", method="POST"
+        )
+        urllib.request.urlopen(request).close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a shared browser fleet.")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--port", type=int, default=9400)
+    parser.add_argument("--base-port", type=int, default=9300)
+    parser.add_argument("--leases-per-browser", type=int, default=2)
+    args = parser.parse_args()
+    with BrowserFleet(
+        size=args.size,
+        base_port=args.base_port,
+        leases_per_browser=args.leases_per_browser,
+    ) as fleet:
+        fleet.serve(args.port)
@@ -0,0 +1,183 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pre-warmed, reusable remote browser sessions.
+
+Creating a remote session takes seconds. `SessionPool` creates sessions
+ahead of demand on background threads and hands them out to computers, which
+give them back when their task ends, so the next task starts on a warm
+browser.
+
+Sessions come from a provider:
+  - `browserbase.provider.BrowserbaseProvider` creates keep-alive Browserbase
+    sessions.
+  - `fleet.FleetProvider` leases browsers of a local `BrowserFleet`.
+  - `LocalCDPProvider` hands out a single CDP endpoint, e.g. a local Chromium
+    started with `--remote-debugging-port` as a stand-in for the hosted
+    service:
+
+        chromium --headless=new --remote-debugging-port=9222
+
+        pool = SessionPool(LocalCDPProvider("http://localhost:9222"), size=1)
+        with pool, BrowserbaseComputer(screen_size, session_pool=pool) as computer:
+            ...
+"""
+import dataclasses
+import itertools
+import queue
+import threading
+import time
+from typing import Protocol
+
+import termcolor
+
+
+@dataclasses.dataclass
+class PooledSession:
+    id: str
+    connect_url: str
+    # Number of tasks that ran on this session so far.
+    uses: int = 0
+    # time.monotonic() of the last release back to the pool.
+    idle_since: float = dataclasses.field(default_factory=time.monotonic)
+
+
+class SessionProvider(Protocol):
+    def create(self) -> PooledSession: ...
+
+    def release(self, session: PooledSession): ...
+
+
+class LocalCDPProvider:
+    """Hands out one CDP endpoint as if it were a new session every time."""
+
+    def __init__(self, endpoint: str = "http://localhost:9222"):
+        self._endpoint = endpoint
+        self._ids = itertools.count()
+
+    def create(self) -> PooledSession:
+        return PooledSession(id=f"local-{next(self._ids)}", connect_url=self._endpoint)
+
+    def release(self, session: PooledSession):
+        # The browser behind the endpoint outlives its sessions.
+        pass
+
+
+class SessionPool:
+    def __init__(
+        self,
+        provider: SessionProvider,
+        size: int = 2,
+        max_uses: int = 20,
+        max_idle_seconds: float = 240,
+    ):
+        self._provider = provider
+        # Number of sessions the pool keeps, idle or in use. Idle ones are
+        # created ahead of demand.
+        self._size = size
+        # Sessions are retired after this many tasks, so state left behind by
+        # earlier tasks does not pile up.
+        self._max_uses = max_uses
+        # Hosted sessions time out when idle for too long; older ones are
+        # released instead of handed out.
+        self._max_idle_seconds = max_idle_seconds
+        self._ready: queue.Queue[PooledSession] = queue.Queue()
+        self._lock = threading.Lock()
+        self._creating = 0
+        self._in_use = 0
+        self._closed = False
+
+    def __enter__(self):
+        self.prewarm()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def prewarm(self):
+        """Starts creating sessions until the pool holds `size` of them."""
+        with self._lock:
+            missing = self._size - self._ready.qsize() - self._creating - self._in_use
+            missing = max(missing, 0)
+            self._creating += missing
+        for _ in range(missing):
+            threading.Thread(target=self._create_one, daemon=True).start()
+
+    def _create_one(self):
+        try:
+            session = self._provider.create()
+        except Exception as e:
+            termcolor.cprint(f"Failed to pre-create a session: {e}", color="red")
+            return
+        finally:
+            with self._lock:
+                self._creating -= 1
+        if self._closed:
+            self._provider.release(session)
+        else:
+            self._ready.put(session)
+
+    def acquire(self) -> PooledSession:
+        """Returns a warm session, or a new one if none is ready."""
+        session = None
+        while session is None:
+            try:
+                candidate = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - candidate.idle_since > self._max_idle_seconds:
+                self._provider.release(candidate)
+            else:
+                session = candidate
+        if session is None:
+            session = self._provider.create()
+        session.uses += 1
+        with self._lock:
+            self._in_use += 1
+        # Replace sessions that expired while idle.
+        self.prewarm()
+        return session
+
+    def release(self, session: PooledSession, reusable: bool = True):
+        """Returns `session` to the pool, or ends it if it cannot be reused."""
+        with self._lock:
+            self._in_use -= 1
+            keep = (
+                not self._closed
+                and reusable
+                and session.uses < self._max_uses
+                and self._ready.qsize() + self._creating + self._in_use < self._size
+            )
+        if not keep:
+            self._provider.release(session)
+            # A retired session is replaced by a fresh one.
+            if not self._closed:
+                self.prewarm()
+            return
+        session.idle_since = time.monotonic()
+        self._ready.put(session)
+
+    def close(self):
+        """Ends all idle sessions. Sessions still in use end on release."""
+        self._closed = True
+        while True:
+            try:
+                session = self._ready.get_nowait()
+            except queue.Empty:
+                return
+            self._provider.release(session)
+
+
+def single_session(provider: SessionProvider) -> SessionPool:
+    """A pool that creates one session per task and never reuses it."""
+    return SessionPool(provider, size=0, max_uses=1)
@@ -13,18 +13,186 @@
 # limitations under the License.
 import abc
 import pydantic
-from typing import Literal
+from typing import Annotated, Literal, Optional, Union
+
+from .frame import Frame
 
 
 class EnvState(pydantic.BaseModel):
-    # The screenshot in PNG format.
-    screenshot: bytes
+    # Frames are passed through as is, pydantic neither validates nor copies
+    # their pixels.
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    # The screenshot. None when only text is observed.
+    screenshot: Optional[Frame] = None
     url: str
+    # Compact text rendering of the visible part of the page, if captured.
+    page_text: Optional[str] = None
+    # How the screenshot differs from the previous one. Computers that do not
+    # diff frames always report "full".
+    frame_change: Literal["unchanged", "region", "full"] = "full"
+    # (left, top, right, bottom) in pixels and the crop of that region, set
+    # when `frame_change` is "region".
+    changed_region: Optional[tuple[int, int, int, int]] = None
+    region_screenshot: Optional[Frame] = None
+    # Seconds actually spent in an adaptive wait, for wait actions.
+    waited_seconds: Optional[float] = None
+
+    @pydantic.field_validator("screenshot", "region_screenshot", mode="before")
+    @classmethod
+    def _wrap_png(cls, value):
+        # Computers may still hand over plain PNG bytes.
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return Frame.from_png(value)
+        return value
+
+
+class OpenWebBrowser(pydantic.BaseModel):
+    name: Literal["open_web_browser"] = "open_web_browser"
+
+
+class ClickAt(pydantic.BaseModel):
+    name: Literal["click_at"] = "click_at"
+    x: int
+    y: int
+
+
+class HoverAt(pydantic.BaseModel):
+    name: Literal["hover_at"] = "hover_at"
+    x: int
+    y: int
+
+
+class TypeTextAt(pydantic.BaseModel):
+    name: Literal["type_text_at"] = "type_text_at"
+    x: int
+    y: int
+    text: str
+    press_enter: bool = False
+    clear_before_typing: bool = True
+
+
+class ScrollDocument(pydantic.BaseModel):
+    name: Literal["scroll_document"] = "scroll_document"
+    direction: Literal["up", "down", "left", "right"]
+
+
+class ScrollAt(pydantic.BaseModel):
+    name: Literal["scroll_at"] = "scroll_at"
+    x: int
+    y: int
+    direction: Literal["up", "down", "left", "right"]
+    magnitude: int = 800
+
+
+class Wait5Seconds(pydantic.BaseModel):
+    name: Literal["wait_5_seconds"] = "wait_5_seconds"
+    # A tighter limit, for vocabularies whose waits have a length.
+    max_seconds: Optional[float] = None
+
+
+class GoBack(pydantic.BaseModel):
+    name: Literal["go_back"] = "go_back"
+
+
+class GoForward(pydantic.BaseModel):
+    name: Literal["go_forward"] = "go_forward"
+
+
+class Search(pydantic.BaseModel):
+    name: Literal["search"] = "search"
+
+
+class Navigate(pydantic.BaseModel):
+    name: Literal["navigate"] = "navigate"
+    url: str
+
+
+class KeyCombination(pydantic.BaseModel):
+    name: Literal["key_combination"] = "key_combination"
+    keys: list[str]
+
+
+class DragAndDrop(pydantic.BaseModel):
+    name: Literal["drag_and_drop"] = "drag_and_drop"
+    x: int
+    y: int
+    destination_x: int
+    destination_y: int
+
+
+class MouseClickAt(pydantic.BaseModel):
+    name: Literal["mouse_click_at"] = "mouse_click_at"
+    x: int
+    y: int
+    button: Literal["left", "right", "middle"] = "left"
+    clicks: int = 1
+
+
+class TypeText(pydantic.BaseModel):
+    name: Literal["type_text"] = "type_text"
+    text: str
+    press_enter: bool = False
+
+
+class DragPath(pydantic.BaseModel):
+    name: Literal["drag_path"] = "drag_path"
+    path: list[tuple[int, int]]
+
+
+# One call of a `Computer` action method. `name` is the method name, the
+# other fields are its arguments.
+Action = Annotated[
+    Union[
+        OpenWebBrowser,
+        ClickAt,
+        HoverAt,
+        TypeTextAt,
+        ScrollDocument,
+        ScrollAt,
+        Wait5Seconds,
+        GoBack,
+        GoForward,
+        Search,
+        Navigate,
+        KeyCombination,
+        DragAndDrop,
+        MouseClickAt,
+        TypeText,
+        DragPath,
+    ],
+    pydantic.Field(discriminator="name"),
+]
+
+
+def action_args(action: Action) -> dict:
+    """Returns the keyword arguments of the method `action` calls."""
+    return action.model_dump(exclude={"name"})
+
+
+class ComputerRecoveredError(Exception):
+    """An action failed because the environment hung or crashed.
+
+    The environment has been rebuilt from its last known URL by the time this
+    is raised, `state` is the state after recovery. Callers can report the
+    failure to the model and carry on.
+    """
+
+    def __init__(self, action: str, reason: str, state: EnvState):
+        super().__init__(
+            f"{action} failed ({reason}), the browser was restarted at {state.url}."
+        )
+        self.action = action
+        self.reason = reason
+        self.state = state
 
 
 class Computer(abc.ABC):
     """Defines an interface for environments."""
 
+    # What the environment is, as the OpenAI computer tool names it.
+    environment: str = "browser"
+
     @abc.abstractmethod
     def screen_size(self) -> tuple[int, int]:
         """Returns the screen size of the environment."""
@@ -84,8 +252,12 @@ class Computer(abc.ABC):
         """
 
     @abc.abstractmethod
-    def wait_5_seconds(self) -> EnvState:
-        """Waits for 5 seconds to allow unfinished webpage processes to complete."""
+    def wait_5_seconds(self, max_seconds: Optional[float] = None) -> EnvState:
+        """Waits for 5 seconds to allow unfinished webpage processes to complete.
+
+        Computers may return early once the page settled, and never wait
+        longer than `max_seconds`.
+        """
 
     @abc.abstractmethod
     def go_back(self) -> EnvState:
@@ -120,6 +292,49 @@ class Computer(abc.ABC):
         The 'x', 'y', 'destination_y' and 'destination_x' values are absolute values, scaled to the height and width of the screen.
         """
 
+    # Pointer and keyboard primitives beyond the Gemini vocabulary, used by the
+    # adapters for the OpenAI and Qwen action spaces.
+
+    @abc.abstractmethod
+    def mouse_click_at(
+        self,
+        x: int,
+        y: int,
+        button: Literal["left", "right", "middle"] = "left",
+        clicks: int = 1,
+    ) -> EnvState:
+        """Clicks `button` `clicks` times at a specific x, y coordinate."""
+
+    @abc.abstractmethod
+    def type_text(self, text: str, press_enter: bool = False) -> EnvState:
+        """Types text into whatever has the focus, without clicking first."""
+
+    @abc.abstractmethod
+    def drag_path(self, path: list[tuple[int, int]]) -> EnvState:
+        """Presses the left button at the first point of `path`, moves through
+        the others and releases it at the last."""
+
     @abc.abstractmethod
     def current_state(self) -> EnvState:
         """Returns the current state of the current webpage."""
+
+    def execute(self, actions: list[Action], capture: bool = True) -> EnvState:
+        """Runs `actions` back to back and returns the state after the last one.
+
+        With `capture` False the returned state only needs to carry the URL.
+        This default runs each action through its non-capturing counterpart,
+        the method of the same name prefixed with an underscore, and captures
+        once at the end. The URL comes with the captured state, so it captures
+        even with `capture` False; computers that know their URL without a
+        screenshot override it. Actions without a counterpart fall back to
+        the public method, which captures on its own.
+        """
+        state = None
+        for action in actions:
+            perform = getattr(self, f"_{action.name}", None)
+            if perform is not None:
+                perform(**action_args(action))
+                state = None
+            else:
+                state = getattr(self, action.name)(**action_args(action))
+        return state if state is not None else self.current_state()
@@ -0,0 +1,341 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A `Computer` that drives the local desktop with pyautogui.
+
+Browser actions (back, forward, navigate, search) are sent as the keyboard
+shortcuts of the focused browser window. The module is not imported by
+`computers`, because pyautogui needs a display as soon as it is imported.
+"""
+import platform
+import time
+from typing import Literal, Optional
+
+import numpy as np
+import pyautogui
+import termcolor
+
+from ..adaptive_wait import AdaptiveWait
+from ..computer import (
+    Action,
+    ClickAt,
+    Computer,
+    DragAndDrop,
+    DragPath,
+    EnvState,
+    GoBack,
+    GoForward,
+    HoverAt,
+    KeyCombination,
+    MouseClickAt,
+    Navigate,
+    OpenWebBrowser,
+    ScrollAt,
+    ScrollDocument,
+    Search,
+    TypeText,
+    TypeTextAt,
+    Wait5Seconds,
+    action_args,
+)
+from ..frame import Frame
+
+# The desktop has no URL, states carry this instead.
+DESKTOP_URL = "desktop://"
+
+# Key names of the Gemini and OpenAI vocabularies that pyautogui spells
+# differently.
+PYAUTOGUI_KEY_MAP = {
+    "arrowdown": "down",
+    "arrowleft": "left",
+    "arrowright": "right",
+    "arrowup": "up",
+    "control": "ctrl",
+    "escape": "esc",
+    "return": "enter",
+    "meta": "win",
+    "super": "win",
+    "cmd": "command",
+    "page_down": "pagedown",
+    "page_up": "pageup",
+}
+
+# Pixels per wheel click, pyautogui scrolls in clicks.
+SCROLL_CLICK_PIXELS = 100
+
+
+class DesktopComputer(Computer):
+    def __init__(
+        self,
+        search_engine_url: str = "https://www.google.com",
+        move_duration: float = 0.1,
+    ):
+        self._search_engine_url = search_engine_url
+        self._move_duration = move_duration
+        self._size = None
+        self._adaptive_wait = AdaptiveWait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    @property
+    def environment(self) -> str:
+        system = platform.system()
+        if system == "Windows":
+            return "windows"
+        elif system == "Darwin":
+            return "mac"
+        elif system == "Linux":
+            return "linux"
+        else:
+            raise NotImplementedError(f"Unsupported operating system: '{system}'")
+
+    def screen_size(self) -> tuple[int, int]:
+        # Screenshot pixels, which is what the model points at. They differ
+        # from pyautogui.size() on scaled displays.
+        if not self._size:
+            self._size = pyautogui.screenshot().size
+        return self._size
+
+    def execute(self, actions: list[Action], capture: bool = True) -> EnvState:
+        """Runs `actions` back to back, capturing the state once at the end."""
+        waited_seconds = None
+        for action in actions:
+            result = getattr(self, f"_{action.name}")(**action_args(action))
+            if action.name == "wait_5_seconds":
+                waited_seconds = (waited_seconds or 0) + result
+        state = self.current_state() if capture else EnvState(url=DESKTOP_URL)
+        if waited_seconds is not None:
+            state.waited_seconds = round(waited_seconds, 2)
+        return state
+
+    def current_state(self) -> EnvState:
+        screenshot = pyautogui.screenshot()
+        self._size = screenshot.size
+        return EnvState(screenshot=Frame.from_image(screenshot), url=DESKTOP_URL)
+
+    def open_web_browser(self) -> EnvState:
+        return self.execute([OpenWebBrowser()])
+
+    def click_at(self, x: int, y: int) -> EnvState:
+        return self.execute([ClickAt(x=x, y=y)])
+
+    def hover_at(self, x: int, y: int) -> EnvState:
+        return self.execute([HoverAt(x=x, y=y)])
+
+    def type_text_at(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        press_enter: bool = False,
+        clear_before_typing: bool = True,
+    ) -> EnvState:
+        return self.execute(
+            [
+                TypeTextAt(
+                    x=x,
+                    y=y,
+                    text=text,
+                    press_enter=press_enter,
+                    clear_before_typing=clear_before_typing,
+                )
+            ]
+        )
+
+    def scroll_document(
+        self, direction: Literal["up", "down", "left", "right"]
+    ) -> EnvState:
+        return self.execute([ScrollDocument(direction=direction)])
+
+    def scroll_at(
+        self,
+        x: int,
+        y: int,
+        direction: Literal["up", "down", "left", "right"],
+        magnitude: int = 800,
+    ) -> EnvState:
+        return self.execute(
+            [ScrollAt(x=x, y=y, direction=direction, magnitude=magnitude)]
+        )
+
+    def wait_5_seconds(self, max_seconds: Optional[float] = None) -> EnvState:
+        return self.execute([Wait5Seconds(max_seconds=max_seconds)])
+
+    def go_back(self) -> EnvState:
+        return self.execute([GoBack()])
+
+    def go_forward(self) -> EnvState:
+        return self.execute([GoForward()])
+
+    def search(self) -> EnvState:
+        return self.execute([Search()])
+
+    def navigate(self, url: str) -> EnvState:
+        return self.execute([Navigate(url=url)])
+
+    def key_combination(self, keys: list[str]) -> EnvState:
+        return self.execute([KeyCombination(keys=keys)])
+
+    def drag_and_drop(
+        self, x: int, y: int, destination_x: int, destination_y: int
+    ) -> EnvState:
+        return self.execute(
+            [
+                DragAndDrop(
+                    x=x, y=y, destination_x=destination_x, destination_y=destination_y
+                )
+            ]
+        )
+
+    def mouse_click_at(
+        self,
+        x: int,
+        y: int,
+        button: Literal["left", "right", "middle"] = "left",
+        clicks: int = 1,
+    ) -> EnvState:
+        return self.execute([MouseClickAt(x=x, y=y, button=button, clicks=clicks)])
+
+    def type_text(self, text: str, press_enter: bool = False) -> EnvState:
+        return self.execute([TypeText(text=text, press_enter=press_enter)])
+
+    def drag_path(self, path: list[tuple[int, int]]) -> EnvState:
+        return self.execute([DragPath(path=path)])
+
+    def _on_screen(self, x: int, y: int) -> bool:
+        width, height = self.screen_size()
+        return 0 <= x < width and 0 <= y < height
+
+    def _open_web_browser(self):
+        pass
+
+    def _click_at(self, x: int, y: int):
+        self._mouse_click_at(x, y, "left", 1)
+
+    def _hover_at(self, x: int, y: int):
+        pyautogui.moveTo(x, y, duration=self._move_duration)
+
+    def _type_text_at(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        press_enter: bool,
+        clear_before_typing: bool,
+    ):
+        self._mouse_click_at(x, y, "left", 1)
+        if clear_before_typing:
+            self._press_keys(["command" if platform.system() == "Darwin" else "ctrl", "a"])
+            self._press_keys(["delete"])
+        self._type_text(text, press_enter)
+
+    def _type_text(self, text: str, press_enter: bool):
+        pyautogui.write(text)
+        if press_enter:
+            self._press_keys(["enter"])
+
+    def _scroll_document(self, direction: Literal["up", "down", "left", "right"]):
+        if direction == "down":
+            self._press_keys(["pagedown"])
+        elif direction == "up":
+            self._press_keys(["pageup"])
+        elif direction in ("left", "right"):
+            width, height = self.screen_size()
+            self._scroll_at(width // 2, height // 2, direction, width // 2)
+        else:
+            raise ValueError("Unsupported direction: ", direction)
+
+    def _scroll_at(
+        self,
+        x: int,
+        y: int,
+        direction: Literal["up", "down", "left", "right"],
+        magnitude: int,
+    ):
+        pyautogui.moveTo(x, y, duration=self._move_duration)
+        clicks = max(1, round(magnitude / SCROLL_CLICK_PIXELS))
+        if direction == "up":
+            pyautogui.scroll(clicks)
+        elif direction == "down":
+            pyautogui.scroll(-clicks)
+        elif direction == "left":
+            pyautogui.hscroll(-clicks)
+        elif direction == "right":
+            pyautogui.hscroll(clicks)
+        else:
+            raise ValueError("Unsupported direction: ", direction)
+
+    def _wait_5_seconds(self, max_seconds: Optional[float] = None) -> float:
+        """Waits adaptively, returns the seconds actually waited."""
+        result = self._adaptive_wait.wait(
+            lambda: np.asarray(pyautogui.screenshot().convert("RGB")),
+            max_seconds=max_seconds,
+        )
+        termcolor.cprint(
+            f"Waited {result.seconds:.1f}s ({result.reason}).", color="cyan"
+        )
+        return result.seconds
+
+    def _go_back(self):
+        self._press_keys(["command", "["] if platform.system() == "Darwin" else ["alt", "left"])
+
+    def _go_forward(self):
+        self._press_keys(["command", "]"] if platform.system() == "Darwin" else ["alt", "right"])
+
+    def _search(self):
+        self._navigate(self._search_engine_url)
+
+    def _navigate(self, url: str):
+        # Focus the address bar of the active browser window.
+        self._press_keys(["command" if platform.system() == "Darwin" else "ctrl", "l"])
+        pyautogui.write(url)
+        self._press_keys(["enter"])
+
+    def _key_combination(self, keys: list[str]):
+        self._press_keys(keys)
+
+    def _press_keys(self, keys: list[str]):
+        keys = [PYAUTOGUI_KEY_MAP.get(k.lower(), k.lower()) for k in keys]
+        for key in keys:
+            pyautogui.keyDown(key)
+        for key in reversed(keys):
+            pyautogui.keyUp(key)
+
+    def _drag_and_drop(
+        self, x: int, y: int, destination_x: int, destination_y: int
+    ):
+        self._drag_path([(x, y), (destination_x, destination_y)])
+
+    def _mouse_click_at(
+        self, x: int, y: int, button: Literal["left", "right", "middle"], clicks: int
+    ):
+        if not self._on_screen(x, y):
+            termcolor.cprint(f"Ignoring click outside the screen at ({x}, {y}).", color="yellow")
+            return
+        pyautogui.moveTo(x, y, duration=self._move_duration)
+        pyautogui.click(x, y, clicks=clicks, button=button)
+
+    def _drag_path(self, path: list[tuple[int, int]]):
+        if len(path) < 2:
+            return
+        pyautogui.moveTo(*path[0], duration=self._move_duration)
+        pyautogui.mouseDown(button="left")
+        for point in path[1:]:
+            pyautogui.moveTo(*point, duration=0.5)
+        pyautogui.mouseUp(button="left")
+        # Give drop handlers a moment before the next capture.
+        time.sleep(0.1)
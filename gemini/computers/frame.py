@@ -0,0 +1,200 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A screenshot that is only encoded when, and as, someone needs it.
+
+A frame starts from whatever the computer produced: the PNG a browser
+returned, or the raw pixels of a desktop capture. Both are kept as memoryviews
+over the producer's buffer, nothing is copied. Encodings are computed on first
+request and cached per format and options, so a frame that is sent to the
+model once as PNG and once as a base64 data URL is encoded exactly once, and a
+frame that nobody looks at is never encoded at all.
+"""
+import base64
+import io
+from typing import Optional, Union
+
+import numpy as np
+from PIL import Image
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+_CHANNELS = {"RGB": 3, "RGBA": 4, "L": 1}
+
+
+class Frame:
+    __slots__ = ("_source_format", "_encoded", "_pixels", "_size", "_mode", "_base64")
+
+    def __init__(
+        self,
+        encoded: Optional[Buffer] = None,
+        source_format: Optional[str] = None,
+        pixels: Optional[Buffer] = None,
+        size: Optional[tuple[int, int]] = None,
+        mode: str = "RGB",
+    ):
+        if encoded is None and pixels is None:
+            raise ValueError("Frame needs encoded bytes or pixels.")
+        if pixels is not None and size is None:
+            raise ValueError("Frame pixels need a size.")
+        self._source_format = source_format
+        # (format, options) -> encoded bytes.
+        self._encoded: dict[tuple, Buffer] = {}
+        if encoded is not None:
+            self._encoded[(source_format, ())] = encoded
+        self._pixels = memoryview(pixels).cast("B") if pixels is not None else None
+        self._size = size
+        self._mode = mode
+        # (format, options) -> base64 str.
+        self._base64: dict[tuple, str] = {}
+
+    @classmethod
+    def from_png(cls, png: Buffer) -> "Frame":
+        return cls(encoded=png, source_format="png")
+
+    @classmethod
+    def from_pixels(
+        cls, pixels: Buffer, size: tuple[int, int], mode: str = "RGB"
+    ) -> "Frame":
+        """Wraps row-major pixels of `size` (width, height) without copying."""
+        return cls(pixels=pixels, size=size, mode=mode)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "Frame":
+        """Wraps an (height, width, channels) uint8 array."""
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        height, width = array.shape[:2]
+        channels = array.shape[2] if array.ndim == 3 else 1
+        mode = {1: "L", 3: "RGB", 4: "RGBA"}[channels]
+        return cls(pixels=array.data, size=(width, height), mode=mode)
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "Frame":
+        if image.mode not in _CHANNELS:
+            image = image.convert("RGB")
+        return cls(pixels=image.tobytes(), size=image.size, mode=image.mode)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """(width, height) in pixels."""
+        if self._size is None:
+            # Only reads the header.
+            self._size = Image.open(io.BytesIO(self._source())).size
+        return self._size
+
+    def _source(self) -> Buffer:
+        return self._encoded[(self._source_format, ())]
+
+    def _decode(self):
+        image = Image.open(io.BytesIO(self._source()))
+        if image.mode not in _CHANNELS:
+            image = image.convert("RGB")
+        self._pixels = memoryview(image.tobytes())
+        self._size = image.size
+        self._mode = image.mode
+
+    def array(self) -> np.ndarray:
+        """The pixels as a read-only (height, width, channels) array view."""
+        if self._pixels is None:
+            self._decode()
+        width, height = self._size
+        array = np.frombuffer(self._pixels, dtype=np.uint8)
+        channels = _CHANNELS[self._mode]
+        if channels == 1:
+            return array.reshape(height, width)
+        return array.reshape(height, width, channels)
+
+    def image(self) -> Image.Image:
+        """A PIL image of the frame, sharing the pixel buffer where possible."""
+        if self._pixels is None:
+            self._decode()
+        return Image.frombuffer(
+            self._mode, self._size, self._pixels, "raw", self._mode, 0, 1
+        )
+
+    def same_as(self, other: "Frame") -> bool:
+        """Whether `other` shows exactly the same pixels.
+
+        Compares encoded sources when both frames have one, pixels otherwise.
+        Either is far cheaper than encoding a frame.
+        """
+        if other is self:
+            return True
+        if self._source_format is not None and self._source_format == other._source_format:
+            if self._source() == other._source():
+                return True
+            if self._source_format == "png":
+                # Same PNG encoder, same pixels, same bytes.
+                return False
+        if self.size != other.size:
+            return False
+        return np.array_equal(self.array(), other.array())
+
+    def encode(self, format: str = "png", **options) -> bytes:
+        """Returns the frame encoded as `format`, e.g. png or jpeg.
+
+        `options` are passed to PIL, e.g. `quality=80` for JPEG. Each
+        (format, options) pair is encoded once per frame.
+        """
+        format = format.lower()
+        key = (format, tuple(sorted(options.items())))
+        if format == self._source_format == "png":
+            # PNG is lossless, the source serves whatever the compression
+            # options.
+            key = ("png", ())
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            image = self.image()
+            if format == "jpeg" and image.mode == "RGBA":
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, format=format.upper(), **options)
+            encoded = buffer.getvalue()
+            self._encoded[key] = encoded
+        if not isinstance(encoded, bytes):
+            # Views over someone else's buffer are materialized once.
+            encoded = bytes(encoded)
+            self._encoded[key] = encoded
+        return encoded
+
+    def png(self) -> bytes:
+        return self.encode("png")
+
+    def base64(self, format: str = "png", **options) -> str:
+        key = (format.lower(), tuple(sorted(options.items())))
+        encoded = self._base64.get(key)
+        if encoded is None:
+            encoded = base64.b64encode(self.encode(format, **options)).decode("ascii")
+            self._base64[key] = encoded
+        return encoded
+
+    def data_url(self, format: str = "png", **options) -> str:
+        mime_type = _MIME_TYPES[format.lower()]
+        return f"data:{mime_type};base64,{self.base64(format, **options)}"
+
+    def __reduce__(self):
+        # Memoryviews do not pickle, frames cross process boundaries as the
+        # bytes of their source.
+        if self._source_format is not None:
+            return (Frame, (bytes(self._source()), self._source_format))
+        return (Frame, (None, None, bytes(self._pixels), self._size, self._mode))
+
+    def __bytes__(self) -> bytes:
+        return self.png()
+
+    def __repr__(self) -> str:
+        source = self._source_format or "pixels"
+        if self._size is None:
+            return f"Frame({source})"
+        return f"Frame({source}, {self._size[0]}x{self._size[1]})"
@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Classifies each screenshot against the previous one.
+
+Frames are compared block by block with NumPy: a block counts as changed when
+any of its pixels differs by more than `pixel_threshold` in any channel. The
+bounding box of the changed blocks decides whether a frame is "unchanged", a
+"region" change (small enough to send as a crop) or a "full" change.
+
+Crops are returned as frames over the decoded pixels and are only encoded if
+the agent actually sends them.
+"""
+import dataclasses
+import io
+from typing import Literal, Optional
+
+import numpy as np
+from PIL import Image
+
+from ..frame import Frame
+
+FrameChangeKind = Literal["unchanged", "region", "full"]
+
+
+def decode_png(png: bytes) -> np.ndarray:
+    """Decodes a PNG screenshot into an (height, width, 3) uint8 array."""
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def changed_blocks(
+    previous: np.ndarray,
+    current: np.ndarray,
+    block_size: int = 16,
+    pixel_threshold: int = 16,
+) -> np.ndarray:
+    """Returns a (rows, cols) boolean mask of blocks that differ."""
+    b = block_size
+    height, width = current.shape[:2]
+    # Pad to a whole number of blocks so the frame reshapes cleanly.
+    pad = ((0, -height % b), (0, -width % b), (0, 0))
+    diff = np.abs(current.astype(np.int16) - previous.astype(np.int16))
+    diff = np.pad(diff, pad).max(axis=2)
+    blocks = diff.reshape(diff.shape[0] // b, b, diff.shape[1] // b, b)
+    return blocks.max(axis=(1, 3)) > pixel_threshold
+
+
+@dataclasses.dataclass
+class FrameChange:
+    kind: FrameChangeKind
+    # (left, top, right, bottom) in pixels for "region" changes.
+    region: Optional[tuple[int, int, int, int]] = None
+    # Crop of `region` for "region" changes.
+    region_frame: Optional[Frame] = None
+
+
+class FrameDiffer:
+    """Keeps the last frame and classifies new frames against it."""
+
+    def __init__(
+        self,
+        block_size: int = 16,
+        pixel_threshold: int = 16,
+        max_region_fraction: float = 0.25,
+    ):
+        self._block_size = block_size
+        self._pixel_threshold = pixel_threshold
+        # Changes whose bounding box covers more of the frame than this are
+        # reported as "full".
+        self._max_region_fraction = max_region_fraction
+        self._last_encoded: Optional[bytes] = None
+        self._last_pixels: Optional[np.ndarray] = None
+
+    def reset(self):
+        """Forgets the last frame, e.g. after the active page changed."""
+        self._last_encoded = None
+        self._last_pixels = None
+
+    def classify(self, frame: Frame) -> FrameChange:
+        """Classifies `frame` against the last frame and remembers it."""
+        encoded = frame.png()
+        if encoded == self._last_encoded:
+            return FrameChange(kind="unchanged")
+        # Decoded once, the pixels are cached on the frame.
+        pixels = frame.array()
+        if pixels.ndim != 3 or pixels.shape[2] != 3:
+            pixels = np.asarray(frame.image().convert("RGB"))
+        previous = self._last_pixels
+        self._last_encoded = encoded
+        self._last_pixels = pixels
+        if previous is None or previous.shape != pixels.shape:
+            return FrameChange(kind="full")
+
+        changed = changed_blocks(
+            previous, pixels, self._block_size, self._pixel_threshold
+        )
+        if not changed.any():
+            return FrameChange(kind="unchanged")
+
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        height, width = pixels.shape[:2]
+        b = self._block_size
+        left, top = int(cols[0]) * b, int(rows[0]) * b
+        right = min(int(cols[-1] + 1) * b, width)
+        bottom = min(int(rows[-1] + 1) * b, height)
+        if (right - left) * (bottom - top) > self._max_region_fraction * width * height:
+            return FrameChange(kind="full")
+
+        return FrameChange(
+            kind="region",
+            region=(left, top, right, bottom),
+            region_frame=Frame.from_array(pixels[top:bottom, left:right]),
+        )
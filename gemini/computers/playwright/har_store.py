@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""HAR record / replay on top of `BrowserContext.route_from_har`.
+
+Layout of a store:
+
+    <root>/recordings/<name>.har   one HAR file per recording
+    <root>/blobs/<sha256>.<ext>    response bodies, shared by all recordings
+
+Response bodies are content addressed, so recording the same site many times
+only stores each distinct body once.
+"""
+import hashlib
+import json
+import os
+from typing import Literal
+
+HarMode = Literal["record", "replay"]
+
+DEFAULT_HAR_STORE = os.environ.get("HAR_STORE", "har_store")
+
+
+class HarStore:
+    """Records and replays named HAR files with shared response bodies."""
+
+    def __init__(self, root: str = DEFAULT_HAR_STORE):
+        self._root = root
+        self._recordings_dir = os.path.join(root, "recordings")
+        self._blobs_dir = os.path.join(root, "blobs")
+
+    def har_path(self, name: str) -> str:
+        return os.path.join(self._recordings_dir, f"{name}.har")
+
+    def _route_kwargs(self, name: str, mode: HarMode, strict: bool) -> dict:
+        if mode not in ("record", "replay"):
+            raise ValueError("Unsupported HAR mode: ", mode)
+        path = self.har_path(name)
+        if mode == "replay":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No HAR recording named {name!r} at {path}")
+            # Strict replay aborts anything missing from the recording, so a
+            # benchmark never silently touches the network.
+            return {
+                "har": path,
+                "not_found": "abort" if strict else "fallback",
+            }
+        os.makedirs(self._recordings_dir, exist_ok=True)
+        return {
+            "har": path,
+            "update": True,
+            "update_content": "attach",
+            "update_mode": "minimal",
+        }
+
+    def install(self, context, name: str, mode: HarMode, strict: bool = True):
+        """Routes a sync `BrowserContext` through the recording `name`."""
+        context.route_from_har(**self._route_kwargs(name, mode, strict))
+
+    async def install_async(
+        self, context, name: str, mode: HarMode, strict: bool = True
+    ):
+        """Routes an async `BrowserContext` through the recording `name`."""
+        await context.route_from_har(**self._route_kwargs(name, mode, strict))
+
+    def finalize(self, name: str) -> int:
+        """Moves the bodies of a finished recording into the shared blob store.
+
+        Playwright only writes the HAR when the context is closed, so call this
+        after `context.close()`. Returns the number of newly stored bodies.
+        """
+        path = self.har_path(name)
+        if not os.path.exists(path):
+            return 0
+        os.makedirs(self._blobs_dir, exist_ok=True)
+        with open(path, encoding="utf-8") as f:
+            har = json.load(f)
+
+        stored = 0
+        # Playwright may point several entries at the same attachment.
+        blob_names: dict[str, str] = {}
+        for entry in har["log"]["entries"]:
+            content = entry["response"].get("content", {})
+            attached = content.get("_file")
+            if not attached or attached.startswith("../blobs/"):
+                continue
+            if attached not in blob_names:
+                blob_names[attached], is_new = self._store_blob(attached)
+                stored += is_new
+            # Resolved by Playwright relative to the HAR file's directory.
+            content["_file"] = f"../blobs/{blob_names[attached]}"
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+        return stored
+
+    def _store_blob(self, attached: str) -> tuple[str, bool]:
+        """Moves one attachment into the blob store.
+
+        Returns the blob name and whether the body was not stored before.
+        """
+        attached_path = os.path.join(self._recordings_dir, attached)
+        with open(attached_path, "rb") as f:
+            body = f.read()
+        _, ext = os.path.splitext(attached)
+        blob_name = hashlib.sha256(body).hexdigest() + ext
+        blob_path = os.path.join(self._blobs_dir, blob_name)
+        if os.path.exists(blob_path):
+            os.remove(attached_path)
+            return blob_name, False
+        os.replace(attached_path, blob_path)
+        return blob_name, True
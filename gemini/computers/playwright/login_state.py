@@ -0,0 +1,188 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shares logins between ephemeral browser contexts through storage state.
+
+A persistent profile directory is locked by the Chromium instance using it,
+so only one session can be logged in at a time. Instead, log in once and
+export the context's storage state (cookies and local storage):
+
+    python -m computers.playwright.login_state zhipin.com https://www.zhipin.com/web/user/
+
+Any number of contexts of a single browser can then start from that state:
+
+    store = LoginStore()
+    context = store.new_context(browser, "zhipin.com", viewport=...)
+
+States are checked for expiry per site before use. Saving the state of a
+context again when it closes keeps sites that rotate their cookies logged in,
+but does not make the login younger: the time of the interactive login is
+stored with the state and carried over. Once a state has expired, repeat the
+interactive login.
+"""
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+DEFAULT_LOGIN_STORE = os.environ.get("LOGIN_STORE", "login_state")
+
+# Cookies that carry the login, per site. For other sites a state is usable
+# as long as any of the site's cookies is.
+AUTH_COOKIES: dict[str, list[str]] = {}
+
+# Storage states older than this are not trusted, whatever their cookies say.
+DEFAULT_MAX_AGE_HOURS = 72.0
+# Key of the login time in stored states, stripped before they are used.
+LOGGED_IN_AT_KEY = "logged_in_at"
+
+
+def _cookie_matches(cookie: dict, site: str) -> bool:
+    domain = cookie.get("domain", "").lstrip(".")
+    return domain == site or domain.endswith("." + site)
+
+
+class LoginStore:
+    def __init__(
+        self,
+        root: str = DEFAULT_LOGIN_STORE,
+        max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+        auth_cookies: Optional[dict[str, list[str]]] = None,
+        refresh_margin_seconds: float = 3600,
+    ):
+        self._root = root
+        self._max_age_seconds = max_age_hours * 3600
+        self._auth_cookies = AUTH_COOKIES if auth_cookies is None else auth_cookies
+        # Cookies expiring within this margin count as expired, so a run does
+        # not get logged out halfway through.
+        self._refresh_margin_seconds = refresh_margin_seconds
+
+    def path(self, site: str) -> str:
+        return os.path.join(self._root, f"{site}.json")
+
+    def _read(self, site: str) -> tuple[dict, float]:
+        """Returns the stored state for `site` and when its login happened."""
+        path = self.path(site)
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        # States stored before the login time was recorded: the file's age.
+        logged_in_at = state.pop(LOGGED_IN_AT_KEY, None) or os.path.getmtime(path)
+        return state, logged_in_at
+
+    def problem(self, site: str) -> Optional[str]:
+        """Returns why the stored state for `site` cannot be used, or None."""
+        if not os.path.exists(self.path(site)):
+            return "no login captured"
+        state, logged_in_at = self._read(site)
+        age = time.time() - logged_in_at
+        if age > self._max_age_seconds:
+            return f"logged in {age / 3600:.0f}h ago"
+        return self._cookie_problem(state, site)
+
+    def _cookie_problem(self, state: dict, site: str) -> Optional[str]:
+        deadline = time.time() + self._refresh_margin_seconds
+        cookies = [c for c in state.get("cookies", []) if _cookie_matches(c, site)]
+
+        def alive(cookie: dict) -> bool:
+            # Session cookies have expires == -1.
+            return cookie.get("expires", -1) < 0 or cookie["expires"] > deadline
+
+        names = self._auth_cookies.get(site)
+        if names:
+            by_name = {c["name"]: c for c in cookies}
+            for name in names:
+                if name not in by_name:
+                    return f"login cookie {name} missing"
+                if not alive(by_name[name]):
+                    return f"login cookie {name} expired"
+            return None
+        if not any(alive(c) for c in cookies):
+            return "all cookies expired"
+        return None
+
+    def load(self, site: str) -> Optional[dict]:
+        """Returns the stored state for `site` if it is still usable."""
+        if self.problem(site):
+            return None
+        return self._read(site)[0]
+
+    def _require(self, site: str) -> dict:
+        problem = self.problem(site)
+        if problem:
+            raise ValueError(
+                f"Login state for {site} is not usable ({problem}). Log in with "
+                f"`python -m computers.playwright.login_state {site} <login url>`."
+            )
+        return self.load(site)
+
+    def _write(self, site: str, state: dict, logged_in: bool) -> str:
+        os.makedirs(self._root, exist_ok=True)
+        path = self.path(site)
+        if logged_in or not os.path.exists(path):
+            logged_in_at = time.time()
+        else:
+            logged_in_at = self._read(site)[1]
+        state = {**state, LOGGED_IN_AT_KEY: logged_in_at}
+        # Write then rename, parallel contexts may be reading the old state.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def save(self, context, site: str, logged_in: bool = False) -> str:
+        """Stores the storage state of a sync `BrowserContext` for `site`.
+
+        `logged_in` marks a fresh login, otherwise the state keeps the login
+        time of the state it replaces.
+        """
+        return self._write(site, context.storage_state(), logged_in)
+
+    async def save_async(self, context, site: str, logged_in: bool = False) -> str:
+        """Stores the storage state of an async `BrowserContext` for `site`."""
+        return self._write(site, await context.storage_state(), logged_in)
+
+    def new_context(self, browser, site: str, **options):
+        """Opens a context of a sync `Browser`, logged in to `site`."""
+        return browser.new_context(storage_state=self._require(site), **options)
+
+    async def new_context_async(self, browser, site: str, **options):
+        """Opens a context of an async `Browser`, logged in to `site`."""
+        return await browser.new_context(storage_state=self._require(site), **options)
+
+
+def interactive_login(playwright, store: LoginStore, site: str, login_url: str) -> str:
+    """Opens a headed browser on `login_url` and stores the state once the
+    user confirms they logged in."""
+    browser = playwright.chromium.launch(headless=False)
+    context = browser.new_context()
+    page = context.new_page()
+    page.goto(login_url)
+    input(f"Log in to {site} in the browser window, then press Enter...")
+    path = store.save(context, site, logged_in=True)
+    browser.close()
+    problem = store.problem(site)
+    if problem:
+        print(f"Warning: the stored state does not look logged in ({problem}).")
+    return path
+
+
+if __name__ == "__main__":
+    from playwright.sync_api import sync_playwright
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python -m computers.playwright.login_state <site> <login url>")
+    with sync_playwright() as p:
+        saved = interactive_login(p, LoginStore(), sys.argv[1], sys.argv[2])
+    print(f"Saved login state to {saved}")
@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Freezes transitions and animations so pages settle sooner.
+
+Three layers, from least to most invasive:
+  1. `prefers-reduced-motion: reduce` emulation, which well-behaved sites
+     (including Ant Design) honour on their own.
+  2. A stylesheet that cuts transition and animation durations to 1ms, so
+     dropdowns and page transitions jump to their end state.
+  3. Fast-forwarding of timers that only drive animations: finite Web
+     Animations are finished and jQuery effects are turned off. Application
+     timers (setTimeout / setInterval) are left alone.
+"""
+import json
+
+# Context options, passed to `new_context` / `launch_persistent_context`.
+FREEZE_CONTEXT_OPTIONS = {"reduced_motion": "reduce"}
+
+# Durations are 1ms rather than 0s: zero-length transitions never fire
+# `transitionend`, which UI libraries wait on before removing overlays.
+FREEZE_MOTION_CSS = """
+*, *::before, *::after {
+    transition-duration: 1ms !important;
+    transition-delay: 0s !important;
+    animation-duration: 1ms !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+FREEZE_MOTION_SCRIPT = (
+    """
+(() => {
+    if (window.__playwrightMotionFrozen) {
+        return;
+    }
+    window.__playwrightMotionFrozen = true;
+    const css = %s;
+    const addStyle = () => {
+        if (document.getElementById('playwright-freeze-motion')) {
+            return;
+        }
+        const style = document.createElement('style');
+        style.id = 'playwright-freeze-motion';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    const finishAnimations = () => {
+        if (window.jQuery && window.jQuery.fx) {
+            window.jQuery.fx.off = true;
+        }
+        if (!document.getAnimations) {
+            return;
+        }
+        for (const animation of document.getAnimations()) {
+            const timing = animation.effect && animation.effect.getComputedTiming();
+            if (timing && Number.isFinite(timing.endTime)) {
+                try {
+                    animation.finish();
+                } catch (e) {
+                    // Animations with a pending playback rate can refuse to finish.
+                }
+            }
+        }
+    };
+    if (document.documentElement) {
+        addStyle();
+    } else {
+        new MutationObserver((_, observer) => {
+            if (document.documentElement) {
+                observer.disconnect();
+                addStyle();
+            }
+        }).observe(document, {childList: true});
+    }
+    document.addEventListener('DOMContentLoaded', () => {
+        addStyle();
+        finishAnimations();
+    });
+    window.__playwrightFinishAnimations = finishAnimations;
+})();
+"""
+    % json.dumps(FREEZE_MOTION_CSS)
+)
+
+# Finishes animations started since the last call. Cheap enough to run
+# before every screenshot.
+FINISH_ANIMATIONS_CALL = (
+    "() => window.__playwrightFinishAnimations && window.__playwrightFinishAnimations()"
+)
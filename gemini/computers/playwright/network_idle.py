@@ -0,0 +1,53 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tracks in-flight requests of a browser context.
+
+Playwright's own "networkidle" load state only applies to navigations. This
+tracker also covers XHR / fetch traffic triggered after the page loaded, which
+is what an agent usually waits on.
+"""
+import time
+
+
+class NetworkIdleTracker:
+    def __init__(self, quiet_seconds: float = 0.5):
+        # How long no request may be in flight before the network counts as
+        # idle.
+        self._quiet_seconds = quiet_seconds
+        self._inflight: set = set()
+        self._last_activity = time.monotonic()
+
+    def install(self, context):
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    def _on_request(self, request):
+        self._inflight.add(request)
+        self._last_activity = time.monotonic()
+
+    def _on_done(self, request):
+        self._inflight.discard(request)
+        self._last_activity = time.monotonic()
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def is_idle(self) -> bool:
+        """True if nothing was in flight for the last `quiet_seconds`."""
+        return (
+            not self._inflight
+            and time.monotonic() - self._last_activity >= self._quiet_seconds
+        )
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compact text rendering of what is visible in the viewport.
+
+The whole main-frame DOM and its layout are fetched with a single
+`DOMSnapshot.captureSnapshot` CDP call. Only nodes with a layout box that
+intersects the viewport are kept. Each line is either a run of visible text
+or an interactive element, followed by its center on the same 0-999 grid the
+Computer Use model uses for coordinates, e.g.
+
+    [button] 搜索 @(512,88)
+    G1303 苏州 07:12 南京 08:01 @(230,410)
+"""
+from typing import Optional, Union
+
+import playwright.sync_api
+
+# Elements that are rendered as "[tag] label" lines.
+INTERACTIVE_TAGS = {"A", "BUTTON", "INPUT", "SELECT", "TEXTAREA", "OPTION", "LABEL"}
+# Elements whose text never reaches the screen.
+SKIPPED_TAGS = {"SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE", "HEAD"}
+# Attributes used as a label when an element has no visible text.
+LABEL_ATTRIBUTES = ("aria-label", "placeholder", "title", "alt", "value", "name")
+
+DEFAULT_TEXT_BUDGET = 6000
+
+
+class PageTextCapturer:
+    """Captures viewport text snapshots, reusing one CDP session per page."""
+
+    def __init__(self, budget: int = DEFAULT_TEXT_BUDGET):
+        self._budget = budget
+        self._sessions: dict[playwright.sync_api.Page, playwright.sync_api.CDPSession] = {}
+
+    def capture(self, page: playwright.sync_api.Page) -> str:
+        session = self._session_for(page)
+        snapshot = session.send(
+            "DOMSnapshot.captureSnapshot",
+            {"computedStyles": [], "includeDOMRects": False},
+        )
+        viewport = page.viewport_size or {"width": 0, "height": 0}
+        return render_snapshot(
+            snapshot, viewport["width"], viewport["height"], self._budget
+        )
+
+    def _session_for(
+        self, page: playwright.sync_api.Page
+    ) -> playwright.sync_api.CDPSession:
+        session = self._sessions.get(page)
+        if session is None:
+            session = page.context.new_cdp_session(page)
+            self._sessions[page] = session
+            page.on("close", lambda p: self._sessions.pop(p, None))
+        return session
+
+
+def render_snapshot(snapshot: dict, width: int, height: int, budget: int) -> str:
+    """Renders a `DOMSnapshot.captureSnapshot` result as compact text."""
+    strings = snapshot["strings"]
+    if not snapshot["documents"]:
+        return ""
+    document = snapshot["documents"][0]
+    nodes = document["nodes"]
+    layout = document["layout"]
+    scroll_x = document.get("scrollOffsetX", 0)
+    scroll_y = document.get("scrollOffsetY", 0)
+
+    def string(index: int) -> str:
+        return strings[index] if index >= 0 else ""
+
+    parents = nodes["parentIndex"]
+    names = [string(i) for i in nodes["nodeName"]]
+    rare_input_values = nodes.get("inputValue", {})
+    input_values = {
+        node: string(value)
+        for node, value in zip(
+            rare_input_values.get("index", []), rare_input_values.get("value", [])
+        )
+    }
+
+    def attributes(node: int) -> dict:
+        flat = nodes["attributes"][node]
+        return {string(flat[i]).lower(): string(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    # Nearest SKIPPED_TAGS / INTERACTIVE_TAGS ancestor per node, or -1.
+    skipped_by: list[int] = []
+    owner_of: list[int] = []
+    for node, name in enumerate(names):
+        parent = parents[node]
+        # Parents always precede their children in the snapshot.
+        skipped_by.append(
+            node if name in SKIPPED_TAGS else (skipped_by[parent] if parent >= 0 else -1)
+        )
+        owner_of.append(
+            node if name in INTERACTIVE_TAGS else (owner_of[parent] if parent >= 0 else -1)
+        )
+
+    def center(bounds: list) -> Optional[tuple[int, int]]:
+        x, y, w, h = bounds
+        x -= scroll_x
+        y -= scroll_y
+        if w <= 0 or h <= 0 or x + w <= 0 or y + h <= 0 or x >= width or y >= height:
+            return None
+        cx = min(max(x + w / 2, 0), width - 1)
+        cy = min(max(y + h / 2, 0), height - 1)
+        return int(cx / width * 1000), int(cy / height * 1000)
+
+    # Text lines, or the node index of an interactive element whose line is
+    # rendered once all of its visible text has been collected.
+    entries: list[Union[str, int]] = []
+    interactive: dict[int, tuple[tuple[int, int], list[str]]] = {}
+
+    for node, bounds, text_index in zip(
+        layout["nodeIndex"], layout["bounds"], layout["text"]
+    ):
+        position = center(bounds)
+        if position is None or skipped_by[node] >= 0:
+            continue
+        text = " ".join(string(text_index).split())
+        owner = owner_of[node]
+        if owner >= 0:
+            if owner not in interactive:
+                interactive[owner] = (position, [])
+                entries.append(owner)
+            if text:
+                interactive[owner][1].append(text)
+        elif text:
+            entries.append(f"{text} @({position[0]},{position[1]})")
+
+    lines: list[str] = []
+    used = 0
+    for entry in entries:
+        line = entry if isinstance(entry, str) else _interactive_line(
+            names[entry].lower(),
+            attributes(entry),
+            input_values.get(entry),
+            *interactive[entry],
+        )
+        if used + len(line) + 1 > budget:
+            lines.append("... (truncated)")
+            break
+        lines.append(line)
+        used += len(line) + 1
+    return "\n".join(lines)
+
+
+def _interactive_line(
+    tag: str,
+    attrs: dict,
+    input_value: Optional[str],
+    position: tuple[int, int],
+    texts: list[str],
+) -> str:
+    label = input_value or " ".join(texts)
+    if not label:
+        label = next((attrs[a] for a in LABEL_ATTRIBUTES if attrs.get(a)), "")
+    if tag == "input":
+        tag = f"input {attrs.get('type', 'text')}"
+    parts = [f"[{tag}]"] + ([label] if label else []) + [f"@({position[0]},{position[1]})"]
+    return " ".join(parts)
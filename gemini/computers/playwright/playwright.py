@@ -11,18 +11,55 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
 import logging
 import termcolor
 import time
 import os
 import sys
+from ..adaptive_wait import AdaptiveWait
 from ..computer import (
+    Action,
+    ClickAt,
     Computer,
+    ComputerRecoveredError,
+    DragAndDrop,
+    DragPath,
     EnvState,
+    GoBack,
+    GoForward,
+    HoverAt,
+    KeyCombination,
+    MouseClickAt,
+    Navigate,
+    OpenWebBrowser,
+    ScrollAt,
+    ScrollDocument,
+    Search,
+    TypeText,
+    TypeTextAt,
+    Wait5Seconds,
+    action_args,
 )
+from ..frame import Frame
+from .frame_diff import FrameDiffer, decode_png
+from .har_store import DEFAULT_HAR_STORE, HarMode, HarStore
+from .login_state import DEFAULT_LOGIN_STORE, LoginStore
+from .motion import (
+    FINISH_ANIMATIONS_CALL,
+    FREEZE_CONTEXT_OPTIONS,
+    FREEZE_MOTION_SCRIPT,
+)
+from .network_idle import NetworkIdleTracker
+from .popups import PopupDismisser
+from .recycling import ResourceGovernor, driver_pid
+from .page_text import DEFAULT_TEXT_BUDGET, PageTextCapturer
+from .request_blocking import RequestBlocker
+from .tabs import TabManager
+from .watchdog import Watchdog, guarded, is_browser_failure
 import playwright.sync_api
 from playwright.sync_api import sync_playwright
-from typing import Literal
+from typing import Literal, Optional
 
 # Define a mapping from the user-friendly key names to Playwright's expected key names.
 # Playwright is generally good with case-insensitivity for these, but it's best to be canonical.
@@ -71,8 +108,90 @@ PLAYWRIGHT_KEY_MAP = {
     "command": "Meta",  # 'Meta' is Command on macOS, Windows key on Windows
 }
 
+# Installed once per context with `add_init_script`. Keeps a single overlay
+# element per document and moves it on every call instead of appending a new
+# node per action.
+HIGHLIGHT_MOUSE_SCRIPT = """
+(() => {
+    if (window.__playwrightHighlight) {
+        return;
+    }
+    let circle = null;
+    let hideTimer = null;
+    window.__playwrightHighlight = (x, y) => {
+        if (!circle || !circle.isConnected) {
+            circle = document.createElement('div');
+            circle.id = 'playwright-feedback-circle';
+            circle.style.pointerEvents = 'none';
+            circle.style.border = '4px solid red';
+            circle.style.borderRadius = '50%';
+            circle.style.width = '20px';
+            circle.style.height = '20px';
+            circle.style.position = 'fixed';
+            circle.style.zIndex = '2147483647';
+            document.documentElement.appendChild(circle);
+        }
+        circle.style.left = (x - 10) + 'px';
+        circle.style.top = (y - 10) + 'px';
+        circle.hidden = false;
+        clearTimeout(hideTimer);
+        hideTimer = setTimeout(() => { circle.hidden = true; }, 2000);
+    };
+})();
+"""
+HIGHLIGHT_MOUSE_CALL = """
+([x, y]) => {
+    if (!window.__playwrightHighlight) {
+        return false;
+    }
+    window.__playwrightHighlight(x, y);
+    return true;
+}
+"""
+
+# Text shorter than this is always typed key by key in "auto" mode.
+INSERT_TEXT_MIN_LENGTH = 20
+
+# Describes the focused element so `type_text_at` can decide whether the text
+# can be inserted in one go. Fields that react to individual key events
+# (autocomplete pickers, inline key handlers) need per-key typing.
+FOCUSED_FIELD_SCRIPT = """
+() => {
+    let el = document.activeElement;
+    while (el && el.shadowRoot && el.shadowRoot.activeElement) {
+        el = el.shadowRoot.activeElement;
+    }
+    if (!el || el === document.body) {
+        return {editable: false, keyHandlers: false};
+    }
+    const tag = el.tagName.toLowerCase();
+    const textTypes = ['text', 'search', 'email', 'url', 'tel', 'password', ''];
+    const editable =
+        tag === 'textarea' ||
+        (tag === 'input' && textTypes.includes((el.getAttribute('type') || '').toLowerCase())) ||
+        el.isContentEditable;
+    const keyHandlers =
+        ['onkeydown', 'onkeyup', 'onkeypress'].some((a) => el.hasAttribute(a)) ||
+        el.getAttribute('role') === 'combobox' ||
+        el.hasAttribute('aria-autocomplete') ||
+        el.hasAttribute('list');
+    return {editable: !!editable, keyHandlers: keyHandlers};
+}
+"""
+
 PROFILE_PATH = "/Users/gongwenwei/gitrepo/ai_agent_dev/playwright_profiles/my_chrome_profile"
 
+BROWSER_ARGS = [
+    "--disable-extensions",
+    "--disable-file-system",
+    "--disable-plugins",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    # No '--no-sandbox' arg means the sandbox is on.
+]
+
 
 class PlaywrightComputer(Computer):
     """Connects to a local Playwright instance."""
@@ -83,21 +202,113 @@ class PlaywrightComputer(Computer):
         initial_url: str = "https://www.google.com",
         search_engine_url: str = "https://www.google.com",
         highlight_mouse: bool = False,
+        typing_strategy: Literal["auto", "insert", "type"] = "auto",
+        block_profile: Optional[str] = None,
+        single_tab: bool = True,
+        observation: Literal["pixels", "text", "both"] = "pixels",
+        page_text_budget: int = DEFAULT_TEXT_BUDGET,
+        har_mode: Optional[HarMode] = None,
+        har_name: str = "playwright",
+        har_strict: bool = True,
+        har_store: str = DEFAULT_HAR_STORE,
+        frame_diff: bool = False,
+        freeze_animations: bool = False,
+        dismiss_popups: bool = False,
+        popup_rules_path: Optional[str] = None,
+        recycle_after_steps: Optional[int] = None,
+        recycle_above_rss_mb: Optional[float] = None,
+        login_site: Optional[str] = None,
+        login_store: str = DEFAULT_LOGIN_STORE,
+        action_timeout_seconds: Optional[float] = None,
+        persistent_profile: bool = True,
     ):
         self._initial_url = initial_url
         self._screen_size = screen_size
         self._search_engine_url = search_engine_url
         self._highlight_mouse = highlight_mouse
+        # "type" sends one key event per character, "insert" inserts the whole
+        # text at once, "auto" inserts long text into plain text fields only.
+        self._typing_strategy = typing_strategy
+        # Aborts trackers, media etc. according to a named profile, see
+        # `request_blocking.BLOCK_PROFILES`.
+        self._request_blocker = (
+            RequestBlocker(block_profile) if block_profile else None
+        )
+        self._tabs = TabManager(single_tab=single_tab)
+        if observation not in ("pixels", "text", "both"):
+            raise ValueError("Unsupported observation: ", observation)
+        # Whether `current_state` captures a screenshot, a text snapshot of the
+        # visible page, or both.
+        self._observation = observation
+        self._page_text = PageTextCapturer(budget=page_text_budget)
+        # Records all traffic into, or serves it from, a named HAR recording.
+        # Strict replay aborts requests that are not in the recording.
+        self._har_mode = har_mode
+        self._har_name = har_name
+        self._har_strict = har_strict
+        self._har_store = HarStore(har_store)
+        # Classifies each screenshot as unchanged / region / full change
+        # against the previous one.
+        self._frame_differ = FrameDiffer() if frame_diff else None
+        # Disables transitions / animations so screenshots are deterministic
+        # and need a shorter settle wait.
+        self._freeze_animations = freeze_animations
+        # Closes cookie banners / login nags before every capture and learns
+        # new rules from agent clicks that close overlays.
+        self._popup_dismisser = (
+            PopupDismisser(learned_rules_path=popup_rules_path)
+            if dismiss_popups
+            else None
+        )
+        # `wait_5_seconds` returns as soon as the screen changes or no request
+        # has been in flight for a moment.
+        self._adaptive_wait = AdaptiveWait(max_seconds=5.0)
+        self._network = NetworkIdleTracker()
+        # Replaces the context with a fresh one, keeping cookies and the
+        # current URL, after too many steps or once the browser grew too big.
+        self._governor = None
+        if recycle_after_steps is not None or recycle_above_rss_mb is not None:
+            if har_mode == "record":
+                # Every context writes the recording on close, a recycled
+                # context would overwrite what the previous one recorded.
+                raise ValueError("Recycling is not supported while recording a HAR.")
+            self._governor = ResourceGovernor(
+                max_steps=recycle_after_steps, max_rss_mb=recycle_above_rss_mb
+            )
+        # With a login site, the computer runs an ephemeral context of its own
+        # browser, starting from the login stored for that site, instead of
+        # the persistent profile. Several computers can then run in parallel.
+        self._login_site = login_site
+        self._login_store = LoginStore(login_store)
+        # Without the persistent profile (or with a login site), contexts
+        # start empty and leave nothing behind, like those of `reset`.
+        self._ephemeral = login_site is not None or not persistent_profile
+        # Actions that hang past this deadline, or hit a crashed page or
+        # browser, rebuild the browser on the last known URL and raise
+        # `ComputerRecoveredError`.
+        if action_timeout_seconds and har_mode == "record":
+            # A rebuild drops the hung context without closing it, so the
+            # recording would never be written, then overwritten by the next.
+            raise ValueError("Action timeouts are not supported while recording a HAR.")
+        self._watchdog = (
+            Watchdog(action_timeout_seconds) if action_timeout_seconds else None
+        )
+        self._last_url = initial_url
+        # The Playwright driver of this computer, its browsers are children.
+        self._driver_pid: Optional[int] = None
+
+    @property
+    def _page(self) -> playwright.sync_api.Page:
+        return self._tabs.active
 
     def _handle_new_page(self, new_page: playwright.sync_api.Page):
-        """The Computer Use model only supports a single tab at the moment.
+        """Some websites try to open links in a new tab.
 
-        Some websites, however, try to open links in a new tab.
-        For those situations, we intercept the page-opening behavior, and instead overwrite the current page.
+        The new page is adopted as the active page as-is instead of being
+        re-navigated. In single-tab mode the previous page is hidden, so the
+        model still only sees one tab.
         """
-        new_url = new_page.url
-        new_page.close()
-        self._page.goto(new_url)
+        self._tabs.adopt(new_page)
 
     # def __enter__(self):
     #     print("Creating session...")
@@ -136,26 +347,12 @@ class PlaywrightComputer(Computer):
     def __enter__(self):
         print("Creating session...")
         self._playwright = sync_playwright().start()
-        self._context = self._playwright.chromium.launch_persistent_context(
-            user_data_dir=PROFILE_PATH,
-            args=[
-                "--disable-extensions",
-                "--disable-file-system",
-                "--disable-plugins",
-                "--disable-dev-shm-usage",
-                "--disable-background-networking",
-                "--disable-default-apps",
-                "--disable-sync",
-                # No '--no-sandbox' arg means the sandbox is on.
-            ],
-            headless=bool(os.environ.get("PLAYWRIGHT_HEADLESS", False)),
-            viewport={"width": self._screen_size[0], "height": self._screen_size[1]}, 
-        )
-        self._browser = self._context.browser
-        self._page = self._context.new_page()
-        self._page.goto(self._initial_url)
-
-        self._context.on("page", self._handle_new_page)
+        if self._ephemeral:
+            self._browser = self._playwright.chromium.launch(
+                args=BROWSER_ARGS,
+                headless=bool(os.environ.get("PLAYWRIGHT_HEADLESS", False)),
+            )
+        self._open_context(self._initial_url)
 
         termcolor.cprint(
             f"Started local playwright.",
@@ -164,6 +361,85 @@ class PlaywrightComputer(Computer):
         )
         return self
 
+    def _open_context(self, url: str, storage_state: Optional[dict] = None):
+        """Opens the browser context and `url` in its first tab.
+
+        `storage_state` carries cookies and storage over from a previous
+        context. Without it, a login context starts from the stored login.
+        """
+        self._driver_pid = driver_pid(self._playwright)
+        options = dict(
+            viewport={"width": self._screen_size[0], "height": self._screen_size[1]},
+            **(FREEZE_CONTEXT_OPTIONS if self._freeze_animations else {}),
+        )
+        if self._login_site and storage_state is None:
+            self._context = self._login_store.new_context(
+                self._browser, self._login_site, **options
+            )
+        elif self._ephemeral:
+            self._context = self._browser.new_context(
+                storage_state=storage_state, **options
+            )
+        else:
+            self._context = self._playwright.chromium.launch_persistent_context(
+                user_data_dir=PROFILE_PATH,
+                args=BROWSER_ARGS,
+                headless=bool(os.environ.get("PLAYWRIGHT_HEADLESS", False)),
+                **options,
+            )
+            self._browser = self._context.browser
+            # The profile already has everything but session cookies.
+            if storage_state:
+                self._context.add_cookies(storage_state["cookies"])
+        self._setup_context()
+        self._tabs.adopt(self._context.new_page())
+        self._page.goto(url)
+
+        self._context.on("page", self._handle_new_page)
+
+    def _forget_pages(self):
+        """Drops per-page state before the context is replaced."""
+        self._tabs = TabManager(single_tab=self._tabs.single_tab)
+        self._network = NetworkIdleTracker()
+        if self._frame_differ:
+            self._frame_differ.reset()
+
+    def _recycle(self, reason: str):
+        """Replaces the context with a fresh one on the same URL.
+
+        Cookies and local storage are carried over through the storage state.
+        Persistent profiles keep local storage on disk, but drop session
+        cookies when the context closes.
+        """
+        url = self._page.url
+        storage_state = self._context.storage_state()
+        self._context.close()
+        self._forget_pages()
+        self._open_context(url, storage_state)
+        self._governor.reset()
+        termcolor.cprint(
+            f"Recycled the browser context after {reason} "
+            f"(recycle #{self._governor.recycles}).",
+            color="yellow",
+        )
+
+    def reset(self, url: Optional[str] = None) -> EnvState:
+        """Replaces the context with a fresh one on `url` (default: the
+        initial URL), e.g. between independent tasks.
+
+        Ephemeral contexts start empty, or from the stored login with a login
+        site. A persistent profile keeps what it stored on disk.
+        """
+        if self._har_mode == "record":
+            # Like recycling, a second context would overwrite the recording.
+            raise ValueError("Resetting is not supported while recording a HAR.")
+        if self._login_site:
+            self._login_store.save(self._context, self._login_site)
+        self._context.close()
+        self._forget_pages()
+        self._open_context(url or self._initial_url)
+        return self.current_state()
+
     # def __exit__(self, exc_type, exc_val, exc_tb):
     #     if self._context:
     #         self._context.close()
@@ -180,10 +456,100 @@ class PlaywrightComputer(Computer):
 
     #     self._playwright.stop()
     
+    def _run_guarded(self, action: str, run):
+        """Runs `run` under the watchdog, recovering from browser failures."""
+        # Actions call other actions (e.g. `current_state`), only the
+        # outermost one gets a deadline.
+        if not self._watchdog or self._watchdog.armed:
+            return run()
+        try:
+            with self._watchdog.deadline(action, self._driver_pid):
+                return run()
+        except Exception as e:
+            if not (self._watchdog.fired or is_browser_failure(e)):
+                raise
+            if not self._watchdog.fired and self._only_page_closed():
+                # E.g. window.close() or a finished OAuth popup: the tab
+                # manager already switched to a remaining tab.
+                reason = f"the page closed ({str(e).splitlines()[0]})"
+                raise ComputerRecoveredError(action, reason, self.current_state())
+            if self._watchdog.fired:
+                reason = "hard deadline exceeded"
+            else:
+                reason = f"{type(e).__name__}: {str(e).splitlines()[0]}"
+        termcolor.cprint(
+            f"{action} failed ({reason}), restarting the browser.", color="red"
+        )
+        self._rebuild()
+        raise ComputerRecoveredError(action, reason, self.current_state())
+
+    def _only_page_closed(self) -> bool:
+        """Whether the browser is fine and only a page went away."""
+        try:
+            # Persistent contexts have no `Browser` object.
+            if self._browser is not None and not self._browser.is_connected():
+                return False
+            return any(not page.is_closed() for page in self._context.pages)
+        except Exception:
+            return False
+
+    def _rebuild(self):
+        """Replaces a hung or crashed browser with a fresh one.
+
+        The new context opens the last URL a state was captured on, with the
+        old context's storage state if it can still be read, and the
+        profile's or the stored login's otherwise.
+        """
+        storage_state = None
+        try:
+            storage_state = self._context.storage_state()
+        except Exception:
+            pass
+        try:
+            self._playwright.stop()
+        except Exception:
+            # The driver connection is already gone.
+            pass
+        self._forget_pages()
+        self._playwright = sync_playwright().start()
+        if self._ephemeral:
+            self._browser = self._playwright.chromium.launch(
+                args=BROWSER_ARGS,
+                headless=bool(os.environ.get("PLAYWRIGHT_HEADLESS", False)),
+            )
+        self._open_context(self._last_url, storage_state)
+
+    def _setup_context(self):
+        """Installs routes and init scripts on a freshly created context."""
+        if self._watchdog:
+            self._context.set_default_timeout(self._watchdog.timeout_seconds * 1000)
+        # Routes registered later run first, so blocked requests never reach
+        # the HAR router.
+        if self._har_mode:
+            self._har_store.install(
+                self._context, self._har_name, self._har_mode, self._har_strict
+            )
+        if self._request_blocker:
+            self._request_blocker.install(self._context)
+        self._network.install(self._context)
+        if self._highlight_mouse:
+            self._context.add_init_script(HIGHLIGHT_MOUSE_SCRIPT)
+        if self._freeze_animations:
+            self._context.add_init_script(FREEZE_MOTION_SCRIPT)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._request_blocker:
+            termcolor.cprint(self._request_blocker.summary(), color="cyan")
+        if self._popup_dismisser:
+            termcolor.cprint(self._popup_dismisser.summary(), color="cyan")
         if self._context:
             try:
+                if self._login_site:
+                    # Keeps cookies the site rotated during the run.
+                    self._login_store.save(self._context, self._login_site)
                 self._context.close()
+                if self._ephemeral:
+                    self._browser.close()
             except Exception as e:
                 # Browser was already shut down because of SIGINT or such.
                 if "Browser.close: Connection closed while reading from the driver" in str(
@@ -192,54 +558,204 @@ class PlaywrightComputer(Computer):
                     pass
                 else:
                     raise
+        if self._har_mode == "record":
+            stored = self._har_store.finalize(self._har_name)
+            termcolor.cprint(
+                f"Recorded {self._har_store.har_path(self._har_name)} "
+                f"({stored} new response bodies).",
+                color="cyan",
+            )
 
         self._playwright.stop()
 
+    def execute(self, actions: list[Action], capture: bool = True) -> EnvState:
+        """Runs `actions` back to back, capturing the state once at the end.
+
+        With `capture` False, no screenshot or page text is taken and the
+        state only carries the URL. Each action, and the capture, gets its
+        own watchdog deadline.
+        """
+        waited_seconds = None
+        for action in actions:
+            # Each action method has a non-capturing counterpart prefixed
+            # with an underscore.
+            run = functools.partial(
+                getattr(self, f"_{action.name}"), **action_args(action)
+            )
+            result = self._run_guarded(action.name, run)
+            if action.name == "wait_5_seconds":
+                waited_seconds = (waited_seconds or 0) + result
+        if capture:
+            state = self.current_state()
+        else:
+            state = self._run_guarded("wait_for_load_state", self._url_state)
+        if waited_seconds is not None:
+            state.waited_seconds = round(waited_seconds, 2)
+        return state
+
+    def _url_state(self) -> EnvState:
+        self._page.wait_for_load_state()
+        return EnvState(url=self._page.url)
+
     def open_web_browser(self) -> EnvState:
-        return self.current_state()
+        return self.execute([OpenWebBrowser()])
 
     def click_at(self, x: int, y: int):
+        return self.execute([ClickAt(x=x, y=y)])
+
+    def hover_at(self, x: int, y: int):
+        return self.execute([HoverAt(x=x, y=y)])
+
+    def type_text_at(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        press_enter: bool = False,
+        clear_before_typing: bool = True,
+    ) -> EnvState:
+        return self.execute(
+            [
+                TypeTextAt(
+                    x=x,
+                    y=y,
+                    text=text,
+                    press_enter=press_enter,
+                    clear_before_typing=clear_before_typing,
+                )
+            ]
+        )
+
+    def scroll_document(
+        self, direction: Literal["up", "down", "left", "right"]
+    ) -> EnvState:
+        return self.execute([ScrollDocument(direction=direction)])
+
+    def scroll_at(
+        self,
+        x: int,
+        y: int,
+        direction: Literal["up", "down", "left", "right"],
+        magnitude: int = 800,
+    ) -> EnvState:
+        return self.execute(
+            [ScrollAt(x=x, y=y, direction=direction, magnitude=magnitude)]
+        )
+
+    def wait_5_seconds(self, max_seconds: Optional[float] = None) -> EnvState:
+        return self.execute([Wait5Seconds(max_seconds=max_seconds)])
+
+    def go_back(self) -> EnvState:
+        return self.execute([GoBack()])
+
+    def go_forward(self) -> EnvState:
+        return self.execute([GoForward()])
+
+    def search(self) -> EnvState:
+        return self.execute([Search()])
+
+    def navigate(self, url: str) -> EnvState:
+        return self.execute([Navigate(url=url)])
+
+    def key_combination(self, keys: list[str]) -> EnvState:
+        return self.execute([KeyCombination(keys=keys)])
+
+    def drag_and_drop(
+        self, x: int, y: int, destination_x: int, destination_y: int
+    ) -> EnvState:
+        return self.execute(
+            [
+                DragAndDrop(
+                    x=x, y=y, destination_x=destination_x, destination_y=destination_y
+                )
+            ]
+        )
+
+    def mouse_click_at(
+        self,
+        x: int,
+        y: int,
+        button: Literal["left", "right", "middle"] = "left",
+        clicks: int = 1,
+    ) -> EnvState:
+        return self.execute([MouseClickAt(x=x, y=y, button=button, clicks=clicks)])
+
+    def type_text(self, text: str, press_enter: bool = False) -> EnvState:
+        return self.execute([TypeText(text=text, press_enter=press_enter)])
+
+    def drag_path(self, path: list[tuple[int, int]]) -> EnvState:
+        return self.execute([DragPath(path=path)])
+
+    def _open_web_browser(self):
+        pass
+
+    def _click_at(self, x: int, y: int):
         self.highlight_mouse(x, y)
+        target = None
+        url = self._page.url
+        if self._popup_dismisser:
+            target = self._popup_dismisser.describe_target(self._page, x, y)
         self._page.mouse.click(x, y)
         self._page.wait_for_load_state()
-        return self.current_state()
+        if target:
+            self._popup_dismisser.learn_from_click(self._page, url, target)
 
-    def hover_at(self, x: int, y: int):
+    def _hover_at(self, x: int, y: int):
         self.highlight_mouse(x, y)
         self._page.mouse.move(x, y)
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def type_text_at(
+    def _type_text_at(
         self,
         x: int,
         y: int,
         text: str,
-        press_enter: bool = False,
-        clear_before_typing: bool = True,
-    ) -> EnvState:
+        press_enter: bool,
+        clear_before_typing: bool,
+    ):
         self.highlight_mouse(x, y)
         self._page.mouse.click(x, y)
         self._page.wait_for_load_state()
 
         if clear_before_typing:
             if sys.platform == "darwin":
-                self.key_combination(["Command", "A"])
+                self._press_keys(["Command", "A"])
             else:
-                self.key_combination(["Control", "A"])
-            self.key_combination(["Delete"])
+                self._press_keys(["Control", "A"])
+            self._press_keys(["Delete"])
 
-        self._page.keyboard.type(text)
+        if self._can_insert_text(text):
+            self._page.keyboard.insert_text(text)
+        else:
+            self._page.keyboard.type(text)
         self._page.wait_for_load_state()
 
         if press_enter:
-            self.key_combination(["Enter"])
+            self._press_keys(["Enter"])
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def _horizontal_document_scroll(
-        self, direction: Literal["left", "right"]
-    ) -> EnvState:
+    def _type_text(self, text: str, press_enter: bool):
+        if self._can_insert_text(text):
+            self._page.keyboard.insert_text(text)
+        else:
+            self._page.keyboard.type(text)
+        if press_enter:
+            self._press_keys(["Enter"])
+        self._page.wait_for_load_state()
+
+    def _can_insert_text(self, text: str) -> bool:
+        """Whether `text` can be inserted at once instead of key by key."""
+        if self._typing_strategy == "type" or not text:
+            return False
+        if self._typing_strategy == "insert":
+            return True
+        # Short text types quickly anyway, keep real key events for it.
+        if len(text) < INSERT_TEXT_MIN_LENGTH or "\n" in text:
+            return False
+        field = self._page.evaluate(FOCUSED_FIELD_SCRIPT)
+        return field["editable"] and not field["keyHandlers"]
+
+    def _horizontal_document_scroll(self, direction: Literal["left", "right"]):
         # Scroll by 50% of the viewport size.
         horizontal_scroll_amount = self.screen_size()[0] // 2
         if direction == "left":
@@ -250,27 +766,24 @@ class PlaywrightComputer(Computer):
         # Scroll using JS.
         self._page.evaluate(f"window.scrollBy({scroll_argument}, 0); ")
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def scroll_document(
-        self, direction: Literal["up", "down", "left", "right"]
-    ) -> EnvState:
+    def _scroll_document(self, direction: Literal["up", "down", "left", "right"]):
         if direction == "down":
-            return self.key_combination(["PageDown"])
+            self._press_keys(["PageDown"])
         elif direction == "up":
-            return self.key_combination(["PageUp"])
+            self._press_keys(["PageUp"])
         elif direction in ("left", "right"):
-            return self._horizontal_document_scroll(direction)
+            self._horizontal_document_scroll(direction)
         else:
             raise ValueError("Unsupported direction: ", direction)
 
-    def scroll_at(
+    def _scroll_at(
         self,
         x: int,
         y: int,
         direction: Literal["up", "down", "left", "right"],
-        magnitude: int = 800,
-    ) -> EnvState:
+        magnitude: int,
+    ):
         self.highlight_mouse(x, y)
 
         self._page.mouse.move(x, y)
@@ -291,34 +804,42 @@ class PlaywrightComputer(Computer):
 
         self._page.mouse.wheel(dx, dy)
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def wait_5_seconds(self) -> EnvState:
-        time.sleep(5)
-        return self.current_state()
+    def _wait_5_seconds(self, max_seconds: Optional[float] = None) -> float:
+        """Waits adaptively, returns the seconds actually waited."""
+        result = self._adaptive_wait.wait(
+            lambda: decode_png(self._page.screenshot(type="png")),
+            is_idle=self._network.is_idle,
+            max_seconds=max_seconds,
+        )
+        termcolor.cprint(
+            f"Waited {result.seconds:.1f}s ({result.reason}).", color="cyan"
+        )
+        return result.seconds
 
-    def go_back(self) -> EnvState:
+    def _go_back(self):
         self._page.go_back()
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def go_forward(self) -> EnvState:
+    def _go_forward(self):
         self._page.go_forward()
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def search(self) -> EnvState:
-        return self.navigate(self._search_engine_url)
+    def _search(self):
+        self._navigate(self._search_engine_url)
 
-    def navigate(self, url: str) -> EnvState:
+    def _navigate(self, url: str):
         normalized_url = url
         if not normalized_url.startswith(("http://", "https://")):
             normalized_url = "https://" + normalized_url
         self._page.goto(normalized_url)
         self._page.wait_for_load_state()
-        return self.current_state()
 
-    def key_combination(self, keys: list[str]) -> EnvState:
+    def _key_combination(self, keys: list[str]):
+        self._press_keys(keys)
+
+    def _press_keys(self, keys: list[str]):
+        """Presses a key combination without capturing the resulting state."""
         # Normalize all keys to the Playwright compatible version.
         keys = [PLAYWRIGHT_KEY_MAP.get(k.lower(), k) for k in keys]
 
@@ -330,11 +851,9 @@ class PlaywrightComputer(Computer):
         for key in reversed(keys[:-1]):
             self._page.keyboard.up(key)
 
-        return self.current_state()
-
-    def drag_and_drop(
+    def _drag_and_drop(
         self, x: int, y: int, destination_x: int, destination_y: int
-    ) -> EnvState:
+    ):
         self.highlight_mouse(x, y)
         self._page.mouse.move(x, y)
         self._page.wait_for_load_state()
@@ -345,15 +864,91 @@ class PlaywrightComputer(Computer):
         self._page.mouse.move(destination_x, destination_y)
         self._page.wait_for_load_state()
         self._page.mouse.up()
-        return self.current_state()
 
+    def _mouse_click_at(
+        self, x: int, y: int, button: Literal["left", "right", "middle"], clicks: int
+    ):
+        if button == "left" and clicks == 1:
+            # Keeps popup learning for plain clicks.
+            self._click_at(x, y)
+            return
+        self.highlight_mouse(x, y)
+        self._page.mouse.click(x, y, button=button, click_count=clicks)
+        self._page.wait_for_load_state()
+
+    def _drag_path(self, path: list[tuple[int, int]]):
+        if len(path) < 2:
+            return
+        x, y = path[0]
+        self.highlight_mouse(x, y)
+        self._page.mouse.move(x, y)
+        self._page.mouse.down()
+        for x, y in path[1:]:
+            self._page.mouse.move(x, y, steps=5)
+        self.highlight_mouse(x, y)
+        self._page.mouse.up()
+        self._page.wait_for_load_state()
+
+    @guarded
     def current_state(self) -> EnvState:
+        if self._governor:
+            reason = self._governor.step(self._driver_pid)
+            if reason:
+                self._recycle(reason)
         self._page.wait_for_load_state()
+        if self._popup_dismisser:
+            hits = self._popup_dismisser.dismiss(self._page)
+            if hits:
+                termcolor.cprint(f"Dismissed popups: {hits}", color="cyan")
+                self._page.wait_for_load_state()
         # Even if Playwright reports the page as loaded, it may not be so.
         # Add a manual sleep to make sure the page has finished rendering.
-        time.sleep(0.5)
-        screenshot_bytes = self._page.screenshot(type="png", full_page=False)
-        return EnvState(screenshot=screenshot_bytes, url=self._page.url)
+        # With animations frozen there is nothing left to wait for but layout.
+        if self._freeze_animations:
+            self._page.evaluate(FINISH_ANIMATIONS_CALL)
+            time.sleep(0.1)
+        else:
+            time.sleep(0.5)
+        screenshot = None
+        page_text = None
+        if self._observation in ("pixels", "both"):
+            screenshot = Frame.from_png(
+                self._page.screenshot(
+                    type="png",
+                    full_page=False,
+                    animations="disabled" if self._freeze_animations else "allow",
+                )
+            )
+        if self._observation in ("text", "both"):
+            page_text = self._page_text.capture(self._page)
+        self._last_url = self._page.url
+        state = EnvState(screenshot=screenshot, url=self._last_url, page_text=page_text)
+        if self._frame_differ and screenshot is not None:
+            change = self._frame_differ.classify(screenshot)
+            state.frame_change = change.kind
+            state.changed_region = change.region
+            state.region_screenshot = change.region_frame
+        return state
+
+    @property
+    def multi_tab(self) -> bool:
+        return not self._tabs.single_tab
+
+    def list_tabs(self) -> list[dict]:
+        """Returns index, url, title and active flag of every open tab."""
+        return self._tabs.describe()
+
+    @guarded
+    def switch_tab(self, index: int) -> EnvState:
+        """Makes the tab at `index` the active tab."""
+        self._tabs.switch_to(index)
+        return self.current_state()
+
+    @guarded
+    def close_tab(self, index: Optional[int] = None) -> EnvState:
+        """Closes the tab at `index`, or the active tab if not given."""
+        self._tabs.close(index)
+        return self.current_state()
 
     def screen_size(self) -> tuple[int, int]:
         viewport_size = self._page.viewport_size
@@ -366,30 +961,10 @@ class PlaywrightComputer(Computer):
     def highlight_mouse(self, x: int, y: int):
         if not self._highlight_mouse:
             return
-        self._page.evaluate(
-            f"""
-        () => {{
-            const element_id = "playwright-feedback-circle";
-            const div = document.createElement('div');
-            div.id = element_id;
-            div.style.pointerEvents = 'none';
-            div.style.border = '4px solid red';
-            div.style.borderRadius = '50%';
-            div.style.width = '20px';
-            div.style.height = '20px';
-            div.style.position = 'fixed';
-            div.style.zIndex = '9999';
-            document.body.appendChild(div);
-
-            div.hidden = false;
-            div.style.left = {x} - 10 + 'px';
-            div.style.top = {y} - 10 + 'px';
-
-            setTimeout(() => {{
-                div.hidden = true;
-            }}, 2000);
-        }}
-    """
-        )
-        # Wait a bit for the user to see the cursor.
-        time.sleep(1)
+        # The overlay lives on every document through the init script, this
+        # only moves it. Pages that existed before the script was installed
+        # get it on first use.
+        installed = self._page.evaluate(HIGHLIGHT_MOUSE_CALL, [x, y])
+        if not installed:
+            self._page.evaluate(HIGHLIGHT_MOUSE_SCRIPT)
+            self._page.evaluate(HIGHLIGHT_MOUSE_CALL, [x, y])
@@ -0,0 +1,313 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rule-based dismissal of cookie banners, login nags and app-download overlays.
+
+Each pass is a single `page.evaluate` that tries, in order:
+  1. Per-site selector rules (built-in and learned), clicking the first
+     visible match of each.
+  2. Generic heuristics: inside fixed / sticky containers whose class or id
+     looks like a consent banner or an app / login nag, click the first short
+     "accept" / "got it" / close control.
+
+Dialogs the agent opened on purpose (pickers, real login forms) do not match
+the generic container keywords and are left alone.
+
+Learning: when a click at (x, y) lands inside an overlay and that overlay is
+gone afterwards, the clicked element's selector becomes a candidate for the
+site, but only if the element looks like a close control or the overlay
+matches the generic container keywords. Submit buttons of modals or dropdown
+items also make their overlay go away and must not be clicked on every
+capture. Candidates seen `promote_after` times are used as rules from then
+on.
+"""
+import collections
+import json
+import os
+import re
+from typing import Optional
+
+from .request_blocking import site_of
+
+# Close buttons of overlays known to interrupt our runs, keyed by site.
+SITE_RULES = {
+    "zhipin.com": [
+        ".download-app-guide .close",
+    ],
+    "ctrip.com": [
+        ".cookie-banner .cookie-banner-btn",
+        ".download-layer .close",
+        ".pop_layer_app .close",
+    ],
+}
+
+# Substrings of class / id marking containers that are safe to dismiss.
+GENERIC_CONTAINER_KEYWORDS = (
+    "cookie",
+    "consent",
+    "gdpr",
+    "privacy-banner",
+    "download-app",
+    "app-download",
+    "app-guide",
+    "appguide",
+    "open-app",
+    "login-guide",
+    "login-tip",
+)
+# Texts of controls that dismiss such containers.
+GENERIC_DISMISS_TEXTS = (
+    "accept all",
+    "accept",
+    "i agree",
+    "agree",
+    "got it",
+    "ok",
+    "同意",
+    "接受",
+    "我知道了",
+    "知道了",
+    "暂不",
+    "以后再说",
+    "下次再说",
+    "不再提示",
+    "关闭",
+    "×",
+)
+# Text, aria-label or class of a control that only closes its overlay.
+CLOSE_CONTROL_PATTERN = re.compile(
+    r"close|dismiss|no thanks|not now|关闭|暂不|以后再说|下次再说|不再提示|知道了|^[×✕xX]$",
+    re.IGNORECASE,
+)
+
+DISMISS_SCRIPT = """
+({rules, generic, containerKeywords, dismissTexts}) => {
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) {
+            return false;
+        }
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+    };
+    const hits = [];
+    for (const rule of rules) {
+        let elements = [];
+        try {
+            elements = document.querySelectorAll(rule.selector);
+        } catch (e) {
+            continue;
+        }
+        for (const el of elements) {
+            if (visible(el)) {
+                el.click();
+                hits.push(rule.id);
+                break;
+            }
+        }
+    }
+    if (!generic) {
+        return hits;
+    }
+    const containerSelector = containerKeywords
+        .map((k) => `[class*="${k}" i], [id*="${k}" i]`)
+        .join(', ');
+    const isOverlay = (el) => {
+        for (let node = el; node && node !== document.body; node = node.parentElement) {
+            const position = getComputedStyle(node).position;
+            if (position === 'fixed' || position === 'sticky') {
+                return true;
+            }
+        }
+        return false;
+    };
+    for (const container of document.querySelectorAll(containerSelector)) {
+        if (!visible(container) || !isOverlay(container)) {
+            continue;
+        }
+        const controls = container.querySelectorAll('button, a, [role="button"], span, i, div');
+        for (const control of controls) {
+            if (!visible(control) || control.children.length > 1) {
+                continue;
+            }
+            const text = (control.innerText || '').trim().toLowerCase();
+            const label = (control.getAttribute('aria-label') || '').toLowerCase();
+            const matched =
+                dismissTexts.find((t) => text === t) ||
+                (/close|关闭/.test(label) ? 'close' : null);
+            if (matched) {
+                control.click();
+                hits.push(`generic:${matched}`);
+                break;
+            }
+        }
+    }
+    return hits;
+}
+"""
+
+# Describes the element at (x, y): a selector for it and, if it sits in a
+# fixed / sticky overlay, a selector for that overlay.
+DESCRIBE_TARGET_SCRIPT = """
+([x, y]) => {
+    const selectorFor = (el) => {
+        if (el.id && !/\\d{3,}/.test(el.id)) {
+            return `#${CSS.escape(el.id)}`;
+        }
+        const classes = [...el.classList]
+            .filter((c) => !/\\d{3,}|^css-|^_/.test(c))
+            .slice(0, 2)
+            .map((c) => `.${CSS.escape(c)}`)
+            .join('');
+        return el.tagName.toLowerCase() + classes;
+    };
+    const target = document.elementFromPoint(x, y);
+    if (!target) {
+        return null;
+    }
+    let overlay = null;
+    for (let node = target; node && node !== document.body; node = node.parentElement) {
+        const position = getComputedStyle(node).position;
+        if (position === 'fixed' || position === 'sticky') {
+            overlay = node;
+        }
+    }
+    if (!overlay || overlay === target) {
+        return null;
+    }
+    const overlaySelector = selectorFor(overlay);
+    const control = target.closest('button, a, [role="button"]') || target;
+    return {
+        overlay: overlaySelector,
+        overlayName: `${overlay.className} ${overlay.id}`,
+        selector: `${overlaySelector} ${selectorFor(target)}`,
+        text: (control.innerText || '').trim().slice(0, 40),
+        label: control.getAttribute('aria-label') || control.getAttribute('title') || '',
+        className: `${control.className} ${target.className}`,
+    };
+}
+"""
+
+IS_VISIBLE_SCRIPT = """
+(selector) => {
+    let el = null;
+    try {
+        el = document.querySelector(selector);
+    } catch (e) {
+        return false;
+    }
+    if (!el) {
+        return false;
+    }
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+"""
+
+
+class PopupDismisser:
+    """Dismisses known and look-alike overlays and learns from agent clicks."""
+
+    def __init__(
+        self,
+        learned_rules_path: Optional[str] = None,
+        promote_after: int = 3,
+        generic: bool = True,
+    ):
+        self._generic = generic
+        self._promote_after = promote_after
+        self._learned_rules_path = learned_rules_path
+        # site -> selector -> number of times an agent click on it closed an
+        # overlay.
+        self._candidates: dict[str, collections.Counter] = collections.defaultdict(
+            collections.Counter
+        )
+        if learned_rules_path and os.path.exists(learned_rules_path):
+            with open(learned_rules_path, encoding="utf-8") as f:
+                for site, counts in json.load(f).items():
+                    self._candidates[site].update(counts)
+        # Hits per rule id, e.g. "zhipin.com:.download-app-guide .close" or
+        # "generic:同意".
+        self.stats: collections.Counter = collections.Counter()
+
+    def rules_for(self, url: str) -> list[dict]:
+        site = site_of(url)
+        rules = [
+            {"id": f"{site}:{selector}", "selector": selector}
+            for selector in SITE_RULES.get(site, [])
+        ]
+        rules += [
+            {"id": f"learned:{site}:{selector}", "selector": selector}
+            for selector, count in self._candidates[site].items()
+            if count >= self._promote_after
+        ]
+        return rules
+
+    def _script_args(self, url: str) -> dict:
+        return {
+            "rules": self.rules_for(url),
+            "generic": self._generic,
+            "containerKeywords": list(GENERIC_CONTAINER_KEYWORDS),
+            "dismissTexts": list(GENERIC_DISMISS_TEXTS),
+        }
+
+    def _record(self, hits: list[str]) -> list[str]:
+        self.stats.update(hits)
+        return hits
+
+    def dismiss(self, page) -> list[str]:
+        """Runs one dismissal pass on a sync `Page`, returns the rules hit."""
+        return self._record(page.evaluate(DISMISS_SCRIPT, self._script_args(page.url)))
+
+    async def dismiss_async(self, page) -> list[str]:
+        """Runs one dismissal pass on an async `Page`, returns the rules hit."""
+        hits = await page.evaluate(DISMISS_SCRIPT, self._script_args(page.url))
+        return self._record(hits)
+
+    def describe_target(self, page, x: int, y: int) -> Optional[dict]:
+        """Returns the overlay and selector at (x, y) before an agent click."""
+        return page.evaluate(DESCRIBE_TARGET_SCRIPT, [x, y])
+
+    @staticmethod
+    def _is_dismissal(target: dict) -> bool:
+        """Whether clicking `target` can only have closed its overlay."""
+        overlay_name = str(target.get("overlayName", "")).lower()
+        if any(keyword in overlay_name for keyword in GENERIC_CONTAINER_KEYWORDS):
+            return True
+        return any(
+            CLOSE_CONTROL_PATTERN.search(str(target.get(field, "")))
+            for field in ("text", "label", "className")
+        )
+
+    def learn_from_click(self, page, url: str, target: Optional[dict]):
+        """Counts `target` as a candidate rule if its overlay went away.
+
+        `url` is the page URL before the click. Clicks that navigated away are
+        ignored, the overlay is gone with the whole document then. So are
+        clicks on controls that do not look like they dismiss the overlay.
+        """
+        if not target or page.url != url or not self._is_dismissal(target):
+            return
+        if page.evaluate(IS_VISIBLE_SCRIPT, target["overlay"]):
+            return
+        site = site_of(url)
+        self._candidates[site][target["selector"]] += 1
+        if self._learned_rules_path:
+            with open(self._learned_rules_path, "w", encoding="utf-8") as f:
+                json.dump(self._candidates, f, ensure_ascii=False, indent=2)
+
+    def summary(self) -> str:
+        if not self.stats:
+            return "Popup dismisser: no hits"
+        hits = ", ".join(f"{rule}={count}" for rule, count in self.stats.most_common())
+        return f"Popup dismisser hits: {hits}"
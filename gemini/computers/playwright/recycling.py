@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Decides when a long-lived browser context should be recycled.
+
+Heavy SPAs leak: renderer memory keeps growing over hundreds of steps and
+every action gets slower. The governor counts steps and samples the resident
+memory of the computer's own browser processes, and asks for a fresh context
+once either passes its threshold.
+
+Several computers may share a process (a fleet, the batch runner), so memory
+is summed below the computer's Playwright driver only: every
+`sync_playwright().start()` runs a driver of its own, and the browsers it
+launches are its children.
+"""
+import os
+from typing import Optional
+
+import psutil
+
+# Substrings of process names that belong to the browser, as opposed to
+# helpers the driver may spawn.
+BROWSER_PROCESS_NAMES = ("chrom", "headless_shell", "msedge")
+
+
+def _child_processes(
+    names: tuple[str, ...], root_pid: Optional[int] = None
+) -> list[psutil.Process]:
+    try:
+        root = psutil.Process(root_pid or os.getpid())
+        children = root.children(recursive=True)
+    except psutil.Error:
+        return []
+    processes = []
+    for process in children:
+        try:
+            if any(n in process.name().lower() for n in names):
+                processes.append(process)
+        except psutil.Error:
+            # The process exited while we were looking at it.
+            continue
+    return processes
+
+
+def browser_processes(root_pid: Optional[int] = None) -> list[psutil.Process]:
+    """Returns the browser processes below `root_pid` (default: this process)."""
+    return _child_processes(BROWSER_PROCESS_NAMES, root_pid)
+
+
+def driver_pid(playwright) -> Optional[int]:
+    """Returns the pid of the driver serving a started sync `Playwright`.
+
+    Playwright does not expose it, so it is read from the pipe transport.
+    None if that is not available, e.g. in another Playwright version.
+    """
+    try:
+        return playwright._impl_obj._connection._transport._proc.pid
+    except AttributeError:
+        return None
+
+
+def browser_rss_mb(root_pid: Optional[int] = None) -> float:
+    """Sums the RSS of all browser processes below `root_pid`, in MB."""
+    total = 0
+    for process in browser_processes(root_pid):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class ResourceGovernor:
+    def __init__(
+        self,
+        max_steps: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        sample_every: int = 5,
+    ):
+        if max_steps is None and max_rss_mb is None:
+            raise ValueError("ResourceGovernor needs max_steps or max_rss_mb.")
+        self._max_steps = max_steps
+        self._max_rss_mb = max_rss_mb
+        # Walking the process tree costs a few milliseconds, so memory is
+        # only sampled every `sample_every` steps.
+        self._sample_every = sample_every
+        self.steps = 0
+        self.last_rss_mb = 0.0
+        self.recycles = 0
+
+    def step(self, root_pid: Optional[int]) -> Optional[str]:
+        """Counts one step. Returns the reason to recycle now, if any.
+
+        `root_pid` is the computer's driver, whose browsers are measured.
+        Memory is not checked while it is unknown.
+        """
+        self.steps += 1
+        if self._max_steps is not None and self.steps >= self._max_steps:
+            return f"{self.steps} steps"
+        if (
+            self._max_rss_mb is not None
+            and root_pid is not None
+            and self.steps % self._sample_every == 0
+        ):
+            self.last_rss_mb = browser_rss_mb(root_pid)
+            if self.last_rss_mb >= self._max_rss_mb:
+                return f"browser RSS {self.last_rss_mb:.0f} MB"
+        return None
+
+    def reset(self):
+        """Starts counting again, after the context was recycled."""
+        self.steps = 0
+        self.recycles += 1
@@ -0,0 +1,188 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Route interception that drops requests a browsing session does not need.
+
+Works with both the sync and the async Playwright API, so the same profiles
+can be shared by `PlaywrightComputer` and the scrapers under `auto/`.
+"""
+import collections
+import dataclasses
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Hosts that only serve analytics, ads or tracking pixels.
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "hm.baidu.com",
+    "cnzz.com",
+    "umeng.com",
+    "mmstat.com",
+    "growingio.com",
+    "sensorsdata.cn",
+    "zhugeio.com",
+    "arms-retcode.aliyuncs.com",
+)
+
+# Second-level suffixes under which the registrable domain has three labels.
+_MULTI_LABEL_SUFFIXES = (
+    "com.cn",
+    "net.cn",
+    "org.cn",
+    "gov.cn",
+    "edu.cn",
+    "com.hk",
+    "co.uk",
+    "co.jp",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class BlockProfile:
+    """Describes which requests a profile aborts."""
+
+    # Playwright resource types to abort, e.g. "image", "font", "media".
+    resource_types: frozenset = frozenset()
+    block_trackers: bool = True
+    block_third_party: bool = False
+
+
+BLOCK_PROFILES = {
+    # Only analytics, ads and trackers. Safe for screenshot-driven agents.
+    "no-trackers": BlockProfile(),
+    # Trackers plus heavy media. Pages keep their layout but lose pictures.
+    "no-media": BlockProfile(
+        resource_types=frozenset({"image", "media", "font"}),
+    ),
+    # Trackers plus everything served from another site than the page.
+    # Sites that load their own assets from a CDN domain may break.
+    "no-third-party": BlockProfile(block_third_party=True),
+    # Everything a DOM scraper does not need. Stylesheets and scripts are
+    # kept so that SPAs still render and visibility checks still behave.
+    "minimal": BlockProfile(
+        resource_types=frozenset(
+            {"image", "media", "font", "texttrack", "manifest", "eventsource"}
+        ),
+    ),
+}
+
+
+def site_of(url: str) -> str:
+    """Returns the registrable domain of `url`, e.g. "ctrip.com"."""
+    host = (urlsplit(url).hostname or "").lower()
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in _MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _is_tracker(host: str) -> bool:
+    return any(host == d or host.endswith("." + d) for d in TRACKER_DOMAINS)
+
+
+class RequestBlocker:
+    """Aborts requests according to a named profile and counts what it dropped.
+
+    Usage with the sync API:
+        blocker = RequestBlocker("minimal")
+        blocker.install(context)
+
+    Usage with the async API:
+        await blocker.install_async(context)
+    """
+
+    def __init__(self, profile: str):
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(
+                f"Unknown block profile: {profile}. "
+                f"Choose one of {sorted(BLOCK_PROFILES)}."
+            )
+        self.profile_name = profile
+        self.profile = BLOCK_PROFILES[profile]
+        # Counts keyed by "seen", "blocked" and "blocked:<reason>".
+        self.stats: collections.Counter = collections.Counter()
+
+    def block_reason(self, request) -> Optional[str]:
+        """Returns why `request` should be aborted, or None to let it through."""
+        if request.is_navigation_request():
+            return None
+        host = (urlsplit(request.url).hostname or "").lower()
+        if not host:
+            # data:, blob: and similar URLs never hit the network.
+            return None
+        if self.profile.block_trackers and _is_tracker(host):
+            return "tracker"
+        if request.resource_type in self.profile.resource_types:
+            return request.resource_type
+        if self.profile.block_third_party:
+            page_url = self._page_url(request)
+            if page_url and site_of(page_url) != site_of(request.url):
+                return "third-party"
+        return None
+
+    def _page_url(self, request) -> Optional[str]:
+        try:
+            return request.frame.page.url
+        except Exception:
+            # Service worker requests have no frame.
+            return None
+
+    def _record(self, request) -> Optional[str]:
+        reason = self.block_reason(request)
+        self.stats["seen"] += 1
+        if reason:
+            self.stats["blocked"] += 1
+            self.stats[f"blocked:{reason}"] += 1
+        return reason
+
+    def handle(self, route) -> None:
+        """Route handler for the sync Playwright API."""
+        if self._record(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def handle_async(self, route) -> None:
+        """Route handler for the async Playwright API."""
+        if self._record(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def install(self, context) -> None:
+        """Installs the blocker on a sync `BrowserContext`."""
+        context.route("**/*", self.handle)
+
+    async def install_async(self, context) -> None:
+        """Installs the blocker on an async `BrowserContext`."""
+        await context.route("**/*", self.handle_async)
+
+    def summary(self) -> str:
+        reasons = ", ".join(
+            f"{key.split(':', 1)[1]}={count}"
+            for key, count in sorted(self.stats.items())
+            if key.startswith("blocked:")
+        )
+        return (
+            f"[{self.profile_name}] blocked {self.stats['blocked']} of "
+            f"{self.stats['seen']} requests" + (f" ({reasons})" if reasons else "")
+        )
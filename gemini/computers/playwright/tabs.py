@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional
+
+import playwright.sync_api
+
+
+class TabManager:
+    """Tracks the pages of a browser context and which one is active.
+
+    New pages (e.g. target=_blank links or window.open popups) are adopted as
+    the active page as they are, so they are never loaded twice and popups
+    that result from a POST keep their state.
+
+    In single-tab mode the previously active page is hidden from the model on
+    adoption, so it still only ever sees one tab. The page stays open until
+    the next adoption: popups such as OAuth windows often close themselves,
+    and the model then continues on the page that opened them.
+    """
+
+    def __init__(self, single_tab: bool = True):
+        self._single_tab = single_tab
+        self._pages: list[playwright.sync_api.Page] = []
+        self._active: Optional[playwright.sync_api.Page] = None
+        # Single-tab mode: the page the active page replaced.
+        self._opener: Optional[playwright.sync_api.Page] = None
+
+    @property
+    def single_tab(self) -> bool:
+        return self._single_tab
+
+    @property
+    def active(self) -> Optional[playwright.sync_api.Page]:
+        return self._active
+
+    @property
+    def pages(self) -> list[playwright.sync_api.Page]:
+        return list(self._pages)
+
+    def adopt(self, page: playwright.sync_api.Page):
+        """Starts tracking `page` and makes it the active page."""
+        if page in self._pages:
+            self._activate(page)
+            return
+        previous = self._active
+        self._pages.append(page)
+        page.on("close", self._forget)
+        self._activate(page)
+        if self._single_tab and previous is not None:
+            self._pages.remove(previous)
+            self._close_opener()
+            self._opener = previous
+
+    def switch_to(self, index: int) -> playwright.sync_api.Page:
+        """Makes the page at `index` the active page."""
+        page = self._page_at(index)
+        self._activate(page)
+        return page
+
+    def close(self, index: Optional[int] = None):
+        """Closes the page at `index`, or the active page if not given.
+
+        The last remaining page is never closed.
+        """
+        page = self._active if index is None else self._page_at(index)
+        if len(self._pages) <= 1:
+            raise ValueError("Cannot close the last remaining tab.")
+        page.close()
+
+    def describe(self) -> list[dict]:
+        """Returns index, url, title and active flag for every tracked page."""
+        tabs = []
+        for index, page in enumerate(self._pages):
+            try:
+                title = page.title()
+            except playwright.sync_api.Error:
+                title = ""
+            tabs.append(
+                {
+                    "index": index,
+                    "url": page.url,
+                    "title": title,
+                    "active": page is self._active,
+                }
+            )
+        return tabs
+
+    def _page_at(self, index: int) -> playwright.sync_api.Page:
+        if not 0 <= index < len(self._pages):
+            raise ValueError(
+                f"Tab index {index} out of range, there are {len(self._pages)} tabs."
+            )
+        return self._pages[index]
+
+    def _activate(self, page: playwright.sync_api.Page):
+        self._active = page
+        page.bring_to_front()
+
+    def _close_opener(self):
+        opener, self._opener = self._opener, None
+        if opener is not None and not opener.is_closed():
+            opener.close()
+
+    def _forget(self, page: playwright.sync_api.Page):
+        if page is self._opener:
+            self._opener = None
+        if page in self._pages:
+            self._pages.remove(page)
+        if page is self._active:
+            # Fall back to the most recently opened page, or in single-tab
+            # mode to the opener, e.g. when an OAuth popup closes itself.
+            self._active = None
+            if not self._pages and self._opener is not None:
+                self._pages.append(self._opener)
+                self._opener = None
+            if self._pages:
+                self._activate(self._pages[-1])
@@ -0,0 +1,142 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per-action deadlines for Playwright computers.
+
+Deadlines are enforced in two steps:
+  1. Soft: the context's default timeout makes waits, navigations and
+     screenshots raise `TimeoutError` after `timeout_seconds`. A slow page is
+     not a dead browser, so these propagate like any other error.
+  2. Hard: calls that ignore timeouts (`evaluate` on a hung renderer, a wedged
+     driver) are unblocked by a timer thread that kills the computer's own
+     browser processes `grace_seconds` later, so the blocked call fails
+     instead of hanging. Remote browsers cannot be killed from here, for them
+     the computer's Playwright driver process is killed, which fails the call
+     just the same. Other computers in the process are left alone.
+
+`is_browser_failure` tells crashes apart from ordinary errors, e.g. a bad
+argument from the model, which should propagate as before. Some of its
+markers also fire when just the active page closed itself; the computer
+checks whether the browser and other pages are still there before rebuilding.
+"""
+import contextlib
+import functools
+import threading
+from typing import Literal, Optional
+
+import psutil
+import termcolor
+
+from .recycling import browser_processes
+
+# Substrings of Playwright errors raised when the page, the browser or the
+# driver connection is gone.
+BROWSER_FAILURE_MARKERS = (
+    "Target crashed",
+    "Page crashed",
+    "Target closed",
+    "Target page, context or browser has been closed",
+    "Browser has been closed",
+    "Browser closed",
+    "Connection closed",
+)
+
+
+def is_browser_failure(error: Exception) -> bool:
+    """Whether `error` means the page, browser or driver is gone.
+
+    Timeouts alone are not: they only count once the watchdog has fired.
+    """
+    message = str(error)
+    return any(marker in message for marker in BROWSER_FAILURE_MARKERS)
+
+
+class Watchdog:
+    def __init__(
+        self,
+        timeout_seconds: float = 30.0,
+        grace_seconds: float = 10.0,
+        kill: Literal["browser", "driver"] = "browser",
+    ):
+        self.timeout_seconds = timeout_seconds
+        self._grace_seconds = grace_seconds
+        self._kill = kill
+        self._armed = False
+        # Set when the hard deadline of the current action killed the browser.
+        self.fired = False
+
+    @property
+    def armed(self) -> bool:
+        return self._armed
+
+    @contextlib.contextmanager
+    def deadline(self, action: str, driver_pid: Optional[int]):
+        """Arms the hard deadline for one action.
+
+        `driver_pid` is the computer's Playwright driver: it is killed, or the
+        browsers below it are.
+        """
+        self.fired = False
+        timer = threading.Timer(
+            self.timeout_seconds + self._grace_seconds,
+            self._fire,
+            args=(action, driver_pid),
+        )
+        timer.daemon = True
+        self._armed = True
+        timer.start()
+        try:
+            yield
+        finally:
+            timer.cancel()
+            self._armed = False
+
+    def _fire(self, action: str, driver_pid: Optional[int]):
+        seconds = self.timeout_seconds + self._grace_seconds
+        if driver_pid is None:
+            termcolor.cprint(
+                f"{action} is still running after {seconds:.0f}s, but the "
+                f"{self._kill} to kill is unknown.",
+                color="red",
+            )
+            return
+        self.fired = True
+        termcolor.cprint(
+            f"{action} is still running after {seconds:.0f}s, killing the {self._kill}.",
+            color="red",
+        )
+        if self._kill == "browser":
+            processes = browser_processes(driver_pid)
+        else:
+            try:
+                processes = [psutil.Process(driver_pid)]
+            except psutil.Error:
+                processes = []
+        for process in processes:
+            try:
+                process.kill()
+            except Exception:
+                # Already gone.
+                pass
+
+
+def guarded(method):
+    """Runs a computer action under the computer's watchdog, if it has one."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._run_guarded(
+            method.__name__, lambda: method(self, *args, **kwargs)
+        )
+
+    return wrapper
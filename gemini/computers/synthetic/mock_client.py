@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A stand-in for `genai.Client` that replays scripted computer use turns.
+
+Only what `BrowserAgent` touches is implemented: `models.generate_content`
+and the `vertexai` flag read by `FunctionDeclaration.from_callable`.
+"""
+import itertools
+
+from google.genai import types
+
+# The calls cycled through, in the model's 0-999 coordinate space.
+SCRIPTED_CALLS = [
+    ("click_at", {"x": 500, "y": 300}),
+    (
+        "type_text_at",
+        {"x": 480, "y": 120, "text": "flights to Shanghai", "press_enter": True},
+    ),
+    ("scroll_document", {"direction": "down"}),
+    ("hover_at", {"x": 210, "y": 640}),
+    ("key_combination", {"keys": "control+f"}),
+    ("navigate", {"url": "https://example.com/results"}),
+    ("scroll_at", {"x": 500, "y": 500, "direction": "down", "magnitude": 400}),
+    ("wait_5_seconds", {}),
+]
+
+REASONING = (
+    "The page shows the search form. I will fill in the destination and "
+    "submit, then look through the results for the cheapest option."
+)
+
+
+class _Models:
+    def __init__(self, responses: list[types.GenerateContentResponse]):
+        self._responses = iter(responses)
+        self.calls = 0
+
+    def generate_content(self, model: str, contents, config=None):
+        self.calls += 1
+        return next(self._responses)
+
+
+class MockGeminiClient:
+    def __init__(
+        self,
+        steps: int,
+        calls_per_step: int = 1,
+        reasoning: str = REASONING,
+        final_text: str = "Done.",
+    ):
+        """Answers `steps` turns with function calls, then a final text."""
+        self.vertexai = False
+        calls = itertools.cycle(SCRIPTED_CALLS)
+        # Built up front, so that the benchmark does not measure the mock.
+        responses = [
+            self._response(
+                [types.Part(text=reasoning)]
+                + [
+                    types.Part(function_call=types.FunctionCall(name=name, args=args))
+                    for name, args in itertools.islice(calls, calls_per_step)
+                ]
+            )
+            for _ in range(steps)
+        ]
+        responses.append(self._response([types.Part(text=final_text)]))
+        self.models = _Models(responses)
+
+    @staticmethod
+    def _response(parts: list[types.Part]) -> types.GenerateContentResponse:
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=parts),
+                    finish_reason=types.FinishReason.STOP,
+                )
+            ]
+        )
@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An in-memory `Computer` for measuring the agent loop without a browser.
+
+Actions return pre-generated frames after a configurable latency, so the
+Python-side cost of the agent (history building, pruning, rendering,
+`EnvState` validation) can be measured on its own.
+"""
+import io
+import itertools
+import math
+import random
+import time
+from typing import Callable, Literal, Optional, Union
+
+from PIL import Image, ImageDraw
+
+from ..computer import Action, Computer, EnvState
+from ..frame import Frame
+
+Latency = Union[float, Callable[[], float]]
+
+
+def uniform_latency(low: float, high: float, seed: int = 0) -> Callable[[], float]:
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal_latency(
+    median: float, sigma: float = 0.5, seed: int = 0
+) -> Callable[[], float]:
+    """Long-tailed latencies, like real page loads."""
+    rng = random.Random(seed)
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+def generate_frames(
+    screen_size: tuple[int, int], count: int = 8, seed: int = 0
+) -> list[bytes]:
+    """Renders `count` distinct page-like PNG frames."""
+    rng = random.Random(seed)
+    width, height = screen_size
+    frames = []
+    for _ in range(count):
+        image = Image.new("RGB", screen_size, (255, 255, 255))
+        draw = ImageDraw.Draw(image)
+        # A header bar, a few blocks of "text" lines and some images.
+        draw.rectangle((0, 0, width, 64), fill=(rng.randrange(256), 60, 120))
+        for _ in range(12):
+            left = rng.randrange(0, width - 200)
+            top = rng.randrange(80, height - 40)
+            for line in range(rng.randrange(1, 6)):
+                y = top + line * 18
+                draw.rectangle(
+                    (left, y, left + rng.randrange(80, 400), y + 10), fill=(40, 40, 40)
+                )
+        for _ in range(4):
+            left = rng.randrange(0, width - 160)
+            top = rng.randrange(80, height - 120)
+            draw.rectangle(
+                (left, top, left + 160, top + 120),
+                fill=tuple(rng.randrange(256) for _ in range(3)),
+            )
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        frames.append(buffer.getvalue())
+    return frames
+
+
+class SyntheticComputer(Computer):
+    """Serves frames from memory, cycling through them one per action."""
+
+    def __init__(
+        self,
+        screen_size: tuple[int, int] = (1440, 900),
+        frames: Optional[list[bytes]] = None,
+        latency: Latency = 0.0,
+        initial_url: str = "https://example.com/",
+    ):
+        self._screen_size = screen_size
+        self._frames = frames or generate_frames(screen_size)
+        self._next_frame = itertools.cycle(self._frames)
+        # Seconds each action takes, or a callable drawing them.
+        self._latency = latency
+        self._url = initial_url
+        self.actions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def _step(self):
+        self.actions += 1
+        seconds = self._latency() if callable(self._latency) else self._latency
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _act(self) -> EnvState:
+        self._step()
+        return self.current_state()
+
+    def execute(self, actions: list[Action], capture: bool = True) -> EnvState:
+        for action in actions:
+            if action.name == "navigate":
+                self._url = action.url
+            elif action.name == "search":
+                self._url = "https://www.google.com/"
+            self._step()
+        return self.current_state() if capture else EnvState(url=self._url)
+
+    def screen_size(self) -> tuple[int, int]:
+        return self._screen_size
+
+    def open_web_browser(self) -> EnvState:
+        return self._act()
+
+    def click_at(self, x: int, y: int) -> EnvState:
+        return self._act()
+
+    def hover_at(self, x: int, y: int) -> EnvState:
+        return self._act()
+
+    def type_text_at(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        press_enter: bool = False,
+        clear_before_typing: bool = True,
+    ) -> EnvState:
+        return self._act()
+
+    def scroll_document(
+        self, direction: Literal["up", "down", "left", "right"]
+    ) -> EnvState:
+        return self._act()
+
+    def scroll_at(
+        self,
+        x: int,
+        y: int,
+        direction: Literal["up", "down", "left", "right"],
+        magnitude: int = 800,
+    ) -> EnvState:
+        return self._act()
+
+    def wait_5_seconds(self, max_seconds: Optional[float] = None) -> EnvState:
+        return self._act()
+
+    def go_back(self) -> EnvState:
+        return self._act()
+
+    def go_forward(self) -> EnvState:
+        return self._act()
+
+    def search(self) -> EnvState:
+        return self.navigate("https://www.google.com/")
+
+    def navigate(self, url: str) -> EnvState:
+        self._url = url
+        return self._act()
+
+    def key_combination(self, keys: list[str]) -> EnvState:
+        return self._act()
+
+    def drag_and_drop(
+        self, x: int, y: int, destination_x: int, destination_y: int
+    ) -> EnvState:
+        return self._act()
+
+    def mouse_click_at(
+        self,
+        x: int,
+        y: int,
+        button: Literal["left", "right", "middle"] = "left",
+        clicks: int = 1,
+    ) -> EnvState:
+        return self._act()
+
+    def type_text(self, text: str, press_enter: bool = False) -> EnvState:
+        return self._act()
+
+    def drag_path(self, path: list[tuple[int, int]]) -> EnvState:
+        return self._act()
+
+    def current_state(self) -> EnvState:
+        return EnvState(screenshot=Frame.from_png(next(self._next_frame)), url=self._url)
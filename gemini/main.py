@@ -16,6 +16,7 @@ import os
 
 from agent import BrowserAgent
 from computers import BrowserbaseComputer, PlaywrightComputer
+from computers.playwright.request_blocking import BLOCK_PROFILES
 
 from dotenv import load_dotenv
 
@@ -82,8 +83,80 @@ os.environ["GEMINI_API_KEY"] = os.getenv("GEMINI_API_KEY")
 #         agent.agent_loop()
 #     return 0
 def main() -> int:
-    
-    highlight_mouse = False
+    parser = argparse.ArgumentParser(description="Run the browser agent.")
+    parser.add_argument(
+        "--highlight_mouse",
+        action="store_true",
+        default=False,
+        help="If possible, highlight the location of the mouse.",
+    )
+    parser.add_argument(
+        "--block_profile",
+        choices=sorted(BLOCK_PROFILES),
+        default=None,
+        help="Abort requests of this profile, e.g. no-trackers.",
+    )
+    parser.add_argument(
+        "--multi_tab",
+        action="store_true",
+        default=False,
+        help="Let the agent keep several tabs open and switch between them.",
+    )
+    parser.add_argument(
+        "--observation",
+        choices=("pixels", "text", "both"),
+        default="pixels",
+        help="Screenshot, visible-page text snapshot, or both.",
+    )
+    parser.add_argument(
+        "--har_mode",
+        choices=("record", "replay"),
+        default=None,
+        help="Record or replay the session from har_store/recordings/ctrip.har.",
+    )
+    parser.add_argument(
+        "--frame_diff",
+        action="store_true",
+        default=False,
+        help="Send 'no visual change' or a cropped region instead of identical frames.",
+    )
+    parser.add_argument(
+        "--freeze_animations",
+        action="store_true",
+        default=False,
+        help="Disable CSS transitions / animations so pages settle sooner.",
+    )
+    parser.add_argument(
+        "--dismiss_popups",
+        action="store_true",
+        default=False,
+        help="Close cookie banners / login nags / app-download overlays.",
+    )
+    parser.add_argument(
+        "--popup_rules_path",
+        default=None,
+        help="Where popup rules learned from agent clicks are kept.",
+    )
+    parser.add_argument(
+        "--recycle_after_steps",
+        type=int,
+        default=None,
+        help="Restart the browser context (keeping cookies and URL) after this many steps.",
+    )
+    parser.add_argument(
+        "--recycle_above_rss_mb",
+        type=float,
+        default=None,
+        help="Restart the browser context once the browser uses this much memory.",
+    )
+    parser.add_argument(
+        "--action_timeout_seconds",
+        type=float,
+        default=None,
+        help="Restart a hung or crashed browser after this many seconds per action.",
+    )
+    args = parser.parse_args()
+
     model ='gemini-2.5-computer-use-preview-10-2025'
     query = """
     任务目标：
@@ -123,7 +196,19 @@ def main() -> int:
     env = PlaywrightComputer(
             screen_size=PLAYWRIGHT_SCREEN_SIZE,
             initial_url=initial_url,
-            highlight_mouse=highlight_mouse,
+            highlight_mouse=args.highlight_mouse,
+            block_profile=args.block_profile,
+            single_tab=not args.multi_tab,
+            observation=args.observation,
+            har_mode=args.har_mode,
+            har_name="ctrip",
+            frame_diff=args.frame_diff,
+            freeze_animations=args.freeze_animations,
+            dismiss_popups=args.dismiss_popups,
+            popup_rules_path=args.popup_rules_path,
+            recycle_after_steps=args.recycle_after_steps,
+            recycle_above_rss_mb=args.recycle_above_rss_mb,
+            action_timeout_seconds=args.action_timeout_seconds,
         )
     with env as browser_computer:
         agent = BrowserAgent(
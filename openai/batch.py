@@ -0,0 +1,241 @@
+"""Runs many instructions from a JSONL file across a pool of computers.
+
+Each line of the input is a task:
+
+    {"id": "weather-1", "instructions": "Find the weather in Paris.", "start_url": "https://www.bing.com"}
+
+`id` defaults to the line number and `start_url` to `--start-url`. At most
+`concurrency` tasks run at once, each on a computer of its own taken from the
+pool. Computers are reset to a fresh browser context on the task's start URL
+before every task, so no cookies, storage or logins carry over between tasks.
+For every task, `<output dir>/<id>.json` gets the transcript, timing and
+token usage; `<output dir>/summary.jsonl` gets one line per task and
+`<output dir>/summary.json` the totals, so throughput and cost per task can be
+compared across runs.
+"""
+import asyncio
+import dataclasses
+import json
+import os
+import re
+import time
+from typing import Callable, Optional
+
+import cua
+from computers.adapters.cua import CUAComputer
+
+
+@dataclasses.dataclass
+class Task:
+    id: str
+    instructions: str
+    start_url: Optional[str] = None
+
+
+# Output files of the run as a whole, no task may share their names.
+RESERVED_IDS = ("summary",)
+
+
+def load_tasks(path: str) -> list[Task]:
+    tasks = []
+    seen: dict[str, int] = {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "instructions" not in record:
+                raise ValueError(f"{path}:{number} has no instructions.")
+            task_id = str(record.get("id", number))
+            # Ids become file names.
+            task_id = re.sub(r"[^\w.-]", "_", task_id)
+            if task_id in RESERVED_IDS:
+                raise ValueError(f"{path}:{number} uses the reserved id {task_id}.")
+            if task_id in seen:
+                # Also ids that differ only in characters replaced above.
+                raise ValueError(
+                    f"{path}:{number} repeats the task id {task_id} of line {seen[task_id]}."
+                )
+            seen[task_id] = number
+            tasks.append(Task(task_id, record["instructions"], record.get("start_url")))
+    return tasks
+
+
+def _usage(response) -> dict:
+    usage = getattr(response, "usage", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        client,
+        model: str,
+        make_computer: Callable[[], CUAComputer],
+        output_dir: str,
+        concurrency: int = 4,
+        max_steps: int = 50,
+        dimensions: tuple[int, int] = (1024, 768),
+        hedge: bool = False,
+        logger=None,
+    ):
+        self._client = client
+        self._model = model
+        self._make_computer = make_computer
+        self._output_dir = output_dir
+        self._concurrency = concurrency
+        self._max_steps = max_steps
+        self._dimensions = dimensions
+        self._hedge = hedge
+        self._logger = logger
+        self._computers: Optional[asyncio.Queue] = None
+
+    async def _new_computer(self) -> CUAComputer:
+        computer = self._make_computer()
+        try:
+            await computer.__aenter__()
+        except Exception:
+            # Stops what was started, e.g. the computer's thread.
+            await self._close(computer)
+            raise
+        return computer
+
+    async def _close(self, computer: Optional[CUAComputer]):
+        if computer is None:
+            return
+        try:
+            await computer.__aexit__(None, None, None)
+        except Exception as e:
+            # A broken computer may fail to shut down cleanly.
+            if self._logger:
+                self._logger.warning(f"Closing a computer failed: {e}")
+
+    async def run(self, tasks: list[Task], default_start_url: Optional[str] = None) -> dict:
+        os.makedirs(self._output_dir, exist_ok=True)
+        # `concurrency` slots, each holding an entered computer or None until
+        # a task needs one. Waiting for a slot is the concurrency cap.
+        self._computers = asyncio.Queue()
+        for _ in range(min(self._concurrency, len(tasks))):
+            self._computers.put_nowait(None)
+
+        start = time.perf_counter()
+        try:
+            results = await asyncio.gather(
+                *(self._run_one(task, task.start_url or default_start_url) for task in tasks)
+            )
+        finally:
+            while not self._computers.empty():
+                await self._close(self._computers.get_nowait())
+        seconds = time.perf_counter() - start
+
+        with open(os.path.join(self._output_dir, "summary.jsonl"), "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        summary = {
+            "tasks": len(results),
+            "completed": sum(r["status"] == "completed" for r in results),
+            "failed": sum(r["status"] == "error" for r in results),
+            "concurrency": self._concurrency,
+            "seconds": round(seconds, 2),
+            "tasks_per_minute": round(len(results) / seconds * 60, 2) if seconds else 0.0,
+            "total_tokens": sum(r["usage"]["total_tokens"] for r in results),
+            "tokens_per_task": (
+                round(sum(r["usage"]["total_tokens"] for r in results) / len(results))
+                if results
+                else 0
+            ),
+        }
+        with open(os.path.join(self._output_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    async def _run_one(self, task: Task, start_url: Optional[str]) -> dict:
+        computer = await self._computers.get()
+        try:
+            result, computer = await self._run_agent(task, computer, start_url)
+            if result["status"] == "error":
+                # The computer may be left in a broken state, the next task
+                # enters a new one.
+                await self._close(computer)
+                computer = None
+            return result
+        finally:
+            # Always give the slot back, or the pool would shrink.
+            self._computers.put_nowait(computer)
+
+    async def _run_agent(
+        self, task: Task, computer: Optional[CUAComputer], start_url: Optional[str]
+    ) -> tuple[dict, Optional[CUAComputer]]:
+        """Runs `task`, entering a computer first if the slot had none.
+
+        Returns the result and the computer, for the slot.
+        """
+        agent = None
+        transcript = []
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        status = "max_steps"
+        error = None
+        start = time.perf_counter()
+        user_input = task.instructions
+        try:
+            if computer is None:
+                computer = await self._new_computer()
+            await computer.reset(start_url)
+            agent = cua.Agent(
+                self._client, self._model, cua.Scaler(computer, self._dimensions)
+            )
+            agent.hedge = self._hedge
+            for step in range(1, self._max_steps + 1):
+                step_start = time.perf_counter()
+                await agent.continue_task(user_input)
+                user_input = ""
+                step_usage = _usage(agent.response)
+                for name, value in step_usage.items():
+                    usage[name] += value
+                transcript.append(
+                    {
+                        "step": step,
+                        "seconds": round(time.perf_counter() - step_start, 3),
+                        "usage": step_usage,
+                        "output": [item.model_dump() for item in agent.response.output],
+                    }
+                )
+                if agent.requires_user_input:
+                    # The model answered, or needs a human: either way the
+                    # batch run of this task is over.
+                    status = "completed"
+                    break
+        except Exception as e:
+            status = "error"
+            error = f"{type(e).__name__}: {e}"
+            if self._logger:
+                self._logger.exception(f"Task {task.id} failed.", exc_info=e)
+        seconds = time.perf_counter() - start
+
+        result = {
+            "id": task.id,
+            "status": status,
+            "steps": len(transcript),
+            "seconds": round(seconds, 2),
+            "usage": usage,
+            "error": error,
+        }
+        record = {
+            **result,
+            "instructions": task.instructions,
+            "messages": agent.messages if agent else [],
+            "transcript": transcript,
+        }
+        with open(os.path.join(self._output_dir, f"{task.id}.json"), "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2, default=str)
+        if self._logger:
+            self._logger.info(
+                f"{task.id}: {status} after {result['steps']} steps, "
+                f"{result['seconds']:.0f}s, {usage['total_tokens']} tokens"
+            )
+        return result, computer
@@ -0,0 +1,102 @@
+"""Measures the CPU time per frame of scaling and encoding screenshots.
+
+Compares the original pipeline (base64 PNG in, decode, LANCZOS, paste on a
+new canvas, PNG and base64 out) against `ScalingEngine` at each quality and
+output format, and against the pass-through of frames that already have the
+target size. Every variant starts from the same base64 PNG and ends with a
+base64 image, so decoding and encoding are measured everywhere.
+
+    python benchmark_scaler.py [--source 1920x1080] [--target 1024x768] [--frames 50]
+"""
+import argparse
+import base64
+import io
+import time
+
+import PIL.Image
+
+from scaling import ScalingEngine
+from computers.frame import Frame
+from computers.synthetic.synthetic import generate_frames
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def original_pipeline(screenshot: str, target_size: tuple[int, int]) -> str:
+    """The Scaler.screenshot of before, for reference."""
+    image = PIL.Image.open(io.BytesIO(base64.b64decode(screenshot)))
+    screen_width, screen_height = image.size
+    width, height = target_size
+    ratio = min(width / screen_width, height / screen_height)
+    new_size = (int(screen_width * ratio), int(screen_height * ratio))
+    resized_image = image.resize(new_size, PIL.Image.Resampling.LANCZOS)
+    image = PIL.Image.new("RGB", (width, height), (0, 0, 0))
+    image.paste(resized_image, (0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def cpu_ms_per_frame(run, count: int) -> float:
+    start = time.process_time()
+    for i in range(count):
+        run(i)
+    return (time.process_time() - start) / count * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=parse_size, default=(1920, 1080))
+    parser.add_argument("--target", type=parse_size, default=(1024, 768))
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    # Frame generation and the capture itself are not measured.
+    pngs = generate_frames(args.source)
+    encoded = [base64.b64encode(png).decode("utf-8") for png in pngs]
+    target_encoded = [base64.b64encode(png).decode("utf-8") for png in generate_frames(args.target)]
+
+    def frame(screenshots: list[str], i: int) -> Frame:
+        return Frame.from_png(base64.b64decode(screenshots[i % len(screenshots)]))
+
+    results = [
+        (
+            "original",
+            cpu_ms_per_frame(
+                lambda i: original_pipeline(encoded[i % len(encoded)], args.target),
+                args.frames,
+            ),
+        )
+    ]
+    for quality in ("high", "balanced", "fast"):
+        for image_format in ("png", "jpeg"):
+            engine = ScalingEngine(quality, image_format)
+
+            def run(i, engine=engine):
+                engine.image_url(engine.scale(frame(encoded, i), args.target))
+
+            results.append((f"{quality}/{image_format}", cpu_ms_per_frame(run, args.frames)))
+
+    engine = ScalingEngine()
+    results.append(
+        (
+            "pass-through/png",
+            cpu_ms_per_frame(
+                lambda i: engine.image_url(engine.scale(frame(target_encoded, i), args.target)),
+                args.frames,
+            ),
+        )
+    )
+
+    baseline = results[0][1]
+    print(f"{'pipeline':>18} {'cpu ms/frame':>13} {'speedup':>8}")
+    for name, ms in results:
+        print(f"{name:>18} {ms:>13.2f} {baseline / ms:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
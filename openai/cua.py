@@ -1,20 +1,45 @@
 import asyncio
-import base64
 import inspect
-import io
 import json
+import os
 import re
+import sys
+import time
 
 import openai
-import PIL
+
+# Share the screenshot frames with the gemini computers.
+_GEMINI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "gemini")
+if _GEMINI_DIR not in sys.path:
+    sys.path.insert(0, _GEMINI_DIR)
+
+from computers.frame import Frame  # noqa: E402
+import limits  # noqa: E402
+from scaling import ImageFormat, Quality, ScalingEngine, render, scale  # noqa: E402
+from workers import WorkerPool, shared_pool  # noqa: E402
 
 
 class Scaler:
     """Wrapper for a computer that performs resizing and coordinate translation."""
 
-    def __init__(self, computer, dimensions: tuple[int, int] | None = None):
+    def __init__(
+        self,
+        computer,
+        dimensions: tuple[int, int] | None = None,
+        quality: Quality = "high",
+        image_format: ImageFormat = "png",
+        jpeg_quality: int = 80,
+        pool: WorkerPool | None = None,
+    ):
         self.computer = computer
         self.size = dimensions
+        self.engine = ScalingEngine(quality, image_format, jpeg_quality)
+        # Scaling and encoding run here, never on the event loop.
+        self.pool = pool or shared_pool()
+        # The last capture and its data URL, reused while the screen does not
+        # change.
+        self._last_frame: Frame | None = None
+        self._last_url: str | None = None
         self.screen_width = -1
         self.screen_height = -1
 
@@ -37,27 +62,28 @@ class Scaler:
                 self.size = (int(width * scale), int(height * scale))
         return self.size
 
-    async def screenshot(self) -> str:
+    async def screenshot(self) -> Frame:
         # Take a screenshot from the actual computer
-        screenshot = await self.computer.screenshot()
-        screenshot = base64.b64decode(screenshot)
-        buffer = io.BytesIO(screenshot)
-        image = PIL.Image.open(buffer)
-        # Scale the screenshot
-        self.screen_width, self.screen_height = image.size
-        width, height = self.dimensions
-        ratio = min(width / self.screen_width, height / self.screen_height)
-        new_width = int(self.screen_width * ratio)
-        new_height = int(self.screen_height * ratio)
-        new_size = (new_width, new_height)
-        resized_image = image.resize(new_size, PIL.Image.Resampling.LANCZOS)
-        image = PIL.Image.new("RGB", (width, height), (0, 0, 0))
-        image.paste(resized_image, (0, 0))
-        buffer = io.BytesIO()
-        image.save(buffer, format="PNG")
-        buffer.seek(0)
-        data = bytearray(buffer.getvalue())
-        return base64.b64encode(data).decode("utf-8")
+        frame = await self.computer.screenshot()
+        self.screen_width, self.screen_height = frame.size
+        # Scale the screenshot, frames of the right size pass through as is.
+        return await self.pool.run(scale, self.engine.config, frame, self.dimensions)
+
+    async def screenshot_url(self) -> str:
+        """Takes a screenshot and returns it scaled and encoded as a data URL.
+
+        Both steps run as one worker job, which saves shipping the scaled
+        frame back and forth with a process pool.
+        """
+        frame = await self.computer.screenshot()
+        self.screen_width, self.screen_height = frame.size
+        if self._last_frame is not None and frame.same_as(self._last_frame):
+            # E.g. an explicit screenshot action right after an action's
+            # capture: skip scaling and encoding.
+            return self._last_url
+        url = await self.pool.run(render, self.engine.config, frame, self.dimensions)
+        self._last_frame, self._last_url = frame, url
+        return url
 
     async def click(self, x: int, y: int, button: str = "left") -> None:
         x, y = self._point_to_screen_coords(x, y)
@@ -107,12 +133,45 @@ class Agent:
         self.tools = {}
         self.extra_headers = None
         self.reasoning = {"generate_summary": "concise"}
-        self.parallel_tool_calls = False
+        # None: allow parallel tool calls exactly when every registered tool
+        # is side-effect-free.
+        self._parallel_tool_calls = None
+        self._side_effect_free: set[str] = set()
+        # Function calls running at once within one response.
+        self.max_concurrent_tool_calls = 4
+        # With several computer calls in one response, run all actions and
+        # capture once after the last. Every call then reports that final
+        # screenshot, so the model no longer sees the intermediate screens:
+        # only turn this on where the saved captures matter more.
+        self.defer_capture = False
+        # Send a duplicate request when one runs longer than the recent p95
+        # latency of the deployment, and use whichever returns first.
+        self.hedge = False
         self.start_task()
 
-    def add_tool(self, tool: dict, func):
+    def add_tool(self, tool: dict, func, side_effect_free: bool = False):
+        """Registers a function tool.
+
+        Calls to side-effect-free tools may run concurrently with each other.
+        """
         name = tool["name"]
         self.tools[name] = (tool, func)
+        if side_effect_free:
+            self._side_effect_free.add(name)
+        else:
+            self._side_effect_free.discard(name)
+
+    @property
+    def parallel_tool_calls(self) -> bool:
+        if self._parallel_tool_calls is not None:
+            return self._parallel_tool_calls
+        return bool(self.tools) and all(
+            name in self._side_effect_free for name in self.tools
+        )
+
+    @parallel_tool_calls.setter
+    def parallel_tool_calls(self, value: bool | None):
+        self._parallel_tool_calls = value
 
     @property
     def requires_user_input(self) -> bool:
@@ -144,18 +203,84 @@ class Agent:
     def start_task(self):
         self.response = None
 
+    async def _screenshot_url(self) -> str:
+        # A Scaler scales and encodes on its worker pool, bare computers send
+        # PNG.
+        if isinstance(self.computer, Scaler):
+            return await self.computer.screenshot_url()
+        screenshot = await self.computer.screenshot()
+        return screenshot.data_url("png")
+
+    async def _fill_screenshots(self, outputs: list):
+        """Captures once and sets the screenshot of every output in `outputs`."""
+        if not outputs:
+            return
+        image_url = await self._screenshot_url()
+        for output in outputs:
+            output["output"]["image_url"] = image_url
+        outputs.clear()
+
+    async def _call_tool(self, item, in_thread: bool):
+        _, func = self.tools[item.name]
+        kwargs = json.loads(item.arguments)
+        if inspect.iscoroutinefunction(func):
+            return await func(**kwargs)
+        if in_thread:
+            # Lets sync tools overlap with the other calls.
+            return await asyncio.to_thread(func, **kwargs)
+        return func(**kwargs)
+
+    async def _run_function_calls(self, items) -> list:
+        """Runs function calls and returns their outputs in call order.
+
+        Runs of side-effect-free calls execute concurrently, at most
+        `max_concurrent_tool_calls` at a time. Any other call waits for the
+        calls before it and runs on its own.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_tool_calls)
+        results = {}
+
+        async def run(item):
+            async with semaphore:
+                results[item.call_id] = await self._call_tool(item, in_thread=True)
+
+        batch = []
+        for item in items:
+            if item.name in self._side_effect_free:
+                batch.append(item)
+                continue
+            await asyncio.gather(*(run(call) for call in batch))
+            batch = []
+            results[item.call_id] = await self._call_tool(item, in_thread=False)
+        await asyncio.gather(*(run(call) for call in batch))
+        return [
+            openai.types.responses.response_input_param.FunctionCallOutput(
+                type="function_call_output",
+                call_id=item.call_id,
+                output=json.dumps(results[item.call_id]),
+            )
+            for item in items
+        ]
+
     async def continue_task(
         self,
         input: str | openai.types.responses.response_input_param.ResponseInputParam,
         temperature=None,
     ):
         inputs = []
-        screenshot = ""
         previous_response = self.response
         previous_response_id = None
         if previous_response:
             previous_response_id = previous_response.id
+            # Consecutive function calls, run together before the next
+            # computer call.
+            function_calls = []
+            # Computer call outputs still waiting for their screenshot.
+            deferred = []
             for item in previous_response.output:
+                if item.type != "function_call" and function_calls:
+                    inputs.extend(await self._run_function_calls(function_calls))
+                    function_calls = []
                 if item.type == "computer_call":
                     action = item.action
                     action_args = vars(action) | {}
@@ -166,43 +291,34 @@ class Agent:
                     if action_type != "screenshot":
                         method = getattr(self.computer, action_type)
                         if inspect.iscoroutinefunction(method):
-                            result = await method(**action_args)
+                            await method(**action_args)
                         else:
-                            result = method(**action_args)
-                    screenshot = await self.computer.screenshot()
+                            method(**action_args)
                     output = openai.types.responses.response_input_param.ComputerCallOutput(
                         type="computer_call_output",
                         call_id=item.call_id,
                         output=openai.types.responses.response_input_param.ResponseComputerToolCallOutputScreenshotParam(
                             type="computer_screenshot",
-                            image_url=f"data:image/png;base64,{screenshot}",
+                            image_url="",
                         ),
                         acknowledged_safety_checks=self.pending_safety_checks,
                     )
                     inputs.append(output)
+                    deferred.append(output)
+                    if not self.defer_capture:
+                        await self._fill_screenshots(deferred)
                 elif item.type == "function_call":
-                    tool_name = item.name
-                    kwargs = json.loads(item.arguments)
-                    if tool_name not in self.tools:
-                        raise ValueError(f"Unsupported tool '{tool_name}'.")
-                    _, func = self.tools[tool_name]
-                    if inspect.iscoroutinefunction(func):
-                        result = await func(**kwargs)
-                    else:
-                        result = func(**kwargs)
-                    output = (
-                        openai.types.responses.response_input_param.FunctionCallOutput(
-                            type="function_call_output",
-                            call_id=item.call_id,
-                            output=json.dumps(result),
-                        )
-                    )
-                    inputs.append(output)
+                    if item.name not in self.tools:
+                        raise ValueError(f"Unsupported tool '{item.name}'.")
+                    function_calls.append(item)
                 elif item.type == "reasoning" or item.type == "message":
                     pass
                 else:
                     message = (f"Unsupported response output type '{item.type}'.",)
                     raise NotImplementedError(message)
+            if function_calls:
+                inputs.extend(await self._run_function_calls(function_calls))
+            await self._fill_screenshots(deferred)
         if isinstance(input, str):
             inputs.append(
                 openai.types.responses.response_input_param.Message(
@@ -213,54 +329,121 @@ class Agent:
         else:
             inputs.extend(input)
         self.response = None
-        wait = 0
-        retry = 10
-        while retry > 0:
-            retry -= 1
+        kwargs = {
+            "model": self.model,
+            "input": inputs,
+            "previous_response_id": previous_response_id,
+            "tools": self.get_tools(),
+            "reasoning": self.reasoning,
+            "truncation": "auto",
+            "extra_headers": self.extra_headers,
+            "parallel_tool_calls": self.parallel_tool_calls,
+            **({} if temperature is None else {"temperature": temperature}),
+        }
+        key = limits.deployment_key(self.client, self.model)
+        retries = 10
+        for attempt in range(retries):
             try:
-                kwargs = {
-                    "model": self.model,
-                    "input": inputs,
-                    "previous_response_id": previous_response_id,
-                    "tools": self.get_tools(),
-                    "reasoning": self.reasoning,
-                    "truncation": "auto",
-                    "extra_headers": self.extra_headers,
-                    "parallel_tool_calls": self.parallel_tool_calls,
-                    **({} if temperature is None else {"temperature": temperature}),
-                }
-                if isinstance(self.client, openai.AsyncOpenAI):
-                    self.response = await self.client.responses.create(**kwargs)
-                else:
-                    self.response = self.client.responses.create(**kwargs)
+                self.response = await self._create(key, kwargs)
                 assert self.response.status == "completed"
                 return
             except openai.RateLimitError as e:
-                if retry <= 0:
-                    self.logger.exception("Rate limit exceeded.", exc_info=e)
+                if attempt == retries - 1:
+                    if self.logger:
+                        self.logger.exception("Rate limit exceeded.", exc_info=e)
                     raise
-                match = re.search(r"Please try again in (\d+)s", e.message)
-                wait = int(match.group(1)) if match else 10
+                wait = self._retry_after(e) or limits.backoff_seconds(attempt, base=2)
+                # Holds every agent using this deployment, not just this one.
+                limits.bucket(key).pause(wait)
                 if self.logger:
                     self.logger.warning(
-                        f"Rate limit exceeded. Waiting for {wait} seconds.",
+                        f"Rate limit exceeded. Waiting for {wait:.0f} seconds.",
                         exc_info=e,
                     )
-                await asyncio.sleep(wait)
             except openai.InternalServerError as e:
-                if retry <= 0:
-                    self.logger.exception(
-                        f"Internal server error: {e.message}",
-                        exc_info=e,
-                    )
+                if attempt == retries - 1:
+                    if self.logger:
+                        self.logger.exception(
+                            f"Internal server error: {e.message}",
+                            exc_info=e,
+                        )
                     raise
+                wait = limits.backoff_seconds(attempt)
                 if self.logger:
                     self.logger.warning(
-                        f"Internal server error: {e.message}",
+                        f"Internal server error: {e.message}. "
+                        f"Retrying in {wait:.1f} seconds.",
                         exc_info=e,
                     )
                 await asyncio.sleep(wait)
 
+    @staticmethod
+    def _retry_after(error: openai.RateLimitError) -> float | None:
+        """The wait the server asked for, in seconds, if it said."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            value = response.headers.get("retry-after")
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    pass
+        match = re.search(r"Please try again in (\d+)s", error.message)
+        return float(match.group(1)) if match else None
+
+    async def _request(self, key, kwargs):
+        """Sends one request once the deployment's token bucket allows it."""
+        await limits.bucket(key).acquire()
+        start = time.monotonic()
+        try:
+            if isinstance(self.client, openai.AsyncOpenAI):
+                response = await self.client.responses.create(**kwargs)
+            else:
+                response = await asyncio.to_thread(
+                    self.client.responses.create, **kwargs
+                )
+        except asyncio.CancelledError:
+            # A hedged request that lost ran at least this long, leaving it
+            # out would pull the p95 down with every hedge.
+            limits.latencies(key).record(time.monotonic() - start)
+            raise
+        limits.latencies(key).record(time.monotonic() - start)
+        return response
+
+    async def _create(self, key, kwargs):
+        """Sends the request, hedged if enabled.
+
+        A hedged request fires a duplicate once the first has been running
+        longer than the deployment's recent p95 latency, and takes whichever
+        completes first. Until enough latencies were seen, or with hedging off,
+        a single request is sent.
+        """
+        threshold = limits.latencies(key).percentile(0.95) if self.hedge else None
+        first = asyncio.ensure_future(self._request(key, kwargs))
+        if threshold is None:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=threshold)
+        if done:
+            return first.result()
+        if self.logger:
+            self.logger.info(f"Request slower than p95 ({threshold:.1f}s), hedging.")
+        second = asyncio.ensure_future(self._request(key, kwargs))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    return succeeded[0].result()
+                # A failed twin does not matter while the other may succeed.
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
     def get_tools(self) -> list[openai.types.responses.tool_param.ToolParam]:
         tools = [entry[0] for entry in self.tools.values()]
         return [self.computer_tool(), *tools]
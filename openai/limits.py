@@ -0,0 +1,122 @@
+"""Request pacing shared by every agent in the process.
+
+Rate limits apply per model deployment, not per agent, so agents talking to
+the same deployment draw from one token bucket. Deployments without a
+configured limit are not throttled. A 429 pauses the whole bucket for the time
+the server asked for, instead of each agent finding out on its own. `LatencyTracker` keeps recent request latencies per deployment, for
+hedging requests that run longer than usual.
+"""
+import asyncio
+import collections
+import random
+import threading
+import time
+from typing import Optional
+
+DEFAULT_BURST = 5
+
+
+class TokenBucket:
+    def __init__(self, requests_per_minute: Optional[float], burst: int):
+        # None only honours `pause`.
+        self._rate = requests_per_minute / 60 if requests_per_minute else None
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # No request may start before this, set by `pause`.
+        self._paused_until = 0.0
+        # Agents may run on several event loops (threads) of one process.
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token, returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if self._rate is None:
+                return self._paused_until - now
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            # Tokens may go negative: later callers queue behind earlier ones.
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    async def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Holds all requests for `seconds`, e.g. after a 429."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self._samples = collections.deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """The `fraction` quantile of recent latencies, None until enough
+        requests were seen."""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+_lock = threading.Lock()
+_limits: dict[tuple[str, str], tuple[float, int]] = {}
+_buckets: dict[tuple[str, str], TokenBucket] = {}
+_latencies: dict[tuple[str, str], LatencyTracker] = {}
+
+
+def deployment_key(client, model: str) -> tuple[str, str]:
+    """(endpoint, model): Azure deployments and OpenAI models are limited per
+    endpoint."""
+    return (str(getattr(client, "base_url", "")), model)
+
+
+def configure_limit(
+    model: str,
+    requests_per_minute: float,
+    burst: int = DEFAULT_BURST,
+    endpoint: str = "",
+):
+    """Sets the rate for `model` at `endpoint` (any endpoint if empty)."""
+    with _lock:
+        _limits[(endpoint, model)] = (requests_per_minute, burst)
+        # Buckets are created again with the new rate on next use.
+        for key in list(_buckets):
+            if key[1] == model and endpoint in ("", key[0]):
+                del _buckets[key]
+
+
+def bucket(key: tuple[str, str]) -> TokenBucket:
+    with _lock:
+        limiter = _buckets.get(key)
+        if limiter is None:
+            requests_per_minute, burst = _limits.get(
+                key, _limits.get(("", key[1]), (None, DEFAULT_BURST))
+            )
+            limiter = _buckets[key] = TokenBucket(requests_per_minute, burst)
+        return limiter
+
+
+def latencies(key: tuple[str, str]) -> LatencyTracker:
+    with _lock:
+        return _latencies.setdefault(key, LatencyTracker())
+
+
+def backoff_seconds(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter for the `attempt`-th retry."""
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -2,17 +2,27 @@
 This is a basic example of how to use the CUA model along with the Responses API.
 The code will run a loop taking screenshots and perform actions suggested by the model.
 Make sure to install the required packages before running the script.
+
+With --batch, instructions are read from a JSONL file instead and run without
+interaction, see batch.py:
+
+    python main.py --computer browser --batch tasks.jsonl --concurrency 4 --output-dir runs/
 """
 
 import argparse
 import asyncio
+import json
 import logging
 import os
 
 import openai
 
+import batch
 import cua
+import limits
 import local_computer
+from computers.adapters.cua import CUAComputer
+from computers.playwright.playwright import PlaywrightComputer
 
 
 async def main():
@@ -32,6 +42,22 @@ async def main():
     parser.add_argument("--autoplay", dest="autoplay", action="store_true",
         default=True, help="Autoplay actions without confirmation")
     parser.add_argument("--environment", dest="environment", default="linux")
+    parser.add_argument("--computer", choices=["local", "browser"], default="local",
+        help="Drive the local desktop or a Playwright browser")
+    parser.add_argument("--start-url", dest="start_url", default="https://www.bing.com",
+        help="First page of the browser computer")
+    parser.add_argument("--requests-per-minute", dest="requests_per_minute", type=float,
+        default=None, help="Request rate allowed for the model deployment")
+    parser.add_argument("--hedge", action="store_true", default=False,
+        help="Duplicate requests that run longer than the recent p95 latency")
+    parser.add_argument("--batch", dest="batch", default=None,
+        help="JSONL file of tasks to run without interaction")
+    parser.add_argument("--concurrency", dest="concurrency", type=int, default=4,
+        help="Tasks running at once in batch mode")
+    parser.add_argument("--output-dir", dest="output_dir", default="runs",
+        help="Where batch mode writes transcripts, timing and usage")
+    parser.add_argument("--max-steps", dest="max_steps", type=int, default=50,
+        help="Model turns per task in batch mode")
     args = parser.parse_args()
 
     if args.endpoint == "azure":
@@ -44,15 +70,66 @@ async def main():
         client = openai.AsyncOpenAI()
 
     model = args.model
+    if args.requests_per_minute:
+        limits.configure_limit(model, args.requests_per_minute)
+
+    if args.batch:
+        await run_batch(args, client, model, logger)
+        return
 
     # Computer is used to take screenshots and send keystrokes or mouse clicks
-    computer = local_computer.LocalComputer()
+    if args.computer == "browser":
+        computer = CUAComputer(
+            PlaywrightComputer(screen_size=(1024, 768), initial_url=args.start_url)
+        )
+    else:
+        computer = local_computer.LocalComputer()
+    async with computer:
+        await run(args, client, model, computer, logger)
+
+
+async def run_batch(args, client, model, logger):
+    if args.computer != "browser":
+        # Tasks must not see what earlier tasks left behind, and a desktop
+        # cannot be reset.
+        raise ValueError("Batch mode needs --computer browser.")
+    # Nobody watches batch runs.
+    os.environ.setdefault("PLAYWRIGHT_HEADLESS", "1")
+
+    def make_computer():
+        # Ephemeral contexts: the persistent profile cannot be shared by
+        # concurrent browsers, and would carry logins from task to task.
+        return CUAComputer(
+            PlaywrightComputer(
+                screen_size=(1024, 768),
+                initial_url=args.start_url,
+                persistent_profile=False,
+            )
+        )
+
+    tasks = batch.load_tasks(args.batch)
+    runner = batch.BatchRunner(
+        client,
+        model,
+        make_computer,
+        args.output_dir,
+        concurrency=args.concurrency,
+        max_steps=args.max_steps,
+        hedge=args.hedge,
+        logger=logger,
+    )
+    summary = await runner.run(tasks, default_start_url=args.start_url)
+    logger.info(json.dumps(summary, indent=2))
+
+
+async def run(args, client, model, computer, logger):
 
     # Scaler is used to resize the screen to a smaller size
     computer = cua.Scaler(computer, (1024, 768))
 
     # Agent to run the CUA model and keep track of state
     agent = cua.Agent(client, model, computer)
+    agent.hedge = args.hedge
 
     # Get the user request
     if args.instructions:
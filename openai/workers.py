@@ -0,0 +1,97 @@
+"""Runs CPU-bound screenshot work off the event loop.
+
+Scaling and encoding a screenshot takes tens to hundreds of milliseconds of
+pure CPU. Done inline in `async def` code, it blocks the event loop and
+several agents in one process take turns instead of overlapping. A
+`WorkerPool` runs such jobs on threads (PIL releases the GIL while resizing
+and compressing) or on processes, and bounds how many jobs may be admitted at
+once: further callers wait on the event loop rather than queueing frames
+without limit.
+
+All Scalers of a process share one pool unless given their own:
+
+    workers.configure_shared_pool(kind="process", workers=4)
+"""
+import asyncio
+import concurrent.futures
+import functools
+import os
+import threading
+import weakref
+from typing import Literal, Optional
+
+PoolKind = Literal["thread", "process"]
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        kind: PoolKind = "thread",
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        workers = workers or min(4, os.cpu_count() or 1)
+        if kind == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="image"
+            )
+        elif kind == "process":
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unsupported pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        # Jobs running or queued in the executor at once, per event loop.
+        self.max_pending = max_pending or 2 * workers
+        # asyncio semaphores belong to one loop, and agents may run on several
+        # (one per thread).
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    async def run(self, function, *args, **kwargs):
+        """Runs `function(*args, **kwargs)` on a worker and returns its result.
+
+        With a process pool, the function and its arguments must pickle.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+        async with semaphore:
+            with self._lock:
+                self.pending += 1
+            try:
+                return await loop.run_in_executor(
+                    self._executor, functools.partial(function, *args, **kwargs)
+                )
+            finally:
+                with self._lock:
+                    self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_pool: Optional[WorkerPool] = None
+
+
+def configure_shared_pool(
+    kind: PoolKind = "thread",
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> WorkerPool:
+    """Replaces the pool that Scalers use by default."""
+    global _shared_pool
+    if _shared_pool is not None:
+        _shared_pool.shutdown()
+    _shared_pool = WorkerPool(kind, workers, max_pending)
+    return _shared_pool
+
+
+def shared_pool() -> WorkerPool:
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = WorkerPool()
+    return _shared_pool
@@ -1,7 +1,17 @@
+import os
+import sys
 from typing import Union, Tuple, List
 
+from qwen_agent.llm.schema import ContentItem
 from qwen_agent.tools.base import BaseTool, register_tool
 
+# Share the computers with the gemini agent.
+_GEMINI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "gemini")
+if _GEMINI_DIR not in sys.path:
+    sys.path.insert(0, _GEMINI_DIR)
+
+from computers.adapters.qwen import QwenComputer  # noqa: E402
+
 
 @register_tool("mobile_use")
 class MobileUse(BaseTool):
@@ -228,13 +238,21 @@ The action to perform. The available actions are:
     def __init__(self, cfg=None):
         self.display_width_px = cfg["display_width_px"]
         self.display_height_px = cfg["display_height_px"]
+        # Any gemini `Computer` (Playwright, desktop, ...) passed as
+        # cfg["computer"] executes the actions.
+        computer = cfg.get("computer")
+        self._computer = (
+            QwenComputer(computer, (self.display_width_px, self.display_height_px))
+            if computer is not None
+            else None
+        )
         super().__init__(cfg)
 
     def call(self, params: Union[str, dict], **kwargs):
         params = self._verify_json_format_args(params)
         action = params["action"]
         if action in ["left_click", "right_click", "middle_click", "double_click","triple_click"]:
-            return self._mouse_click(action)
+            return self._mouse_click(action, params.get("coordinate"))
         elif action == "key":
             return self._key(params["keys"])
         elif action == "type":
@@ -256,32 +274,43 @@ The action to perform. The available actions are:
         else:
             raise ValueError(f"Invalid action: {action}")
 
-    def _mouse_click(self, button: str):
-        raise NotImplementedError()
+    def _backend(self) -> QwenComputer:
+        if self._computer is None:
+            raise NotImplementedError("Pass a computer as cfg['computer'] to run actions.")
+        return self._computer
+
+    def _observe(self, state) -> List[ContentItem]:
+        # The screenshot after the action, for the next turn.
+        return [ContentItem(image=state.screenshot.data_url("png"))]
+
+    def _mouse_click(self, button: str, coordinate: Tuple[int, int] = None):
+        return self._observe(self._backend().mouse_click(button, coordinate))
 
     def _key(self, keys: List[str]):
-        raise NotImplementedError()
+        return self._observe(self._backend().key(keys))
 
     def _type(self, text: str):
-        raise NotImplementedError()
+        return self._observe(self._backend().type(text))
 
     def _mouse_move(self, coordinate: Tuple[int, int]):
-        raise NotImplementedError()
+        return self._observe(self._backend().mouse_move(coordinate))
 
     def _left_click_drag(self, coordinate: Tuple[int, int]):
-        raise NotImplementedError()
+        return self._observe(self._backend().left_click_drag(coordinate))
 
     def _scroll(self, pixels: int):
-        raise NotImplementedError()
+        return self._observe(self._backend().scroll(pixels))
 
     def _hscroll(self, pixels: int):
-        raise NotImplementedError()
+        return self._observe(self._backend().hscroll(pixels))
 
     def _answer(self, text: str):
         raise NotImplementedError()
 
     def _wait(self, time: int):
-        raise NotImplementedError()
+        # Returns as soon as the screen changes, never later than `time`
+        # seconds.
+        return self._observe(self._backend().wait(time))
 
     def _terminate(self, status: str):
         raise NotImplementedError()
\ No newline at end of file